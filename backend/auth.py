@@ -0,0 +1,14 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from config import ADMIN_TOKEN
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Dependency guarding moderation and operations routes"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
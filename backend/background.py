@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker:
+    """Run a job on a fixed interval inside the server's event loop.
+
+    Plain functions are run in a worker thread so blocking pymongo calls
+    don't stall request handling; coroutine functions are awaited directly.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        job: Callable[[], Union[None, Awaitable[None]]],
+        interval_seconds: float,
+        run_immediately: bool = True,
+    ):
+        self.name = name
+        self.job = job
+        self.interval_seconds = interval_seconds
+        self.run_immediately = run_immediately
+        self.runs = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self):
+        try:
+            if asyncio.iscoroutinefunction(self.job):
+                await self.job()
+            else:
+                await asyncio.to_thread(self.job)
+            self.runs += 1
+        except Exception:
+            self.failures += 1
+            logger.exception("Background job %s failed", self.name)
+
+    async def _loop(self):
+        if not self.run_immediately:
+            await asyncio.sleep(self.interval_seconds)
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop(), name=self.name)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
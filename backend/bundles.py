@@ -0,0 +1,133 @@
+import gzip
+import hashlib
+import importlib
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FIELDS = ("promise_id", "party", "category", "title", "one_minute_explanation", "fulfilled")
+
+
+def _content_hash(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()[:20]
+
+
+def load_tts_engine(spec: Optional[str]):
+    """Load a text-to-speech engine from a "module:factory" spec.
+
+    The factory returns an object with a `media_type` attribute and a
+    `synthesize(text) -> bytes` method. Engines run locally inside the bundle
+    build, never on the request path.
+    """
+    if not spec:
+        return None
+    module_name, _, factory_name = spec.partition(":")
+    factory = getattr(importlib.import_module(module_name), factory_name or "create_engine")
+    return factory()
+
+
+class Blob:
+    __slots__ = ("hash", "body", "media_type", "compressed")
+
+    def __init__(self, body: bytes, media_type: str, compressed: bool):
+        self.hash = _content_hash(body)
+        self.body = gzip.compress(body, mtime=0) if compressed else body
+        self.media_type = media_type
+        self.compressed = compressed
+
+
+class BundleStore:
+    """Pre-rendered explanation bundles per party and per category, addressed by content hash.
+
+    A rebuild replaces the whole set at once. Blobs whose content didn't change
+    keep their hash, so clients holding an immutable cached copy stay valid.
+    """
+
+    def __init__(self, tts_engine=None):
+        self.tts_engine = tts_engine
+        self._blobs: Dict[str, Blob] = {}
+        self._index = {"built_at": None, "parties": {}, "categories": {}}
+        self._audio_by_text: Dict[str, Blob] = {}
+        self.fingerprint = None
+        self._lock = threading.Lock()
+
+    def _audio_for(self, text: str) -> Optional[Blob]:
+        if self.tts_engine is None or not text:
+            return None
+        text_hash = _content_hash(text.encode("utf-8"))
+        audio = self._audio_by_text.get(text_hash)
+        if audio is None:
+            try:
+                audio = Blob(self.tts_engine.synthesize(text), self.tts_engine.media_type, compressed=False)
+            except Exception:
+                logger.exception("Text-to-speech failed for one explanation")
+                return None
+            self._audio_by_text[text_hash] = audio
+        return audio
+
+    def build(self, manifestos, fingerprint=None):
+        blobs = {}
+        groups = {"parties": {}, "categories": {}}
+        for promise in manifestos:
+            groups["parties"].setdefault(promise.get("party"), []).append(promise)
+            groups["categories"].setdefault(promise.get("category"), []).append(promise)
+
+        index = {"built_at": datetime.now().isoformat(), "parties": {}, "categories": {}}
+        for kind, members_by_key in groups.items():
+            for key, members in sorted(members_by_key.items(), key=lambda item: str(item[0])):
+                entries = []
+                for promise in sorted(members, key=lambda item: item["promise_id"]):
+                    entry = {field: promise.get(field) for field in BUNDLE_FIELDS}
+                    audio = self._audio_for(promise.get("one_minute_explanation"))
+                    if audio is not None:
+                        blobs[audio.hash] = audio
+                        entry["audio"] = f"/api/bundles/{audio.hash}"
+                    entries.append(entry)
+                payload = json.dumps(
+                    {"kind": kind, "key": key, "promises": entries},
+                    ensure_ascii=False, sort_keys=True, separators=(",", ":"),
+                ).encode("utf-8")
+                bundle = Blob(payload, "application/json", compressed=True)
+                blobs[bundle.hash] = bundle
+                index[kind][key] = {
+                    "hash": bundle.hash,
+                    "url": f"/api/bundles/{bundle.hash}",
+                    "size": len(bundle.body),
+                    "promises": len(entries),
+                }
+
+        live_audio = {blob.hash for blob in blobs.values() if not blob.compressed}
+        with self._lock:
+            self._blobs = blobs
+            self._index = index
+            self._audio_by_text = {
+                text_hash: audio for text_hash, audio in self._audio_by_text.items() if audio.hash in live_audio
+            }
+            self.fingerprint = fingerprint
+
+    def index(self):
+        with self._lock:
+            return self._index
+
+    def get(self, content_hash: str) -> Optional[Blob]:
+        with self._lock:
+            return self._blobs.get(content_hash)
+
+
+def manifesto_fingerprint(db):
+    """Cheap change detector: document count plus the newest updated_at"""
+    newest = db.manifestos.find_one({}, {"_id": 0, "updated_at": 1}, sort=[("updated_at", -1)])
+    return db.manifestos.estimated_document_count(), newest and newest.get("updated_at")
+
+
+def rebuild_if_changed(db, store: BundleStore):
+    fingerprint = manifesto_fingerprint(db)
+    if fingerprint == store.fingerprint:
+        return False
+    projection = {"_id": 0, **{field: 1 for field in BUNDLE_FIELDS}}
+    store.build(db.manifestos.find({}, projection), fingerprint)
+    return True
@@ -0,0 +1,57 @@
+import os
+
+# Get MongoDB URL from environment
+MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+
+# Background jobs
+SCORECARD_INTERVAL_SECONDS = float(os.environ.get('SCORECARD_INTERVAL_SECONDS', '300'))
+SCORECARD_HISTORY_LIMIT = int(os.environ.get('SCORECARD_HISTORY_LIMIT', '288'))
+SNAPSHOT_INTERVAL_SECONDS = float(os.environ.get('SNAPSHOT_INTERVAL_SECONDS', '600'))
+SNAPSHOT_KEEP_VERSIONS = int(os.environ.get('SNAPSHOT_KEEP_VERSIONS', '5'))
+POST_QUEUE_MAXSIZE = int(os.environ.get('POST_QUEUE_MAXSIZE', '1000'))
+POST_QUEUE_WORKERS = int(os.environ.get('POST_QUEUE_WORKERS', '2'))
+POST_BATCH_SIZE = int(os.environ.get('POST_BATCH_SIZE', '50'))
+POST_BATCH_WAIT_MS = float(os.environ.get('POST_BATCH_WAIT_MS', '50'))
+POST_WRITE_RETRIES = int(os.environ.get('POST_WRITE_RETRIES', '3'))
+TRENDING_BUCKET_SECONDS = int(os.environ.get('TRENDING_BUCKET_SECONDS', '3600'))
+TRENDING_BUCKETS = int(os.environ.get('TRENDING_BUCKETS', '24'))
+TRENDING_TOP_K = int(os.environ.get('TRENDING_TOP_K', '50'))
+CONSTITUENCY_GEOMETRY_PATH = os.environ.get(
+    'CONSTITUENCY_GEOMETRY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'constituency_boundaries.geojson'),
+)
+LINK_CHECK_INTERVAL_SECONDS = float(os.environ.get('LINK_CHECK_INTERVAL_SECONDS', '3600'))
+LINK_RECHECK_HOURS = float(os.environ.get('LINK_RECHECK_HOURS', '24'))
+LINK_CHECK_PER_HOST = int(os.environ.get('LINK_CHECK_PER_HOST', '2'))
+LINK_CHECK_TIMEOUT_SECONDS = float(os.environ.get('LINK_CHECK_TIMEOUT_SECONDS', '10'))
+BUNDLE_CHECK_INTERVAL_SECONDS = float(os.environ.get('BUNDLE_CHECK_INTERVAL_SECONDS', '60'))
+# Optional local text-to-speech engine, as "module:factory"
+BUNDLE_TTS_ENGINE = os.environ.get('BUNDLE_TTS_ENGINE')
+RESULTS_SNAPSHOT_INTERVAL_SECONDS = float(os.environ.get('RESULTS_SNAPSHOT_INTERVAL_SECONDS', '10'))
+# How often each instance applies rounds other instances logged
+RESULTS_FOLLOW_INTERVAL_SECONDS = float(os.environ.get('RESULTS_FOLLOW_INTERVAL_SECONDS', '1'))
+# Per-request Mongo time budget and circuit breaker for degraded-mode serving
+MONGO_REQUEST_BUDGET_MS = float(os.environ.get('MONGO_REQUEST_BUDGET_MS', '2000'))
+MONGO_BREAKER_FAILURES = int(os.environ.get('MONGO_BREAKER_FAILURES', '5'))
+MONGO_BREAKER_RESET_SECONDS = float(os.environ.get('MONGO_BREAKER_RESET_SECONDS', '15'))
+STALE_CACHE_ENTRIES = int(os.environ.get('STALE_CACHE_ENTRIES', '512'))
+STORAGE_REFRESH_INTERVAL_SECONDS = float(os.environ.get('STORAGE_REFRESH_INTERVAL_SECONDS', '30'))
+# How often cached payloads built from Mongo-served collections check for changes
+PAYLOAD_FINGERPRINT_INTERVAL_SECONDS = float(os.environ.get('PAYLOAD_FINGERPRINT_INTERVAL_SECONDS', '5'))
+# Near-duplicate fact-check detection
+FACT_CHECK_INDEX_INTERVAL_SECONDS = float(os.environ.get('FACT_CHECK_INDEX_INTERVAL_SECONDS', '60'))
+FACT_CHECK_RELATED_THRESHOLD = float(os.environ.get('FACT_CHECK_RELATED_THRESHOLD', '0.5'))
+# Vote/post event log and the compactor folding votes into post counts
+EVENT_LOG_MAXSIZE = int(os.environ.get('EVENT_LOG_MAXSIZE', '10000'))
+EVENT_BATCH_SIZE = int(os.environ.get('EVENT_BATCH_SIZE', '200'))
+EVENT_BATCH_WAIT_MS = float(os.environ.get('EVENT_BATCH_WAIT_MS', '20'))
+VOTE_COMPACTION_INTERVAL_SECONDS = float(os.environ.get('VOTE_COMPACTION_INTERVAL_SECONDS', '2'))
+VOTE_COMPACTION_LAG_SECONDS = float(os.environ.get('VOTE_COMPACTION_LAG_SECONDS', '5'))
+# Serialized per-locale listings kept for the in-memory collections
+LOCALIZED_PAYLOAD_ENTRIES = int(os.environ.get('LOCALIZED_PAYLOAD_ENTRIES', '256'))
+LEADERBOARD_PERSIST_INTERVAL_SECONDS = float(os.environ.get('LEADERBOARD_PERSIST_INTERVAL_SECONDS', '30'))
+RANKINGS_INTERVAL_SECONDS = float(os.environ.get('RANKINGS_INTERVAL_SECONDS', '600'))
+
+# Admin routes are disabled unless a token is configured
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
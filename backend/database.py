@@ -0,0 +1,55 @@
+import threading
+
+from pymongo import MongoClient
+
+from config import MONGO_SERVER_SELECTION_TIMEOUT_MS, MONGO_URL
+from profiling import CommandTimer
+from read_routing import ReadRouter
+from storage import Storage
+
+
+class LazyDatabase:
+    """Stands in for the application's Database until it is first used.
+
+    Creating a MongoClient starts monitor threads and, for mongodb+srv URLs,
+    resolves DNS records. Deferring that to the first query keeps importing
+    the app (and so a cold start) free of network work.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._database = None
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._database is not None
+
+    def get(self):
+        if self._database is None:
+            with self._lock:
+                if self._database is None:
+                    self._database = self._factory()
+        return self._database
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def __getitem__(self, name):
+        return self.get()[name]
+
+
+def connect():
+    client = MongoClient(
+        MONGO_URL,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        event_listeners=[CommandTimer()],
+    )
+    return client.votewise_tn
+
+
+db = LazyDatabase(connect)
+# Read-heavy routes read through `reads`, writes and read-your-writes paths use `db`
+reads = ReadRouter.from_env(db)
+# Read-mostly collections may be served from an in-memory copy instead (STORAGE_ENGINE_<COLLECTION>)
+storage = Storage.from_env(reads)
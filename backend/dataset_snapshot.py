@@ -0,0 +1,171 @@
+import gzip
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+# Fields exported per collection, in column order
+SNAPSHOT_TABLES = {
+    "constituencies": ["constituency_id", "name", "district"],
+    "candidates": [
+        "candidate_id", "name", "party", "constituency", "age", "education",
+        "criminal_cases", "assets", "liabilities", "incumbent", "photo_url",
+    ],
+    "manifestos": [
+        "promise_id", "party", "title", "description", "category",
+        "fulfilled", "evidence_url", "one_minute_explanation",
+    ],
+}
+
+# Low-cardinality columns stored as integer codes into a shared dictionary.
+# Dictionaries are keyed by column name, so `party` is shared by candidates and manifestos.
+DICTIONARY_COLUMNS = {"party", "district", "category", "constituency"}
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_MEDIA_TYPE = "application/gzip"
+
+
+class Snapshot:
+    def __init__(self, version: str, generated_at: datetime, blob: bytes, tables: dict):
+        self.version = version
+        self.generated_at = generated_at
+        self.blob = blob
+        self.tables = tables
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+    def describe(self):
+        return {
+            "version": self.version,
+            "generated_at": self.generated_at.isoformat(),
+            "size": len(self.blob),
+            "tables": self.tables,
+        }
+
+
+def _digest(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def encode_tables(tables_rows):
+    """Encode {table: [documents]} column-wise, dictionary-encoding repeated strings"""
+    dictionaries = {}
+    lookups = {}
+    tables = {}
+    for table, rows in tables_rows.items():
+        columns = {}
+        for field in SNAPSHOT_TABLES[table]:
+            values = [row.get(field) for row in rows]
+            if field in DICTIONARY_COLUMNS:
+                lookup = lookups.setdefault(field, {})
+                dictionary = dictionaries.setdefault(field, [])
+                codes = []
+                for value in values:
+                    if value is None:
+                        codes.append(-1)
+                        continue
+                    if value not in lookup:
+                        lookup[value] = len(dictionary)
+                        dictionary.append(value)
+                    codes.append(lookup[value])
+                values = codes
+            columns[field] = values
+        tables[table] = {"rows": len(rows), "columns": columns}
+    return dictionaries, tables
+
+
+def build_snapshot(db) -> Snapshot:
+    """Read the exported collections and produce a compressed columnar snapshot"""
+    tables_rows = {}
+    for table, fields in SNAPSHOT_TABLES.items():
+        key = fields[0]
+        projection = {"_id": 0, **{field: 1 for field in fields}}
+        # Stable row order keeps unchanged data byte-identical between builds
+        tables_rows[table] = list(db[table].find({}, projection).sort(key, 1))
+
+    dictionaries, tables = encode_tables(tables_rows)
+    table_hashes = {
+        table: {
+            "rows": encoded["rows"],
+            "hash": _digest(json.dumps(encoded, sort_keys=True, separators=(",", ":")).encode()),
+        }
+        for table, encoded in tables.items()
+    }
+    document = {
+        "format": SNAPSHOT_FORMAT,
+        "dictionaries": dictionaries,
+        "tables": tables,
+    }
+    raw = json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+    # The version is the content hash, so identical data always gets the same version
+    version = _digest(raw)
+    blob = gzip.compress(raw, compresslevel=9, mtime=0)
+    return Snapshot(version, datetime.now(), blob, table_hashes)
+
+
+class SnapshotStore:
+    """Keeps the most recent snapshot versions in memory"""
+
+    def __init__(self, keep: int = 5):
+        self.keep = keep
+        self._versions: "OrderedDict[str, Snapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, snapshot: Snapshot):
+        with self._lock:
+            if snapshot.version in self._versions:
+                # Same contents as an older version (the data went back to it): serve it as latest again
+                self._versions.move_to_end(snapshot.version)
+                return
+            self._versions[snapshot.version] = snapshot
+            while len(self._versions) > self.keep:
+                self._versions.popitem(last=False)
+
+    def latest(self) -> Optional[Snapshot]:
+        with self._lock:
+            return next(reversed(self._versions.values()), None)
+
+    def get(self, version: str) -> Optional[Snapshot]:
+        with self._lock:
+            return self._versions.get(version)
+
+    def manifest(self):
+        with self._lock:
+            versions = [snapshot.describe() for snapshot in reversed(self._versions.values())]
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "latest": versions[0]["version"] if versions else None,
+            "versions": versions,
+        }
+
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str, size: int):
+    """Parse a single-range `Range` header into (start, end) inclusive.
+
+    Returns None when the header should be ignored (multiple ranges, malformed)
+    and raises ValueError when the range can't be satisfied.
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        length = int(end)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
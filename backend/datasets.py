@@ -0,0 +1,81 @@
+import json
+import os
+import uuid
+from datetime import datetime
+from functools import lru_cache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# Dataset name -> file version this code reads. Bump the version (and add a
+# new `<name>.v<N>.json`) when a file's schema or contents change, so a
+# deployment never pairs new code with old data.
+DATASET_VERSIONS = {
+    "constituencies": 1,
+    "candidates": 1,
+    "manifestos": 1,
+    "fact_checks": 1,
+    "community_posts": 1,
+}
+
+# Fields the sample records leave out, generated when they are inserted
+SEED_ID_FIELDS = {
+    "candidates": "candidate_id",
+    "manifestos": "promise_id",
+    "fact_checks": "fact_id",
+    "community_posts": "post_id",
+}
+SEED_TIMESTAMP_FIELDS = {
+    "fact_checks": "date_added",
+    "community_posts": "created_at",
+}
+
+
+def dataset_path(name: str) -> str:
+    return os.path.join(DATA_DIR, f"{name}.v{DATASET_VERSIONS[name]}.json")
+
+
+@lru_cache(maxsize=None)
+def load_dataset(name: str) -> tuple:
+    """Records of a bundled data file, parsed on first use. Treat as read-only."""
+    with open(dataset_path(name), encoding="utf-8") as handle:
+        document = json.load(handle)
+    if document.get("version") != DATASET_VERSIONS[name]:
+        raise ValueError(f"{dataset_path(name)} is version {document.get('version')}, "
+                         f"expected {DATASET_VERSIONS[name]}")
+    return tuple(document["records"])
+
+
+def seed_documents(name: str) -> list:
+    """Fresh copies of a sample dataset with ids and timestamps filled in"""
+    now = datetime.now()
+    documents = []
+    for record in load_dataset(name):
+        document = dict(record)
+        if name in SEED_ID_FIELDS:
+            document[SEED_ID_FIELDS[name]] = str(uuid.uuid4())
+        if name in SEED_TIMESTAMP_FIELDS:
+            document[SEED_TIMESTAMP_FIELDS[name]] = now
+        if name == "community_posts":
+            document["author_id"] = "anon_" + str(uuid.uuid4())[:8]
+        documents.append(document)
+    return documents
+
+
+def constituencies() -> tuple:
+    """All 234 Tamil Nadu assembly constituencies"""
+    return load_dataset("constituencies")
+
+
+@lru_cache(maxsize=None)
+def constituency_names() -> frozenset:
+    return frozenset(constituency["name"] for constituency in constituencies())
+
+
+@lru_cache(maxsize=None)
+def constituency_districts() -> frozenset:
+    return frozenset(constituency["district"] for constituency in constituencies())
+
+
+@lru_cache(maxsize=None)
+def constituencies_by_id() -> dict:
+    return {constituency["constituency_id"]: constituency for constituency in constituencies()}
@@ -0,0 +1,253 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+import pymongo
+from pymongo.errors import ConnectionFailure, ExecutionTimeout, PyMongoError, WTimeoutError
+
+from profiling import current_timings
+from singleflight import request_key
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the data layer is unhealthy, rather than a bad request
+# (duplicate keys, validation failures) that should surface as usual
+OUTAGE_ERRORS = (ConnectionFailure, ExecutionTimeout, WTimeoutError)
+
+
+class CircuitBreaker:
+    """Closed → open after `failure_threshold` consecutive outage errors.
+
+    While open, callers are refused without touching Mongo. After
+    `reset_seconds` a single probe is let through (half-open); its success
+    closes the breaker and its failure re-opens it for another period.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 15.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._probing = False
+        if self.state != "closed":
+            logger.info("Mongo circuit breaker closed")
+        self.state = "closed"
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+                logger.warning("Mongo circuit breaker opened after %d failures", self.consecutive_failures)
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """The probe ended without telling us anything about Mongo"""
+        self._probing = False
+
+    def retry_after(self) -> int:
+        if self.state == "closed":
+            return 0
+        return max(1, int(self.reset_seconds - (time.monotonic() - self.opened_at) + 0.999))
+
+    def snapshot(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retry_after": self.retry_after(),
+        }
+
+
+class StaleCache:
+    """Last good response per read key, bounded LRU"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.stale_hits = 0
+        self.misses = 0
+
+    def put(self, key, messages):
+        self._entries[key] = (time.time(), messages)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.stale_hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def snapshot(self):
+        return {"entries": len(self._entries), "stale_hits": self.stale_hits, "misses": self.misses}
+
+
+class DegradedModeMiddleware:
+    """Bounds Mongo work per request and keeps reads up when Mongo is not.
+
+    Every API request runs inside `pymongo.timeout(budget)`, so each query
+    carries a maxTimeMS and gives up client-side once the request's budget is
+    spent. Outage errors trip `breaker`. For the `read_paths`, the last 200
+    response per key is kept; when the breaker is open (or a read fails) that
+    copy is served with Age and Warning headers, and a single background
+    request revalidates it once the breaker allows a probe. Writes and
+    uncached reads fail fast with 503 and Retry-After while the breaker is
+    open. Paths under `exclude_prefixes` (streamed exports) are passed through
+    untouched, as they outlive any per-request budget.
+    """
+
+    def __init__(self, app, read_paths, breaker: CircuitBreaker, cache: StaleCache,
+                 budget_seconds: float = 2.0, exclude_prefixes=()):
+        self.app = app
+        self.read_paths = frozenset(read_paths)
+        self.breaker = breaker
+        self.cache = cache
+        self.budget_seconds = budget_seconds
+        self.exclude_prefixes = tuple(exclude_prefixes)
+        self._revalidating = set()
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith("/api/") or path.startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        cacheable = scope["method"] == "GET" and path in self.read_paths
+        key = request_key(scope) if cacheable else None
+
+        if self.breaker.state != "closed":
+            cached = self.cache.get(key) if cacheable else None
+            if cached is not None:
+                # Stale-while-revalidate: answer now, let a probe refresh the copy
+                await self._serve_stale(cached, send)
+                if self.breaker.allow():
+                    self._revalidate(scope, key)
+                return
+            if not self.breaker.allow():
+                await self._unavailable(send)
+                return
+
+        await self._forward(scope, receive, send, key)
+
+    async def _forward(self, scope, receive, send, key):
+        messages = []
+        started = False
+        timings = current_timings.get()
+        calls_before = timings.db_calls if timings is not None else 0
+
+        async def capture(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            if key is not None:
+                messages.append(message)
+            await send(message)
+
+        try:
+            with pymongo.timeout(self.budget_seconds):
+                await self.app(scope, receive, capture)
+        except PyMongoError as error:
+            if not isinstance(error, OUTAGE_ERRORS):
+                self.breaker.record_success()
+                raise
+            self.breaker.record_failure()
+            logger.warning("Mongo unavailable for %s %s: %s", scope["method"], scope["path"], error)
+            if started:
+                raise
+            cached = self.cache.get(key) if key is not None else None
+            if cached is not None:
+                await self._serve_stale(cached, send)
+            else:
+                await self._unavailable(send)
+            return
+        except BaseException:
+            self.breaker.release_probe()
+            raise
+        if timings is None or timings.db_calls > calls_before:
+            self.breaker.record_success()
+        else:
+            # Served from memory, which says nothing about Mongo's health
+            self.breaker.release_probe()
+        if key is not None and messages and messages[0].get("status") == 200:
+            self.cache.put(key, messages)
+
+    def _revalidate(self, scope, key):
+        if key in self._revalidating:
+            self.breaker.release_probe()
+            return
+        self._revalidating.add(key)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def discard(message):
+            pass
+
+        async def run():
+            try:
+                await self._forward(dict(scope), receive, discard, key)
+            except Exception:
+                logger.debug("Background revalidation of %s failed", scope["path"], exc_info=True)
+            finally:
+                self._revalidating.discard(key)
+
+        asyncio.get_running_loop().create_task(run())
+
+    async def _serve_stale(self, cached, send):
+        stored_at, messages = cached
+        age = str(int(time.time() - stored_at)).encode()
+        for message in messages:
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value) for name, value in message.get("headers", [])
+                    if name.lower() not in (b"age", b"cache-control")
+                ]
+                headers += [
+                    (b"age", age),
+                    (b"cache-control", b"no-store"),
+                    (b"warning", b'110 - "Response is Stale"'),
+                    (b"x-degraded-mode", b"stale"),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+    async def _unavailable(self, send):
+        body = b'{"detail":"Data store temporarily unavailable"}'
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.breaker.retry_after()).encode()),
+                (b"x-degraded-mode", b"unavailable"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,426 @@
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+import pymongo
+from bson import ObjectId
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
+
+import leases
+from post_pipeline import insert_missing
+
+logger = logging.getLogger(__name__)
+
+# One collection per day: post_events_YYYYMMDD. Writes only ever go to the
+# newest partition, and old days can be archived or dropped as a whole.
+PARTITION_PREFIX = "post_events_"
+CHECKPOINT_ID = "vote_counts"
+
+VOTE_FIELDS = {"up": "upvotes", "down": "downvotes"}
+
+
+def partition_name(at: datetime) -> str:
+    return f"{PARTITION_PREFIX}{at:%Y%m%d}"
+
+
+def partitions(db, since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[str]:
+    """Event partitions, oldest first, optionally limited to those overlapping [since, until]"""
+    names = sorted(
+        name for name in db.list_collection_names(filter={"name": {"$regex": f"^{PARTITION_PREFIX}"}})
+    )
+    if since is not None:
+        names = [name for name in names if name >= partition_name(since)]
+    if until is not None:
+        names = [name for name in names if name <= partition_name(until)]
+    return names
+
+
+def vote_event(post_id: str, vote: str, at: Optional[datetime] = None) -> dict:
+    return {"_id": ObjectId(), "type": "vote", "post_id": post_id, "vote": vote, "at": at or datetime.now()}
+
+
+def post_event(event_type: str, post_id: str, constituency: str, at: Optional[datetime] = None) -> dict:
+    return {"_id": ObjectId(), "type": event_type, "post_id": post_id, "constituency": constituency,
+            "at": at or datetime.now()}
+
+
+def publication_event(post: dict) -> dict:
+    """post_published event with an id derived from the post, so logging it twice stores it once.
+
+    Dated by the post's creation, so a retried batch maps to the same
+    partition; the publication time itself is the post's updated_at.
+    """
+    at = post["created_at"]
+    digest = hashlib.sha1(post["post_id"].encode()).digest()[:8]
+    event_id = ObjectId(int(at.timestamp()).to_bytes(4, "big") + digest)
+    return {"_id": event_id, "type": "post_published", "post_id": post["post_id"],
+            "constituency": post["constituency"], "at": at}
+
+
+class EventLog:
+    """Append-only event writer with group commit.
+
+    `append` enqueues an event and waits until the batch it landed in has
+    been written: a single writer task collects up to `batch_size` events
+    (or whatever arrived within `batch_wait_seconds`) and stores them with one
+    ordered `insert_many` per day partition. Callers get durability without
+    each paying for its own round trip.
+
+    The compactor treats events whose ObjectId is older than its lag as
+    settled, so ids are minted just before the write (not when the event was
+    queued) and each write runs under `pymongo.timeout(write_budget_seconds)`;
+    with a budget well under the lag, no event lands behind the checkpoint.
+    """
+
+    def __init__(self, write: Callable[[str, List[dict]], None], maxsize: int = 10000,
+                 batch_size: int = 200, batch_wait_seconds: float = 0.02,
+                 write_budget_seconds: Optional[float] = None):
+        self.write = write
+        self.write_budget_seconds = write_budget_seconds
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.counters = {"appended": 0, "batches": 0, "failed": 0, "dropped": 0}
+        self._queue: asyncio.Queue = None
+        self._task: asyncio.Task = None
+
+    def start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._writer(), name="event-log")
+
+    async def stop(self, drain_timeout: float = 5.0):
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Stopping event log with %d events unwritten", self._queue.qsize())
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def append(self, event: dict):
+        """Store one event; raises asyncio.QueueFull when the writer is too far behind"""
+        if self._queue is None:
+            raise asyncio.QueueFull
+        written = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((event, written))
+        except asyncio.QueueFull:
+            self.counters["dropped"] += 1
+            raise
+        await written
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait_seconds
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _write_within_budget(self, partition: str, events: List[dict]):
+        with pymongo.timeout(self.write_budget_seconds):
+            for event in events:
+                event["_id"] = ObjectId()
+            self.write(partition, events)
+
+    async def _writer(self):
+        while True:
+            batch = await self._next_batch()
+            by_partition = {}
+            for event, _ in batch:
+                by_partition.setdefault(partition_name(event["at"]), []).append(event)
+            try:
+                for partition, events in by_partition.items():
+                    await asyncio.to_thread(self._write_within_budget, partition, events)
+            except Exception as error:
+                self.counters["failed"] += len(batch)
+                logger.exception("Failed to write %d events", len(batch))
+                for _, written in batch:
+                    if not written.done():
+                        written.set_exception(error)
+            else:
+                self.counters["batches"] += 1
+                self.counters["appended"] += len(batch)
+                for _, written in batch:
+                    if not written.done():
+                        written.set_result(None)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def stats(self):
+        return {
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "capacity": self.maxsize,
+            **self.counters,
+        }
+
+
+_indexed_partitions = set()
+
+
+def _ensure_partition_index(db, partition: str):
+    if partition not in _indexed_partitions:
+        db[partition].create_index([("post_id", ASCENDING), ("_id", ASCENDING)])
+        _indexed_partitions.add(partition)
+
+
+def write_events(db, partition: str, events: List[dict]):
+    _ensure_partition_index(db, partition)
+    db[partition].insert_many(events, ordered=True)
+
+
+def write_events_once(db, partition: str, events: List[dict]):
+    """Insert events whose ids may already be stored, skipping those"""
+    _ensure_partition_index(db, partition)
+    try:
+        db[partition].insert_many(events, ordered=False)
+    except BulkWriteError as error:
+        details = error.details
+        if details.get("writeConcernErrors") or any(item["code"] != 11000 for item in details["writeErrors"]):
+            raise
+
+
+def publish_posts(db, posts: List[dict]):
+    """Insert moderated posts and log their publication in the same worker thread.
+
+    Every post in the batch is logged, not only those this attempt inserted:
+    a retry after a partial insert or a failed event write finds the posts
+    stored but their events possibly missing.
+    """
+    # Stamped at insert, not at submission: a delta sync issued while the post
+    # waited in the queue must still see it as changed after its token
+    now = datetime.now()
+    for post in posts:
+        post["updated_at"] = now
+    insert_missing(db.community_posts, posts)
+    by_partition = {}
+    for post in posts:
+        event = publication_event(post)
+        by_partition.setdefault(partition_name(event["at"]), []).append(event)
+    for partition, events in by_partition.items():
+        write_events_once(db, partition, events)
+
+
+def vote_base(post: dict) -> dict:
+    """Counts a post had before any logged vote; replay adds the log on top"""
+    return {"upvotes": post.get("upvotes", 0), "downvotes": post.get("downvotes", 0)}
+
+
+def ensure_event_log_indexes(db):
+    # Posts that predate the event log keep their counts as the replay baseline
+    db.community_posts.update_many(
+        {"vote_base": {"$exists": False}},
+        [{"$set": {"vote_base": {"upvotes": {"$ifNull": ["$upvotes", 0]},
+                                 "downvotes": {"$ifNull": ["$downvotes", 0]}}}}],
+    )
+    for partition in partitions(db, since=datetime.now() - timedelta(days=1)):
+        _ensure_partition_index(db, partition)
+
+
+LEASE_ID = "vote_counts_lease"
+
+
+class LeaseHeld(Exception):
+    """Another compactor or replay is rewriting the materialized counts"""
+
+
+def acquire_lease(db, owner: str, seconds: float) -> bool:
+    """Take or extend the lease that lets one process at a time rewrite counts"""
+    return leases.acquire_lease(db.event_log_checkpoints, LEASE_ID, owner, seconds)
+
+
+def release_lease(db, owner: str):
+    leases.release_lease(db.event_log_checkpoints, LEASE_ID, owner)
+
+
+@contextmanager
+def counts_lease(db, seconds: float = 60):
+    owner = uuid.uuid4().hex
+    if not acquire_lease(db, owner, seconds):
+        raise LeaseHeld
+    try:
+        yield owner
+    finally:
+        release_lease(db, owner)
+
+
+def _fold(db, partition: str, after: Optional[ObjectId], through: ObjectId) -> int:
+    """Apply the vote events in (after, through] to the posts' counts.
+
+    The range is fixed before any post is touched, and each post records
+    `through` once updated, so applying the same range again skips the posts
+    that already have it.
+    """
+    query = {"type": "vote", "_id": {"$lte": through}}
+    if after is not None:
+        query["_id"]["$gt"] = after
+    deltas = {}
+    folded = 0
+    for event in db[partition].find(query, {"post_id": 1, "vote": 1}):
+        folded += 1
+        field = VOTE_FIELDS.get(event.get("vote"))
+        if field:
+            counts = deltas.setdefault(event["post_id"], {"upvotes": 0, "downvotes": 0})
+            counts[field] += 1
+    now = datetime.now()
+    if deltas:
+        db.community_posts.bulk_write([
+            UpdateOne(
+                {"post_id": post_id, "events_through": {"$not": {"$gte": through}}},
+                {"$inc": counts, "$set": {"events_through": through, "updated_at": now}},
+            )
+            for post_id, counts in deltas.items()
+        ], ordered=False)
+    return folded
+
+
+def _finish_pending(db, checkpoint: dict) -> dict:
+    """Re-apply a batch whose checkpoint was not committed (crash or failed write)"""
+    pending = checkpoint.get("pending")
+    if not pending:
+        return checkpoint
+    _fold(db, pending["partition"], checkpoint.get("last_id"), pending["last_id"])
+    checkpoint = {"_id": CHECKPOINT_ID, "last_id": pending["last_id"], "at": pending["at"],
+                  "compacted_at": datetime.now()}
+    db.event_log_checkpoints.replace_one({"_id": CHECKPOINT_ID}, checkpoint, upsert=True)
+    return checkpoint
+
+
+def compact_votes(db, lag: timedelta = timedelta(seconds=5), batch_size: int = 5000,
+                  lease_seconds: float = 60) -> int:
+    """Fold vote events past the checkpoint into the posts' upvotes/downvotes.
+
+    Only whole seconds of event ids older than `lag` are folded, so events
+    from every app instance in those seconds have been written whatever
+    their order within the second. Each batch's upper bound is saved in the
+    checkpoint before the posts are updated and reused after a crash, which
+    makes an interrupted batch safe to re-run. A lease keeps concurrent
+    instances from folding at the same time; a run that finds it held skips.
+    """
+    try:
+        with counts_lease(db, lease_seconds) as owner:
+            checkpoint = _finish_pending(db, db.event_log_checkpoints.find_one({"_id": CHECKPOINT_ID}) or {})
+            last_id = checkpoint.get("last_id")
+            cutoff = ObjectId.from_datetime(datetime.now(timezone.utc) - lag)
+            folded = 0
+            for partition in partitions(db, since=checkpoint.get("at")):
+                while True:
+                    if not acquire_lease(db, owner, lease_seconds):
+                        return folded
+                    query = {"type": "vote", "_id": {"$lt": cutoff}}
+                    if last_id is not None:
+                        query["_id"]["$gt"] = last_id
+                    events = list(db[partition].find(query, {"_id": 1, "at": 1})
+                                  .sort("_id", ASCENDING).limit(batch_size))
+                    if not events:
+                        break
+                    pending = {"partition": partition, "last_id": events[-1]["_id"], "at": events[-1]["at"]}
+                    db.event_log_checkpoints.update_one(
+                        {"_id": CHECKPOINT_ID}, {"$set": {"pending": pending}}, upsert=True
+                    )
+                    folded += _fold(db, partition, last_id, pending["last_id"])
+                    last_id = pending["last_id"]
+                    db.event_log_checkpoints.replace_one(
+                        {"_id": CHECKPOINT_ID},
+                        {"_id": CHECKPOINT_ID, "last_id": last_id, "at": pending["at"], "compacted_at": datetime.now()},
+                        upsert=True,
+                    )
+                    if len(events) < batch_size:
+                        break
+            return folded
+    except LeaseHeld:
+        return 0
+
+
+def replay_votes(db, post_id: Optional[str] = None, apply: bool = False) -> dict:
+    """Recount votes from the event log up to the compaction checkpoint.
+
+    Returns the posts whose materialized counts differ from the replayed
+    ones (vote_base plus every folded event). With `apply`, those posts are
+    corrected, so the log can rebuild counts after a bad write or restore.
+    Raises LeaseHeld while a compaction is running.
+    """
+    with counts_lease(db):
+        checkpoint = _finish_pending(db, db.event_log_checkpoints.find_one({"_id": CHECKPOINT_ID}) or {})
+        last_id = checkpoint.get("last_id")
+        replayed = {}
+        if last_id is not None:
+            match = {"type": "vote", "_id": {"$lte": last_id}}
+            if post_id:
+                match["post_id"] = post_id
+            pipeline = [
+                {"$match": match},
+                {"$group": {
+                    "_id": "$post_id",
+                    "upvotes": {"$sum": {"$cond": [{"$eq": ["$vote", "up"]}, 1, 0]}},
+                    "downvotes": {"$sum": {"$cond": [{"$eq": ["$vote", "down"]}, 1, 0]}},
+                }},
+            ]
+            for partition in partitions(db, until=checkpoint.get("at")):
+                for row in db[partition].aggregate(pipeline):
+                    counts = replayed.setdefault(row["_id"], {"upvotes": 0, "downvotes": 0})
+                    counts["upvotes"] += row["upvotes"]
+                    counts["downvotes"] += row["downvotes"]
+
+        query = {"post_id": post_id} if post_id else {}
+        projection = {"_id": 0, "post_id": 1, "upvotes": 1, "downvotes": 1, "vote_base": 1}
+        checked = 0
+        drift = []
+        fixes = []
+        for post in db.community_posts.find(query, projection):
+            checked += 1
+            base = post.get("vote_base") or {}
+            events = replayed.get(post["post_id"], {})
+            expected = {
+                field: base.get(field, 0) + events.get(field, 0) for field in ("upvotes", "downvotes")
+            }
+            actual = {field: post.get(field, 0) for field in ("upvotes", "downvotes")}
+            if expected != actual:
+                drift.append({"post_id": post["post_id"], "materialized": actual, "replayed": expected})
+                fixes.append(UpdateOne(
+                    {"post_id": post["post_id"]},
+                    {"$set": {**expected, "events_through": last_id, "updated_at": datetime.now()}},
+                ))
+        if apply and fixes:
+            db.community_posts.bulk_write(fixes, ordered=False)
+        return {
+            "checkpoint": last_id and str(last_id),
+            "posts_checked": checked,
+            "drift": drift,
+            "applied": apply and bool(fixes),
+        }
+
+
+def audit_events(db, post_id: Optional[str] = None, since: Optional[datetime] = None,
+                 until: Optional[datetime] = None, limit: int = 100) -> List[dict]:
+    """Events in time order, across partitions, for reviewing suspected vote manipulation"""
+    query = {}
+    if post_id:
+        query["post_id"] = post_id
+    if since or until:
+        query["at"] = {key: value for key, value in (("$gte", since), ("$lte", until)) if value}
+    found = []
+    for partition in partitions(db, since=since, until=until):
+        remaining = limit - len(found)
+        if remaining <= 0:
+            break
+        for event in db[partition].find(query).sort("_id", ASCENDING).limit(remaining):
+            event["event_id"] = str(event.pop("_id"))
+            found.append(event)
+    return found
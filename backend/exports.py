@@ -0,0 +1,131 @@
+import csv
+import importlib.util
+import io
+from datetime import datetime
+
+EXPORT_BATCH_SIZE = 1000
+
+# Exported fields and their Parquet column types
+EXPORT_COLUMNS = {
+    "candidates": {
+        "candidate_id": "string",
+        "name": "string",
+        "party": "string",
+        "constituency": "string",
+        "age": "int64",
+        "education": "string",
+        "criminal_cases": "int64",
+        "assets": "float64",
+        "liabilities": "float64",
+        "incumbent": "bool",
+    },
+    "fact_checks": {
+        "fact_id": "string",
+        "title": "string",
+        "description": "string",
+        "verdict": "string",
+        "source_url": "string",
+        "tags": "list<string>",
+        "date_added": "timestamp",
+        "constituency": "string",
+    },
+}
+
+
+def parquet_available() -> bool:
+    # Parquet export is optional; pyarrow is slow to import, so it is only
+    # loaded when the first Parquet export is requested
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _batches(collection, fields, batch_size):
+    """Yield lists of documents from a cursor without materializing the collection"""
+    projection = {"_id": 0, **{field: 1 for field in fields}}
+    cursor = collection.find({}, projection).sort(fields[0], 1).batch_size(batch_size)
+    batch = []
+    try:
+        for document in cursor:
+            batch.append(document)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        cursor.close()
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(collection, columns, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield CSV chunks, one per cursor batch"""
+    fields = list(columns)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for batch in _batches(collection, fields, batch_size):
+        for document in batch:
+            writer.writerow([_csv_value(document.get(field)) for field in fields])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _parquet_schema(pa, columns):
+    types = {
+        "string": pa.string(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "list<string>": pa.list_(pa.string()),
+        "timestamp": pa.timestamp("ms"),
+    }
+    return pa.schema([(field, types[kind]) for field, kind in columns.items()])
+
+
+def stream_parquet(collection, columns, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield a Parquet file in chunks, writing one row group per cursor batch"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fields = list(columns)
+    schema = _parquet_schema(pa, columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in _batches(collection, fields, batch_size):
+            table = pa.Table.from_pylist(batch, schema=schema)
+            writer.write_table(table)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
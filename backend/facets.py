@@ -0,0 +1,56 @@
+from typing import List, Optional
+
+
+def fact_check_query(
+    verdict: Optional[str] = None,
+    constituency: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+) -> dict:
+    """Mongo filter for fact-checks; multiple tags must all be present"""
+    query = {}
+    if verdict:
+        query["verdict"] = verdict
+    if constituency:
+        query["constituency"] = constituency
+    if tags:
+        query["tags"] = tags[0] if len(tags) == 1 else {"$all": tags}
+    return query
+
+
+def fact_check_facets(db, query: dict, tag_limit: int = 50):
+    """Counts per tag and per verdict for the fact-checks matching `query`.
+
+    The `$match` runs first so it can use the tag/verdict indexes, and only the
+    two faceted fields are carried through the rest of the pipeline.
+    """
+    pipeline = [
+        {"$match": query},
+        {"$project": {"_id": 0, "tags": 1, "verdict": 1}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "verdicts": [
+                {"$group": {"_id": "$verdict", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+            ],
+            "tags": [
+                {"$unwind": "$tags"},
+                {"$group": {"_id": "$tags", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+                {"$limit": tag_limit},
+            ],
+        }},
+    ]
+    result = next(db.fact_checks.aggregate(pipeline), None) or {}
+    total = result.get("total") or [{"count": 0}]
+    return {
+        "total": total[0]["count"],
+        "verdicts": [{"verdict": row["_id"], "count": row["count"]} for row in result.get("verdicts", [])],
+        "tags": [{"tag": row["_id"], "count": row["count"]} for row in result.get("tags", [])],
+    }
+
+
+def ensure_facet_indexes(db):
+    # `tags` is an array, so these are multikey indexes
+    db.fact_checks.create_index([("tags", 1)])
+    db.fact_checks.create_index([("verdict", 1), ("tags", 1)])
+    db.fact_checks.create_index([("constituency", 1), ("tags", 1)])
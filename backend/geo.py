@@ -0,0 +1,129 @@
+import json
+import logging
+import math
+import os
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def _ring_contains(ring, lon: float, lat: float) -> bool:
+    """Ray casting point-in-polygon test for one linear ring of (lon, lat) pairs"""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _polygon_contains(polygon, lon: float, lat: float) -> bool:
+    """GeoJSON polygon: first ring is the boundary, the rest are holes"""
+    if not _ring_contains(polygon[0], lon, lat):
+        return False
+    return not any(_ring_contains(hole, lon, lat) for hole in polygon[1:])
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class _Area:
+    __slots__ = ("key", "polygons", "bbox")
+
+    def __init__(self, key: str, polygons):
+        self.key = key
+        self.polygons = polygons
+        points = [point for polygon in polygons for point in polygon[0]]
+        self.bbox = (
+            min(point[0] for point in points), min(point[1] for point in points),
+            max(point[0] for point in points), max(point[1] for point in points),
+        )
+
+    def contains(self, lon: float, lat: float) -> bool:
+        min_lon, min_lat, max_lon, max_lat = self.bbox
+        if not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+            return False
+        return any(_polygon_contains(polygon, lon, lat) for polygon in self.polygons)
+
+
+class ConstituencyLocator:
+    """In-process spatial index over constituency boundaries and centroids.
+
+    Boundaries are bucketed into a uniform grid by bounding box, so a lookup
+    only runs point-in-polygon tests against the few areas that overlap the
+    point's cell. Constituencies that only have a centroid (Point features)
+    are matched by nearest centroid when no boundary contains the point.
+    """
+
+    def __init__(self, cell_degrees: float = 0.05):
+        self.cell_degrees = cell_degrees
+        self._grid = {}
+        self._centroids: List[Tuple[str, float, float]] = []
+        self.areas = 0
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.areas or self._centroids)
+
+    def _cell(self, lon: float, lat: float):
+        return int(math.floor(lon / self.cell_degrees)), int(math.floor(lat / self.cell_degrees))
+
+    def add_area(self, key: str, polygons):
+        area = _Area(key, polygons)
+        min_x, min_y = self._cell(area.bbox[0], area.bbox[1])
+        max_x, max_y = self._cell(area.bbox[2], area.bbox[3])
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                self._grid.setdefault((x, y), []).append(area)
+        self.areas += 1
+
+    def add_centroid(self, key: str, lon: float, lat: float):
+        self._centroids.append((key, lon, lat))
+
+    def load_geojson(self, feature_collection: dict, key_property: str = "constituency_id"):
+        for feature in feature_collection.get("features", []):
+            key = str(feature.get("properties", {}).get(key_property, ""))
+            geometry = feature.get("geometry") or {}
+            if not key:
+                continue
+            if geometry.get("type") == "Polygon":
+                self.add_area(key, [geometry["coordinates"]])
+            elif geometry.get("type") == "MultiPolygon":
+                self.add_area(key, geometry["coordinates"])
+            elif geometry.get("type") == "Point":
+                lon, lat = geometry["coordinates"][:2]
+                self.add_centroid(key, lon, lat)
+
+    def locate(self, lat: float, lon: float, max_centroid_km: float = 25.0) -> Optional[Tuple[str, str]]:
+        """Return (key, match) where match is "boundary" or "nearest_centroid", or None"""
+        for area in self._grid.get(self._cell(lon, lat), ()):
+            if area.contains(lon, lat):
+                return area.key, "boundary"
+        if self._centroids:
+            distance, key = min(
+                (haversine_km(lat, lon, c_lat, c_lon), key) for key, c_lon, c_lat in self._centroids
+            )
+            if distance <= max_centroid_km:
+                return key, "nearest_centroid"
+        return None
+
+
+def load_locator(path: str, key_property: str = "constituency_id") -> ConstituencyLocator:
+    """Build a locator from a GeoJSON FeatureCollection; an absent file gives an empty index"""
+    locator = ConstituencyLocator()
+    if not os.path.exists(path):
+        logger.warning("Constituency geometry file %s not found; location lookup is disabled", path)
+        return locator
+    with open(path, encoding="utf-8") as geometry_file:
+        locator.load_geojson(json.load(geometry_file), key_property)
+    return locator
@@ -0,0 +1,215 @@
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from fastapi import Query
+from pymongo import ASCENDING
+from pymongo.collation import Collation
+
+from storage import MemoryCollection
+
+SUPPORTED_LOCALES = ("en", "ta")
+# Stored text fields are in this language; other locales live under
+# `translations.<locale>.<field>` on the same document
+DEFAULT_LOCALE = "en"
+
+TRANSLATABLE_FIELDS = {
+    "constituencies": ("name",),
+    "manifestos": ("title", "description", "one_minute_explanation"),
+    "fact_checks": ("title", "description"),
+}
+
+# Listings that can be ordered by a text field, and the field they sort on
+SORT_FIELDS = {
+    "constituencies": "name",
+    "manifestos": "title",
+}
+
+class _RequestLocale:
+    __slots__ = ("locale", "used")
+
+    def __init__(self, locale: str):
+        self.locale = locale
+        self.used = False
+
+
+_request_locale: ContextVar[Optional[_RequestLocale]] = ContextVar("request_locale", default=None)
+
+
+def request_locale() -> str:
+    """The locale negotiated for this request; the response is labelled with it once asked for"""
+    state = _request_locale.get()
+    if state is None:
+        return DEFAULT_LOCALE
+    state.used = True
+    return state.locale
+
+
+def negotiate(accept_language: str = "", lang: Optional[str] = None) -> str:
+    """Pick a supported locale: `lang=` wins, then the Accept-Language preference order"""
+    if lang:
+        tag = lang.strip().lower().split("-")[0]
+        if tag in SUPPORTED_LOCALES:
+            return tag
+    preferences = []
+    for position, part in enumerate(accept_language.split(",")):
+        tag, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                continue
+        tag = tag.strip().lower().split("-")[0]
+        if tag in SUPPORTED_LOCALES and quality > 0:
+            preferences.append((-quality, position, tag))
+    return min(preferences)[2] if preferences else DEFAULT_LOCALE
+
+
+class LocaleMiddleware:
+    """Negotiates the request's locale for `request_locale()`.
+
+    Only responses from routes that asked for it get `Content-Language` and
+    `Vary: Accept-Language`; everything else is the same in every language.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        params = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        accept_language = dict(scope.get("headers", [])).get(b"accept-language", b"").decode("latin-1")
+        state = _RequestLocale(negotiate(accept_language, params.get("lang")))
+        token = _request_locale.set(state)
+
+        async def send_with_locale(message):
+            if message["type"] == "http.response.start" and state.used:
+                headers = list(message.get("headers", []))
+                headers.append((b"content-language", state.locale.encode("latin-1")))
+                headers.append((b"vary", b"Accept-Language"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_locale)
+        finally:
+            _request_locale.reset(token)
+
+
+async def lang_parameter(
+    lang: Optional[str] = Query(
+        None, description=f"Response language ({', '.join(SUPPORTED_LOCALES)}); overrides Accept-Language"
+    ),
+):
+    """Documents `lang=` on every route; LocaleMiddleware has already applied it.
+
+    Async and unvalidated on purpose: `negotiate()` normalizes tags such as
+    `ta-IN` and falls back for unknown ones, and a sync dependency would
+    send every request through the threadpool.
+    """
+
+
+def localize(document: dict, collection: str, locale: str) -> dict:
+    """`document` with its text fields in `locale`, falling back to the stored text"""
+    if locale == DEFAULT_LOCALE:
+        return document
+    translated = (document.get("translations") or {}).get(locale)
+    if not translated:
+        return document
+    return {**document, **{field: translated[field] for field in TRANSLATABLE_FIELDS[collection] if translated.get(field)}}
+
+
+def _sort_key(document: dict, field: str, locale: str):
+    # Mirrors the Mongo sort below: untranslated documents first, then by the
+    # translated text. Code-point order of casefolded text stands in for ICU.
+    if locale == DEFAULT_LOCALE:
+        return (document.get(field) or "").casefold()
+    translated = ((document.get("translations") or {}).get(locale) or {}).get(field)
+    return (translated is not None, (translated or "").casefold(), (document.get(field) or "").casefold())
+
+
+def _mongo_sort(field: str, locale: str):
+    if locale == DEFAULT_LOCALE:
+        return [(field, ASCENDING)]
+    return [(f"translations.{locale}.{field}", ASCENDING), (field, ASCENDING)]
+
+
+def localized_find(source, collection: str, query: dict, projection: dict, locale: str, sort: bool = False):
+    """Documents matching `query`, localized, optionally in the locale's order of the SORT_FIELDS field"""
+    field = SORT_FIELDS.get(collection) if sort else None
+    if locale != DEFAULT_LOCALE:
+        projection = {**projection, "translations": 1}
+    if isinstance(source, MemoryCollection):
+        documents = source.find(query, projection)
+        if field:
+            documents.sort(key=lambda document: _sort_key(document, field, locale))
+    else:
+        cursor = source.find(query, projection)
+        if field:
+            cursor = cursor.sort(_mongo_sort(field, locale)).collation(Collation(locale=locale))
+        documents = list(cursor)
+    return [localize(document, collection, locale) for document in documents]
+
+
+def search_fields(collection: str, fields, locale: str):
+    """Fields a text search should match: the stored ones plus their translations in `locale`"""
+    translated = [
+        f"translations.{locale}.{field}" for field in fields
+        if locale != DEFAULT_LOCALE and field in TRANSLATABLE_FIELDS.get(collection, ())
+    ]
+    return [*fields, *translated]
+
+
+def ensure_collation_indexes(db):
+    for collection, field in SORT_FIELDS.items():
+        for locale in SUPPORTED_LOCALES:
+            db[collection].create_index(
+                _mongo_sort(field, locale), collation=Collation(locale=locale), name=f"{field}_{locale}"
+            )
+
+
+class PayloadCache:
+    """Serialized response bodies per request key and locale, bounded LRU.
+
+    An entry is served only while the fingerprint of the data it was built
+    from is unchanged, so every locale costs one build per data change and
+    a dictionary lookup per request after that.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, fingerprint) -> Optional[bytes]:
+        if fingerprint is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != fingerprint:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, fingerprint, body: bytes):
+        if fingerprint is None:
+            return
+        with self._lock:
+            self._entries[key] = (fingerprint, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "capacity": self.maxsize, "hits": self.hits, "misses": self.misses}
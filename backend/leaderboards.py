@@ -0,0 +1,378 @@
+import logging
+import random
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Sliding windows as (window, bucket) lengths in seconds; counts expire a
+# bucket at a time, so a window covers between window - bucket and window
+WINDOWS = {
+    "hour": (3600, 60),
+    "day": (86400, 900),
+    "week": (7 * 86400, 7200),
+}
+ALL_TIME = "all"
+
+_MAX_LEVEL = 24
+_PROMOTE = 0.25
+
+
+class _Node:
+    __slots__ = ("item", "next")
+
+    def __init__(self, item, level: int):
+        self.item = item
+        self.next = [None] * level
+
+
+class SkipList:
+    """Sorted collection with O(log n) expected insert and remove, iterated in order"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self._head = _Node(None, _MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        node = self._head.next[0]
+        while node is not None:
+            yield node.item
+            node = node.next[0]
+
+    def _predecessors(self, item):
+        update = [self._head] * _MAX_LEVEL
+        node = self._head
+        for level in reversed(range(self._level)):
+            while node.next[level] is not None and node.next[level].item < item:
+                node = node.next[level]
+            update[level] = node
+        return update
+
+    def insert(self, item):
+        update = self._predecessors(item)
+        level = 1
+        while level < _MAX_LEVEL and self._random.random() < _PROMOTE:
+            level += 1
+        self._level = max(self._level, level)
+        node = _Node(item, level)
+        for index in range(level):
+            node.next[index] = update[index].next[index]
+            update[index].next[index] = node
+        self._size += 1
+
+    def remove(self, item):
+        update = self._predecessors(item)
+        node = update[0].next[0]
+        if node is None or node.item != item:
+            raise KeyError(item)
+        for index in range(len(node.next)):
+            if update[index].next[index] is node:
+                update[index].next[index] = node.next[index]
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+
+
+class Leaderboard:
+    """Scores per member, ordered highest first (ties by member)"""
+
+    def __init__(self, keep_zero: bool = False):
+        self.keep_zero = keep_zero
+        self._scores: Dict[str, int] = {}
+        self._order = SkipList()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def score(self, member: str) -> Optional[int]:
+        return self._scores.get(member)
+
+    def increment(self, member: str, delta: int):
+        old = self._scores.get(member)
+        if old is not None:
+            self._order.remove((-old, member))
+        new = (old or 0) + delta
+        if new == 0 and not self.keep_zero:
+            self._scores.pop(member, None)
+            return
+        self._scores[member] = new
+        self._order.insert((-new, member))
+
+    def remove(self, member: str):
+        old = self._scores.pop(member, None)
+        if old is not None:
+            self._order.remove((-old, member))
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        found = []
+        for negative_score, member in self._order:
+            if len(found) >= limit:
+                break
+            found.append((member, -negative_score))
+        return found
+
+
+class WindowedLeaderboard:
+    """A leaderboard over the last `window_seconds`, or all time when that is None.
+
+    Increments are also kept per time bucket; when a bucket leaves the window
+    its counts are subtracted again.
+    """
+
+    def __init__(self, window_seconds: Optional[int] = None, bucket_seconds: Optional[int] = None,
+                 keep_zero: bool = False):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.board = Leaderboard(keep_zero)
+        self._buckets: Dict[int, Dict[str, int]] = {}
+
+    def _bucket(self, moment: datetime) -> int:
+        if self.window_seconds is None:
+            return 0
+        return int(moment.timestamp()) // self.bucket_seconds
+
+    def _oldest(self, now: datetime) -> int:
+        return self._bucket(now) - self.window_seconds // self.bucket_seconds + 1
+
+    def increment(self, member: str, delta: int, at: datetime, now: datetime) -> Optional[int]:
+        return self.add(member, delta, self._bucket(at), now)
+
+    def add(self, member: str, delta: int, bucket: int, now: datetime) -> Optional[int]:
+        """Count `delta` in `bucket`; returns the bucket, or None when it already left the window"""
+        self.expire(now)
+        if self.window_seconds is not None and bucket < self._oldest(now):
+            return None
+        counts = self._buckets.setdefault(bucket, {})
+        counts[member] = counts.get(member, 0) + delta
+        self.board.increment(member, delta)
+        return bucket
+
+    def oldest(self, now: datetime) -> Optional[int]:
+        """The oldest bucket still inside the window, or None for all time"""
+        if self.window_seconds is None:
+            return None
+        return self._oldest(now)
+
+    def expire(self, now: datetime):
+        if self.window_seconds is None:
+            return
+        oldest = self._oldest(now)
+        for bucket in [bucket for bucket in self._buckets if bucket < oldest]:
+            for member, delta in self._buckets.pop(bucket).items():
+                self.board.increment(member, -delta)
+
+    def remove(self, member: str):
+        self.board.remove(member)
+        for counts in self._buckets.values():
+            counts.pop(member, None)
+
+    def top(self, limit: int, now: datetime):
+        self.expire(now)
+        return self.board.top(limit)
+
+
+# Increments keyed (board, window, bucket, member); all-time counts use bucket 0
+Increments = Dict[Tuple[str, str, int, str], int]
+
+
+class EngagementLeaderboards:
+    """Most engaged constituencies and top posts across the state, all time and per window.
+
+    A constituency scores a point for each post published in it and each
+    vote on one of its posts; a post scores its net votes. Fed by the post
+    pipeline and the vote route, and read by the leaderboard routes, all on
+    the event loop, so no locking is needed.
+
+    Counts are shared between instances through Mongo: each instance keeps
+    the increments it recorded since its last flush (`take_pending`), adds
+    them to the stored counts, and `load`s the merged totals back.
+    """
+
+    BOARDS = ("constituencies", "posts")
+
+    def __init__(self, windows=WINDOWS):
+        self.windows = windows
+        self.restored = False
+        self._boards = self._empty_boards()
+        self._pending: Increments = {}
+        self._removed: Set[str] = set()
+
+    def _empty_boards(self):
+        return {
+            name: {
+                ALL_TIME: WindowedLeaderboard(keep_zero=name == "posts"),
+                **{window: WindowedLeaderboard(*lengths) for window, lengths in self.windows.items()},
+            }
+            for name in self.BOARDS
+        }
+
+    def _add(self, name: str, window: str, member: str, delta: int, at: datetime, now: datetime):
+        bucket = self._boards[name][window].increment(member, delta, at, now)
+        if bucket is not None:
+            key = (name, window, bucket, member)
+            # Zero increments are kept too: they list a new post on the all-time board
+            self._pending[key] = self._pending.get(key, 0) + delta
+
+    def _increment(self, name: str, member: str, delta: int, at: datetime, now: Optional[datetime] = None):
+        now = now or datetime.now()
+        for window in self._boards[name]:
+            self._add(name, window, member, delta, at, now)
+
+    def record_posts(self, posts: Iterable[dict]):
+        """Post pipeline listener: count newly published posts"""
+        for post in posts:
+            self._increment("constituencies", post["constituency"], 1, post["created_at"])
+            self._increment("posts", post["post_id"], 0, post["created_at"])
+
+    def record_vote(self, post_id: str, constituency: str, delta: int, at: Optional[datetime] = None):
+        at = at or datetime.now()
+        self._increment("constituencies", constituency, 1, at)
+        self._increment("posts", post_id, delta, at)
+
+    def remove_post(self, post_id: str):
+        for board in self._boards["posts"].values():
+            board.remove(post_id)
+        self._pending = {key: delta for key, delta in self._pending.items() if key[0] != "posts" or key[3] != post_id}
+        self._removed.add(post_id)
+
+    def top(self, name: str, window: str, limit: int, now: Optional[datetime] = None):
+        return self._boards[name][window].top(limit, now or datetime.now())
+
+    def take_pending(self) -> Tuple[Increments, Set[str]]:
+        """Increments and removed posts recorded since the last call, to be persisted"""
+        pending, removed = self._pending, self._removed
+        self._pending, self._removed = {}, set()
+        return pending, removed
+
+    def restore_pending(self, increments: Increments, removed: Set[str]):
+        """Put back what `take_pending` returned when persisting it failed"""
+        for key, delta in increments.items():
+            if key[0] == "posts" and key[3] in self._removed:
+                continue
+            self._pending[key] = self._pending.get(key, 0) + delta
+        self._removed |= removed
+
+    def expired_buckets(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Per window, the bucket below which stored counts can be dropped"""
+        now = now or datetime.now()
+        boards = self._boards[self.BOARDS[0]]
+        return {window: boards[window].oldest(now) for window in self.windows}
+
+    def load(self, counts: Iterable[dict], now: Optional[datetime] = None):
+        """Serve the merged stored counts, plus whatever this instance has not persisted yet"""
+        now = now or datetime.now()
+        boards = self._empty_boards()
+        stored = ((count["board"], count["window"], count["bucket"], count["member"], count["count"])
+                  for count in counts)
+        pending = ((*key, delta) for key, delta in self._pending.items())
+        for source in (stored, pending):
+            for name, window, bucket, member, delta in source:
+                board = boards.get(name, {}).get(window)
+                if board is None or (name == "posts" and member in self._removed):
+                    continue
+                board.add(member, delta, bucket, now)
+        self._boards = boards
+        self.restored = True
+
+    def restore(self, snapshot: dict, now: Optional[datetime] = None):
+        """Count a legacy single-document snapshot as this instance's increments"""
+        now = now or datetime.now()
+        for name, boards in snapshot.get("boards", {}).items():
+            for window, buckets in boards.items():
+                board = self._boards.get(name, {}).get(window)
+                if board is None:
+                    continue
+                for bucket, counts in buckets:
+                    # Re-bucketed at the start of the saved bucket; already expired ones are skipped
+                    at = datetime.fromtimestamp(bucket * board.bucket_seconds) if board.bucket_seconds else now
+                    for member, delta in counts:
+                        self._add(name, window, member, delta, at, now)
+
+    def rebuild(self, posts: Iterable[dict], now: Optional[datetime] = None):
+        """Seed from stored posts when nothing was persisted yet; votes only count all time"""
+        now = now or datetime.now()
+        for post in posts:
+            if self._boards["posts"][ALL_TIME].board.score(post["post_id"]) is not None:
+                continue  # already counted by the post pipeline since startup
+            upvotes, downvotes = post.get("upvotes", 0), post.get("downvotes", 0)
+            self._increment("constituencies", post["constituency"], 1, post["created_at"], now)
+            self._increment("posts", post["post_id"], 0, post["created_at"], now)
+            self._add("constituencies", ALL_TIME, post["constituency"], upvotes + downvotes, now, now)
+            self._add("posts", ALL_TIME, post["post_id"], upvotes - downvotes, now, now)
+
+    def sizes(self):
+        return {
+            name: {window: len(board.board) for window, board in boards.items()}
+            for name, boards in self._boards.items()
+        }
+
+
+SEED_ID = "seeded"
+
+
+def claim_seed(db) -> bool:
+    """True for the one instance that should seed the shared counts from stored data"""
+    try:
+        db.leaderboard_counts.insert_one({"_id": SEED_ID, "at": datetime.now()})
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+def load_counts(db) -> List[dict]:
+    return list(db.leaderboard_counts.find({"board": {"$in": list(EngagementLeaderboards.BOARDS)}}, {"_id": 0}))
+
+
+def save_counts(db, increments: Increments, removed: Set[str], expired_buckets: Dict[str, int]) -> Increments:
+    """Add one instance's increments to the stored counts, then drop removed posts and expired buckets.
+
+    One small document per (board, window, bucket, member), so instances
+    never overwrite each other's counts. Returns the increments that were
+    rejected, for the caller to retry.
+    """
+    keys = list(increments)
+    updates = [
+        UpdateOne(
+            {"_id": "/".join((name, window, str(bucket), member))},
+            {"$inc": {"count": increments[(name, window, bucket, member)]},
+             "$setOnInsert": {"board": name, "window": window, "bucket": bucket, "member": member}},
+            upsert=True,
+        )
+        for name, window, bucket, member in keys
+    ]
+    rejected = {}
+    if updates:
+        try:
+            db.leaderboard_counts.bulk_write(updates, ordered=False)
+        except BulkWriteError as error:
+            if error.details.get("writeConcernErrors"):
+                raise
+            rejected = {keys[item["index"]]: increments[keys[item["index"]]] for item in error.details["writeErrors"]}
+            logger.warning("%d leaderboard increments were rejected and will be retried", len(rejected))
+    if removed:
+        db.leaderboard_counts.delete_many({"board": "posts", "member": {"$in": list(removed)}})
+    for window, oldest in expired_buckets.items():
+        db.leaderboard_counts.delete_many({"window": window, "bucket": {"$lt": oldest}})
+    return rejected
+
+
+def ensure_leaderboard_indexes(db):
+    db.leaderboard_counts.create_index([("window", 1), ("bucket", 1)])
+    db.leaderboard_counts.create_index([("board", 1), ("member", 1)])
+
+
+def load_seed_data(db):
+    """The legacy single-document snapshot, or the stored posts to rebuild from when there is none"""
+    snapshot = db.leaderboard_snapshots.find_one({"_id": "latest"}, {"_id": 0})
+    if snapshot is not None:
+        return snapshot, None
+    projection = {"_id": 0, "post_id": 1, "constituency": 1, "created_at": 1, "upvotes": 1, "downvotes": 1}
+    return None, list(db.community_posts.find({}, projection))
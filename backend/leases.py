@@ -0,0 +1,21 @@
+from datetime import datetime, timedelta
+
+from pymongo.errors import DuplicateKeyError
+
+
+def acquire_lease(collection, lease_id: str, owner: str, seconds: float) -> bool:
+    """Take or extend a Mongo-side lease so one process at a time does a job"""
+    now = datetime.now()
+    try:
+        collection.update_one(
+            {"_id": lease_id, "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=seconds)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:  # held by someone else: the filter missed and the upsert collided
+        return False
+    return True
+
+
+def release_lease(collection, lease_id: str, owner: str):
+    collection.update_one({"_id": lease_id, "owner": owner}, {"$set": {"expires_at": datetime.now()}})
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from pymongo import UpdateOne
+
+# collection -> (document key, URL field); the result is stored in `link_status`
+LINK_FIELDS = {
+    "manifestos": ("promise_id", "evidence_url"),
+    "fact_checks": ("fact_id", "source_url"),
+}
+
+USER_AGENT = "VoteWiseTN-LinkChecker/1.0"
+
+
+def create_client(max_connections: int = 20, timeout: float = 10.0) -> httpx.AsyncClient:
+    """Shared pooled client; connections to a host are reused across checks"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=httpx.Timeout(timeout),
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+    )
+
+
+class LinkChecker:
+    """Checks URLs through a shared client with a per-host concurrency cap and a result cache"""
+
+    def __init__(self, client: httpx.AsyncClient, per_host: int = 2, cache_ttl: float = 3600.0):
+        self.client = client
+        self.per_host = per_host
+        self.cache_ttl = cache_ttl
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._cache: Dict[str, tuple] = {}
+        self.cache_hits = 0
+        self.requests = 0
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return limit
+
+    async def _fetch(self, url: str) -> dict:
+        self.requests += 1
+        try:
+            response = await self.client.head(url)
+            # Some servers don't implement HEAD; fall back to a GET without reading the body
+            if response.status_code in (403, 405, 501):
+                async with self.client.stream("GET", url) as streamed:
+                    response = streamed
+            return {"ok": response.status_code < 400, "status_code": response.status_code, "error": None}
+        except httpx.TimeoutException:
+            return {"ok": False, "status_code": None, "error": "timeout"}
+        except httpx.HTTPError as error:
+            return {"ok": False, "status_code": None, "error": type(error).__name__}
+
+    async def check(self, url: str) -> dict:
+        cached = self._cache.get(url)
+        if cached and time.monotonic() - cached[0] < self.cache_ttl:
+            self.cache_hits += 1
+            return cached[1]
+        async with self._host_limit(url):
+            result = {**await self._fetch(url), "checked_at": datetime.now()}
+        self._cache[url] = (time.monotonic(), result)
+        return result
+
+    async def check_many(self, urls: Iterable[str]) -> Dict[str, dict]:
+        unique = list(dict.fromkeys(url for url in urls if url))
+        results = await asyncio.gather(*(self.check(url) for url in unique))
+        return dict(zip(unique, results))
+
+
+def _changed(previous: Optional[dict], current: dict) -> bool:
+    if not previous:
+        return True
+    return (previous.get("ok"), previous.get("status_code")) != (current["ok"], current["status_code"])
+
+
+async def crawl_links(db, checker: LinkChecker, recheck_after: timedelta):
+    """Check links not checked within `recheck_after` and store the results on the documents.
+
+    `updated_at` only moves when a link's health actually changes, so delta-sync
+    clients aren't sent every document after each crawl.
+    """
+    stale_before = datetime.now() - recheck_after
+    for collection, (key, url_field) in LINK_FIELDS.items():
+        query = {
+            url_field: {"$nin": [None, ""]},
+            "$or": [
+                {"link_status.checked_at": {"$lt": stale_before}},
+                {"link_status": {"$exists": False}},
+            ],
+        }
+        projection = {"_id": 0, key: 1, url_field: 1, "link_status": 1}
+        documents = await asyncio.to_thread(lambda: list(db[collection].find(query, projection)))
+        if not documents:
+            continue
+        results = await checker.check_many(document[url_field] for document in documents)
+
+        # Stamped at write time, not check time: checks can take minutes, and
+        # cached results are older still, which would hide them from delta sync
+        written_at = datetime.now()
+        updates = []
+        for document in documents:
+            status = results[document[url_field]]
+            fields = {"link_status": status}
+            if _changed(document.get("link_status"), status):
+                fields["updated_at"] = written_at
+            updates.append(UpdateOne({key: document[key]}, {"$set": fields}))
+        await asyncio.to_thread(db[collection].bulk_write, updates, ordered=False)
+
+
+def ensure_link_indexes(db):
+    for collection in LINK_FIELDS:
+        db[collection].create_index([("link_status.checked_at", 1)])
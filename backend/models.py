@@ -0,0 +1,136 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+# Documents are validated against these once, when they are written. Reads decode
+# into the slotted records in records.py and skip per-response validation.
+class Constituency(BaseModel):
+    constituency_id: str
+    name: str
+    district: str
+    updated_at: Optional[datetime] = None
+
+class Candidate(BaseModel):
+    candidate_id: str
+    name: str
+    party: str
+    constituency: str
+    age: int
+    education: str
+    criminal_cases: int
+    assets: float
+    liabilities: float
+    incumbent: bool = False
+    photo_url: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+class RankedCandidate(Candidate):
+    net_worth: float
+    education_level: int
+    ranks: Dict[str, int]
+    state_percentiles: Dict[str, float]
+
+class ConstituencyLocation(BaseModel):
+    constituency: Constituency
+    match: str  # "boundary" or "nearest_centroid"
+    candidates: List[Candidate]
+
+class CandidateComparison(BaseModel):
+    constituency: str
+    sort_by: str
+    refreshed_at: Optional[datetime] = None
+    candidates: List[RankedCandidate]
+
+class LinkStatus(BaseModel):
+    ok: bool
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    checked_at: datetime
+
+class ManifestoPromise(BaseModel):
+    promise_id: str
+    party: str
+    title: str
+    description: str
+    category: str
+    fulfilled: Optional[bool] = None
+    evidence_url: Optional[str] = None
+    one_minute_explanation: str
+    link_status: Optional[LinkStatus] = None
+    updated_at: Optional[datetime] = None
+
+class FactCheck(BaseModel):
+    fact_id: str
+    title: str
+    description: str
+    verdict: str  # "True", "False", "Misleading", "Unverified"
+    source_url: Optional[str] = None
+    tags: List[str] = []
+    date_added: datetime
+    constituency: Optional[str] = None
+    link_status: Optional[LinkStatus] = None
+    updated_at: Optional[datetime] = None
+
+class FactCheckCreate(BaseModel):
+    title: str = Field(..., min_length=3, max_length=300)
+    description: str = Field(..., min_length=1, max_length=5000)
+    verdict: str = Field(..., pattern="^(True|False|Misleading|Unverified)$")
+    source_url: Optional[str] = None
+    tags: List[str] = []
+    constituency: Optional[str] = None
+
+class RelatedFactCheck(FactCheck):
+    similarity: float  # estimated Jaccard similarity of the claim text
+
+class RelatedFactChecks(BaseModel):
+    fact_id: str
+    related: List[RelatedFactCheck]
+
+class FactCheckIngested(BaseModel):
+    fact_check: FactCheck
+    related: List[RelatedFactCheck]
+
+class FactCheckSync(BaseModel):
+    items: List[FactCheck]
+    deleted: List[str]
+    sync_token: str
+
+class CommunityPost(BaseModel):
+    post_id: str
+    constituency: str
+    title: str
+    content: str
+    author_id: str  # Anonymous ID
+    upvotes: int = 0
+    downvotes: int = 0
+    created_at: datetime
+    replies: List[dict] = []
+    updated_at: Optional[datetime] = None
+
+class CommunityPostSync(BaseModel):
+    items: List[CommunityPost]
+    deleted: List[str]
+    sync_token: str
+
+def validated(model, documents):
+    """Validate documents against a model before they are stored"""
+    return [model(**document).model_dump() for document in documents]
+
+class VoteDelta(BaseModel):
+    candidate_id: str
+    votes: int = Field(..., ge=0)
+
+class RoundUpdate(BaseModel):
+    constituency: str
+    round: int = Field(..., ge=1)
+    deltas: List[VoteDelta] = Field(..., min_length=1)
+
+class CommunityPostCreate(BaseModel):
+    constituency: str = Field(..., min_length=1, max_length=100)
+    title: str = Field(..., min_length=3, max_length=200)
+    content: str = Field(..., min_length=1, max_length=5000)
+
+class TranslationUpdate(BaseModel):
+    locale: str
+    fields: Dict[str, str] = Field(..., min_length=1)
@@ -0,0 +1,66 @@
+import os
+import re
+from typing import Callable, List, Optional
+
+# A moderation filter takes a post document and returns a rejection reason, or None to accept it
+ModerationFilter = Callable[[dict], Optional[str]]
+
+_URL_PATTERN = re.compile(r"https?://|www\.", re.IGNORECASE)
+_REPEATED_CHAR_PATTERN = re.compile(r"(.)\1{9,}")
+_WORD_PATTERN = re.compile(r"[\w\u0B80-\u0BFF]+")
+
+MAX_LINKS = int(os.environ.get('MODERATION_MAX_LINKS', '2'))
+
+
+def _text(post: dict) -> str:
+    return f"{post.get('title', '')}\n{post.get('content', '')}"
+
+
+def blocklist_filter(words) -> ModerationFilter:
+    """Reject posts containing any of the given words (case-insensitive, whole words)"""
+    blocked = {word.strip().lower() for word in words if word.strip()}
+
+    def check(post: dict) -> Optional[str]:
+        if blocked and any(word.lower() in blocked for word in _WORD_PATTERN.findall(_text(post))):
+            return "profanity"
+        return None
+
+    return check
+
+
+def link_spam_filter(post: dict) -> Optional[str]:
+    if len(_URL_PATTERN.findall(_text(post))) > MAX_LINKS:
+        return "too_many_links"
+    return None
+
+
+def repeated_character_filter(post: dict) -> Optional[str]:
+    if _REPEATED_CHAR_PATTERN.search(_text(post)):
+        return "repeated_characters"
+    return None
+
+
+def shouting_filter(post: dict) -> Optional[str]:
+    letters = [char for char in post.get("content", "") if char.isascii() and char.isalpha()]
+    if len(letters) >= 40 and sum(char.isupper() for char in letters) / len(letters) > 0.8:
+        return "all_caps"
+    return None
+
+
+def default_filters() -> List[ModerationFilter]:
+    """Filters applied to new community posts; the blocklist comes from MODERATION_BLOCKLIST"""
+    blocklist = os.environ.get('MODERATION_BLOCKLIST', '').split(',')
+    return [
+        blocklist_filter(blocklist),
+        link_spam_filter,
+        repeated_character_filter,
+        shouting_filter,
+    ]
+
+
+def moderate(post: dict, filters: List[ModerationFilter]) -> Optional[str]:
+    for moderation_filter in filters:
+        reason = moderation_filter(post)
+        if reason:
+            return reason
+    return None
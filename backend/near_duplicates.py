@@ -0,0 +1,173 @@
+import hashlib
+import random
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from sync import SYNC_SKEW
+from trending import tokenize
+
+# Signatures are persisted on the documents; bump the version whenever the
+# shingling or hash parameters change so stored signatures are recomputed
+MINHASH_VERSION = 1
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+_PRIME = (1 << 31) - 1
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Character n-grams of the normalized words, robust to small rewordings"""
+    normalized = " ".join(tokenize(text))
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[start:start + size] for start in range(len(normalized) - size + 1)}
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little") % _PRIME
+
+
+class MinHasher:
+    """NUM_PERM universal hash functions (a*x + b mod p); fixed seed, so signatures are stable across runs"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = MINHASH_VERSION):
+        rng = random.Random(seed)
+        self.coefficients = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> Optional[List[int]]:
+        items = shingles(text)
+        if not items:
+            return None
+        hashes = [_shingle_hash(item) for item in items]
+        return [min((a * value + b) % _PRIME for value in hashes) for a, b in self.coefficients]
+
+
+def similarity(first: List[int], second: List[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+
+def fact_check_text(document: dict) -> str:
+    return f"{document.get('title', '')} {document.get('description', '')}"
+
+
+class FactCheckIndex:
+    """MinHash signatures of every fact-check, banded into an LSH table.
+
+    Two claims land in the same bucket of at least one band with high
+    probability when their similarity is above roughly (1/BANDS)^(1/ROWS),
+    about 0.42 here, so a lookup touches only those buckets' members instead
+    of comparing against the whole collection.
+    """
+
+    def __init__(self, hasher: Optional[MinHasher] = None):
+        self.hasher = hasher or MinHasher()
+        self.ready = False
+        self.synced_at: Optional[datetime] = None
+        self._signatures: Dict[str, List[int]] = {}
+        self._buckets = [{} for _ in range(BANDS)]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, fact_id):
+        return fact_id in self._signatures
+
+    def signature(self, document: dict) -> Optional[List[int]]:
+        return self.hasher.signature(fact_check_text(document))
+
+    @staticmethod
+    def _bands(signature):
+        return [tuple(signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+    def add(self, fact_id: str, signature: Optional[List[int]]):
+        with self._lock:
+            self._remove(fact_id)
+            if signature is None:
+                return
+            self._signatures[fact_id] = signature
+            for buckets, key in zip(self._buckets, self._bands(signature)):
+                buckets.setdefault(key, set()).add(fact_id)
+
+    def remove(self, fact_id: str):
+        with self._lock:
+            self._remove(fact_id)
+
+    def _remove(self, fact_id):
+        signature = self._signatures.pop(fact_id, None)
+        if signature is None:
+            return
+        for buckets, key in zip(self._buckets, self._bands(signature)):
+            members = buckets.get(key)
+            if members is not None:
+                members.discard(fact_id)
+                if not members:
+                    del buckets[key]
+
+    def query(self, signature: Optional[List[int]], threshold: float = 0.5, limit: int = 10,
+              exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Indexed fact-checks similar to `signature`, most similar first"""
+        if signature is None:
+            return []
+        with self._lock:
+            candidates = set()
+            for buckets, key in zip(self._buckets, self._bands(signature)):
+                candidates.update(buckets.get(key, ()))
+            candidates.discard(exclude)
+            scored = [(fact_id, similarity(signature, self._signatures[fact_id])) for fact_id in candidates]
+        scored = [(fact_id, round(score, 4)) for fact_id, score in scored if score >= threshold]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def related(self, fact_id: str, threshold: float = 0.5, limit: int = 10) -> List[Tuple[str, float]]:
+        return self.query(self._signatures.get(fact_id), threshold, limit, exclude=fact_id)
+
+
+def stored_signature(document: dict) -> Optional[List[int]]:
+    minhash = document.get("minhash")
+    if isinstance(minhash, dict) and minhash.get("version") == MINHASH_VERSION:
+        return minhash["values"]
+    return None
+
+
+def minhash_field(signature: Optional[List[int]]) -> dict:
+    return {"version": MINHASH_VERSION, "values": signature}
+
+
+def sync_fact_check_index(db, index: FactCheckIndex, batch_size: int = 500):
+    """Bring the index up to date with fact-checks changed or deleted since the last sync.
+
+    Fact-checks stored without a current signature (seeded, loaded externally
+    or hashed with older parameters) get one computed and written back.
+    """
+    started = datetime.now()
+    query = {}
+    if index.synced_at is not None:
+        query = {"updated_at": {"$gt": index.synced_at - SYNC_SKEW}}
+    projection = {"_id": 0, "fact_id": 1, "title": 1, "description": 1, "minhash": 1}
+    backfill = []
+    for document in db.fact_checks.find(query, projection).batch_size(batch_size):
+        signature = stored_signature(document)
+        if signature is None:
+            signature = index.signature(document)
+            backfill.append(UpdateOne({"fact_id": document["fact_id"]}, {"$set": {"minhash": minhash_field(signature)}}))
+        index.add(document["fact_id"], signature)
+        if len(backfill) >= batch_size:
+            db.fact_checks.bulk_write(backfill, ordered=False)
+            backfill = []
+    if backfill:
+        db.fact_checks.bulk_write(backfill, ordered=False)
+    if index.synced_at is not None:
+        tombstones = db.tombstones.find(
+            {"collection": "fact_checks", "deleted_at": {"$gt": index.synced_at - SYNC_SKEW}},
+            {"_id": 0, "doc_id": 1},
+        )
+        for tombstone in tombstones:
+            index.remove(tombstone["doc_id"])
+    index.synced_at = started
+    index.ready = True
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from moderation import ModerationFilter, moderate
+
+logger = logging.getLogger(__name__)
+
+# Failed post ids remembered for the status route, in case the dead-letter write failed too
+FAILED_IDS_KEPT = 10000
+
+
+def insert_missing(collection, documents: List[dict], key: str = "post_id") -> List[dict]:
+    """Insert the documents not stored yet, so a retried batch never duplicates; returns those inserted"""
+    stored = {
+        document[key]
+        for document in collection.find({key: {"$in": [document[key] for document in documents]}}, {"_id": 0, key: 1})
+    }
+    missing = [document for document in documents if document[key] not in stored]
+    if missing:
+        collection.insert_many(missing, ordered=False)
+    return missing
+
+
+class PostQueue:
+    """Bounded queue between the post route and batched Mongo inserts.
+
+    The route only validates and enqueues. Worker tasks pull up to
+    `batch_size` posts at a time, run the moderation filters, then insert the
+    accepted posts with one `insert_many` and the rejected ones into a separate
+    collection for review. Listeners are called with each published batch,
+    on the event loop, once it has been stored.
+
+    A write that fails is retried with exponential backoff; after the last
+    attempt the posts go to `dead_letter` and are reported as failed.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[List[dict]], None],
+        reject: Callable[[List[dict]], None],
+        filters: List[ModerationFilter],
+        maxsize: int = 1000,
+        workers: int = 2,
+        batch_size: int = 50,
+        batch_wait_seconds: float = 0.05,
+        listeners: List[Callable[[List[dict]], None]] = (),
+        dead_letter: Optional[Callable[[List[dict]], None]] = None,
+        retries: int = 3,
+        retry_backoff_seconds: float = 0.5,
+    ):
+        self.publish = publish
+        self.reject = reject
+        self.filters = filters
+        self.maxsize = maxsize
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.listeners = list(listeners)
+        self.dead_letter = dead_letter
+        self.retries = retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.pending = set()
+        self.failed = OrderedDict()
+        self.counters = {
+            "enqueued": 0,
+            "published": 0,
+            "rejected": 0,
+            "dropped": 0,
+            "failed": 0,
+            "retries": 0,
+            "batches": 0,
+        }
+        self._queue: asyncio.Queue = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [
+            asyncio.get_running_loop().create_task(self._worker(), name=f"post-queue-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def stop(self, drain_timeout: float = 5.0):
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Stopping post queue with %d posts still queued", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, post: dict):
+        """Enqueue a post; raises asyncio.QueueFull when the queue is at capacity"""
+        if self._queue is None:
+            raise asyncio.QueueFull
+        try:
+            self._queue.put_nowait(post)
+        except asyncio.QueueFull:
+            self.counters["dropped"] += 1
+            raise
+        self.pending.add(post["post_id"])
+        self.counters["enqueued"] += 1
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait_seconds
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._process(batch)
+            finally:
+                for post in batch:
+                    self.pending.discard(post["post_id"])
+                    self._queue.task_done()
+
+    async def _process(self, batch: List[dict]):
+        accepted, rejected = [], []
+        for post in batch:
+            reason = moderate(post, self.filters)
+            if reason:
+                rejected.append({**post, "rejection_reason": reason})
+            else:
+                accepted.append(post)
+        if accepted and not await self._write(self.publish, accepted):
+            accepted = []
+        if rejected and not await self._write(self.reject, rejected):
+            rejected = []
+        self.counters["batches"] += 1
+        self.counters["published"] += len(accepted)
+        self.counters["rejected"] += len(rejected)
+        for listener in self.listeners if accepted else ():
+            try:
+                listener(accepted)
+            except Exception:
+                logger.exception("Post listener %r failed", listener)
+
+    async def _write(self, write, posts: List[dict]) -> bool:
+        delay = self.retry_backoff_seconds
+        for attempt in range(self.retries + 1):
+            try:
+                await asyncio.to_thread(write, posts)
+                return True
+            except Exception as error:
+                if attempt < self.retries:
+                    self.counters["retries"] += 1
+                    logger.warning("Writing %d community posts failed (%s), retrying in %.1fs", len(posts), error, delay)
+                    await asyncio.sleep(delay)
+                    delay *= 2
+                    continue
+                logger.exception("Giving up on a batch of %d community posts", len(posts))
+                await self._fail(posts, f"{type(error).__name__}: {error}")
+        return False
+
+    async def _fail(self, posts: List[dict], reason: str):
+        self.counters["failed"] += len(posts)
+        for post in posts:
+            self.failed[post["post_id"]] = reason
+            self.failed.move_to_end(post["post_id"])
+        while len(self.failed) > FAILED_IDS_KEPT:
+            self.failed.popitem(last=False)
+        if self.dead_letter is not None:
+            try:
+                await asyncio.to_thread(self.dead_letter, [{**post, "failure_reason": reason} for post in posts])
+            except Exception:
+                logger.exception("Failed to dead-letter %d community posts", len(posts))
+
+    def stats(self):
+        return {
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "capacity": self.maxsize,
+            "workers": len(self._tasks),
+            **self.counters,
+        }
@@ -0,0 +1,172 @@
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pymongo import monitoring
+
+
+class RequestTimings:
+    """Per-request phase durations in milliseconds"""
+
+    __slots__ = ("started", "db", "db_calls", "serialize", "handler")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db = 0.0
+        self.db_calls = 0
+        self.serialize = 0.0
+        self.handler = 0.0
+
+    def header(self) -> str:
+        total = (time.perf_counter() - self.started) * 1000
+        app = max(self.handler - self.db - self.serialize, 0.0)
+        middleware = max(total - self.handler, 0.0)
+        return ", ".join([
+            f'db;dur={self.db:.2f};desc="MongoDB ({self.db_calls} calls)"',
+            f"serialize;dur={self.serialize:.2f}",
+            f"app;dur={app:.2f}",
+            f"middleware;dur={middleware:.2f}",
+            f"total;dur={total:.2f}",
+        ])
+
+
+current_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    "current_timings", default=None
+)
+
+
+class CommandTimer(monitoring.CommandListener):
+    """Adds every Mongo command's duration to the timings of the request that issued it.
+
+    Listeners run on the thread that executed the command, and both the event
+    loop and `asyncio.to_thread` carry the request's context along, so the
+    context variable resolves to the right request.
+    """
+
+    def started(self, event):
+        pass
+
+    def _record(self, event):
+        timings = current_timings.get()
+        if timings is not None:
+            timings.db += event.duration_micros / 1000
+            timings.db_calls += 1
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that records how long rendering the body took"""
+
+    def render(self, content) -> bytes:
+        started = time.perf_counter()
+        body = self.encode(content)
+        timings = current_timings.get()
+        if timings is not None:
+            timings.serialize += (time.perf_counter() - started) * 1000
+        return body
+
+    def encode(self, content) -> bytes:
+        return super().render(content)
+
+
+class TimedRoute(APIRoute):
+    """Route class that records time spent inside the route handler"""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                timings = current_timings.get()
+                if timings is not None:
+                    timings.handler += (time.perf_counter() - started) * 1000
+
+        return timed_handler
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding a `Server-Timing` header to every HTTP response"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.header().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval.
+
+    Output is in the "folded" format (`frame;frame;frame count` per line) read by
+    flamegraph.pl, speedscope and most other flamegraph tools. Only one
+    profile runs at a time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def profile(self, seconds: float, interval: float) -> Optional[str]:
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            return self._sample(seconds, interval)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float) -> str:
+        own_thread = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(_frame_label(frame))
+                    frame = frame.f_back
+                frames.append(thread_names.get(thread_id, f"thread-{thread_id}"))
+                stacks[";".join(reversed(frames))] += 1
+            time.sleep(interval)
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
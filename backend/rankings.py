@@ -0,0 +1,113 @@
+import re
+import threading
+from bisect import bisect_right
+from datetime import datetime
+from typing import Optional
+
+# Highest matching level wins; the comparison only needs an ordinal scale
+EDUCATION_LEVELS = [
+    (re.compile(r"ph\.?\s?d|doctorate", re.IGNORECASE), 5),
+    (re.compile(r"\b(m\.?\s?(a|sc|com|e|tech|phil|d|s)\b|mba|mca|llm|master)", re.IGNORECASE), 4),
+    (re.compile(r"\b(b\.?\s?(a|sc|com|e|tech|ed|l)\b|bba|bca|llb|mbbs|bachelor|graduate)", re.IGNORECASE), 3),
+    (re.compile(r"diploma|\biti\b", re.IGNORECASE), 2),
+    (re.compile(r"12th|hsc|higher secondary|puc", re.IGNORECASE), 1),
+]
+
+# sort_by -> (key function, descending)
+SORT_KEYS = {
+    "net_worth": (lambda candidate: candidate["net_worth"], True),
+    "criminal_cases": (lambda candidate: candidate["criminal_cases"], False),
+    "education": (lambda candidate: candidate["education_level"], True),
+    "incumbent": (lambda candidate: candidate["incumbent"], True),
+}
+
+
+def education_level(education: Optional[str]) -> int:
+    for pattern, level in EDUCATION_LEVELS:
+        if education and pattern.search(education):
+            return level
+    return 0
+
+
+def percentile(sorted_values, value) -> float:
+    """Percentage of values less than or equal to `value`"""
+    if not sorted_values:
+        return 0.0
+    return round(100.0 * bisect_right(sorted_values, value) / len(sorted_values), 1)
+
+
+def _competition_ranks(ordered, key):
+    """1-based ranks where ties share the better rank (1, 1, 3)"""
+    ranks = []
+    for position, candidate in enumerate(ordered):
+        if position and key(candidate) == key(ordered[position - 1]):
+            ranks.append(ranks[-1])
+        else:
+            ranks.append(position + 1)
+    return ranks
+
+
+class CandidateRankings:
+    """Per-constituency candidate orderings, rebuilt whenever candidates are ingested.
+
+    A comparison request is then a dictionary lookup. The rebuilt tables are
+    swapped in as a whole, so readers never see a half-built state.
+    """
+
+    def __init__(self):
+        self._orders = {}
+        self.refreshed_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, candidates):
+        annotated = []
+        for candidate in candidates:
+            assets = candidate.get("assets") or 0.0
+            liabilities = candidate.get("liabilities") or 0.0
+            annotated.append({
+                **candidate,
+                "net_worth": assets - liabilities,
+                "criminal_cases": candidate.get("criminal_cases") or 0,
+                "incumbent": bool(candidate.get("incumbent")),
+                "education_level": education_level(candidate.get("education")),
+            })
+
+        state_assets = sorted(candidate.get("assets") or 0.0 for candidate in annotated)
+        state_criminal_cases = sorted(candidate["criminal_cases"] for candidate in annotated)
+        for candidate in annotated:
+            candidate["state_percentiles"] = {
+                "assets": percentile(state_assets, candidate.get("assets") or 0.0),
+                "criminal_cases": percentile(state_criminal_cases, candidate["criminal_cases"]),
+            }
+
+        by_constituency = {}
+        for candidate in annotated:
+            by_constituency.setdefault(candidate["constituency"], []).append(candidate)
+
+        orders = {}
+        for constituency, members in by_constituency.items():
+            ranks = {}
+            for sort_by, (key, descending) in SORT_KEYS.items():
+                ordered = sorted(members, key=key, reverse=descending)
+                for candidate, rank in zip(ordered, _competition_ranks(ordered, key)):
+                    ranks.setdefault(candidate["candidate_id"], {})[sort_by] = rank
+            ranked = [{**candidate, "ranks": ranks[candidate["candidate_id"]]} for candidate in members]
+            orders[constituency] = {
+                sort_by: sorted(ranked, key=key, reverse=descending)
+                for sort_by, (key, descending) in SORT_KEYS.items()
+            }
+
+        with self._lock:
+            self._orders = orders
+            self.refreshed_at = datetime.now()
+
+    def compare(self, constituency: str, sort_by: str):
+        with self._lock:
+            orders = self._orders.get(constituency)
+        if orders is None:
+            return []
+        return orders[sort_by]
+
+
+def refresh_rankings(db, rankings: CandidateRankings):
+    rankings.refresh(db.candidates.find({}, {"_id": 0}))
@@ -0,0 +1,69 @@
+import os
+
+from pymongo.read_preferences import (
+    Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred,
+)
+
+READ_PREFERENCE_MODES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+# Read-mostly route classes that may be served by secondaries. Writes and
+# read-your-writes paths (community posts, post status, delta sync) keep using
+# the primary `db` handle directly.
+ROUTE_CLASSES = ("constituencies", "candidates", "manifestos", "fact_checks", "search", "exports")
+
+# MongoDB rejects maxStalenessSeconds below 90
+MIN_MAX_STALENESS_SECONDS = 90
+
+
+def read_preference(mode: str, max_staleness: int = -1):
+    if mode not in READ_PREFERENCE_MODES:
+        raise ValueError(f"Unknown read preference {mode!r}")
+    if mode == "primary":
+        return Primary()
+    if max_staleness != -1 and max_staleness < MIN_MAX_STALENESS_SECONDS:
+        raise ValueError(f"maxStalenessSeconds must be at least {MIN_MAX_STALENESS_SECONDS}")
+    return READ_PREFERENCE_MODES[mode](max_staleness=max_staleness)
+
+
+class ReadRouter:
+    """Hands out database handles whose read preference depends on the route class"""
+
+    def __init__(self, db, modes: dict, max_staleness: int = -1):
+        self.primary = db
+        self._preferences = {
+            route_class: read_preference(mode, max_staleness)
+            for route_class, mode in modes.items()
+        }
+        # Built on first use, so a lazily connected `db` stays unconnected until then
+        self._databases = None
+
+    def db(self, route_class: str):
+        if self._databases is None:
+            self._databases = {
+                route_class: self.primary.with_options(read_preference=preference)
+                for route_class, preference in self._preferences.items()
+            }
+        return self._databases.get(route_class, self.primary)
+
+    def modes(self):
+        return {
+            route_class: preference.document
+            for route_class, preference in self._preferences.items()
+        }
+
+    @classmethod
+    def from_env(cls, db, environ=os.environ):
+        """Build from MONGO_READ_PREFERENCE, MONGO_READ_PREFERENCE_<CLASS> and MONGO_MAX_STALENESS_SECONDS"""
+        default_mode = environ.get('MONGO_READ_PREFERENCE', 'secondaryPreferred')
+        modes = {
+            route_class: environ.get(f'MONGO_READ_PREFERENCE_{route_class.upper()}', default_mode)
+            for route_class in ROUTE_CLASSES
+        }
+        max_staleness = int(environ.get('MONGO_MAX_STALENESS_SECONDS', str(MIN_MAX_STALENESS_SECONDS)))
+        return cls(db, modes, max_staleness)
@@ -0,0 +1,150 @@
+import json
+from dataclasses import MISSING, dataclass, field, fields
+from datetime import datetime
+from typing import List, Optional
+
+from profiling import TimedJSONResponse
+
+
+class Record:
+    """Slotted, validation-free view of a stored document.
+
+    Documents are validated with the pydantic models when they are written,
+    so reads only pick the known fields out of the Mongo document. Slots
+    keep each record to a fixed set of pointers instead of a per-instance dict.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def projection(cls):
+        return {"_id": 0, **{name: 1 for name in cls.__slots__}}
+
+    @classmethod
+    def _field_defaults(cls):
+        defaults = cls.__dict__.get("_defaults")
+        if defaults is None:
+            defaults = []
+            for record_field in fields(cls):
+                if record_field.default_factory is not MISSING:
+                    defaults.append((record_field.name, None, record_field.default_factory))
+                else:
+                    default = None if record_field.default is MISSING else record_field.default
+                    defaults.append((record_field.name, default, None))
+            cls._defaults = defaults
+        return defaults
+
+    @classmethod
+    def from_document(cls, document: dict):
+        values = []
+        for name, default, factory in cls._field_defaults():
+            value = document.get(name, default)
+            values.append(factory() if value is None and factory else value)
+        return cls(*values)
+
+    @classmethod
+    def decode_many(cls, documents):
+        from_document = cls.from_document
+        return [from_document(document) for document in documents]
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(slots=True)
+class ConstituencyRecord(Record):
+    constituency_id: str
+    name: str
+    district: str
+    updated_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class CandidateRecord(Record):
+    candidate_id: str
+    name: str
+    party: str
+    constituency: str
+    age: int
+    education: str
+    criminal_cases: int
+    assets: float
+    liabilities: float
+    incumbent: bool = False
+    photo_url: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class ManifestoRecord(Record):
+    promise_id: str
+    party: str
+    title: str
+    description: str
+    category: str
+    one_minute_explanation: str
+    fulfilled: Optional[bool] = None
+    evidence_url: Optional[str] = None
+    link_status: Optional[dict] = None
+    updated_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class FactCheckRecord(Record):
+    fact_id: str
+    title: str
+    description: str
+    verdict: str
+    date_added: datetime
+    source_url: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    constituency: Optional[str] = None
+    link_status: Optional[dict] = None
+    updated_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class CommunityPostRecord(Record):
+    post_id: str
+    constituency: str
+    title: str
+    content: str
+    author_id: str
+    created_at: datetime
+    upvotes: int = 0
+    downvotes: int = 0
+    replies: List[dict] = field(default_factory=list)
+    updated_at: Optional[datetime] = None
+
+
+def _encode_default(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content) -> bytes:
+    """Serialize records, dicts and datetimes the way FastAPI's JSONResponse would"""
+    return json.dumps(
+        content,
+        default=_encode_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class RecordResponse(TimedJSONResponse):
+    """JSON response for records and precomputed payloads.
+
+    Routes return this directly, so FastAPI skips per-response validation
+    against the declared `response_model`; the model still documents the shape.
+    """
+
+    def encode(self, content) -> bytes:
+        if isinstance(content, bytes):  # already serialized
+            return content
+        return encode_json(content)
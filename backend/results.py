@@ -0,0 +1,232 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from leases import acquire_lease
+
+SNAPSHOT_LEASE_ID = "results_snapshot"
+
+
+class UnknownCandidate(ValueError):
+    pass
+
+
+class ResultsTally:
+    """In-memory counting-day tally with incrementally maintained leads and party totals.
+
+    A round adds vote deltas for one constituency. Applying it touches only
+    that constituency's candidates: the leader and margin are recomputed, and
+    the district and statewide party counters change by the difference. Reads
+    never aggregate over all constituencies. Only used from the event loop.
+    """
+
+    def __init__(self):
+        self.votes: Dict[str, Counter] = {}
+        self.applied_rounds: Dict[str, set] = {}
+        self.leaders: Dict[str, dict] = {}
+        self.candidates: Dict[str, dict] = {}
+        self.districts: Dict[str, tuple] = {}
+        self.constituencies_total = 0
+        self.party_votes = Counter()
+        self.party_leads = Counter()
+        self.district_party_votes: Dict[str, Counter] = {}
+        self.district_party_leads: Dict[str, Counter] = {}
+        self.sequence = 0
+        self.updated_at: Optional[datetime] = None
+
+    def set_reference_data(self, candidates: Iterable[dict], constituencies: Iterable[dict]):
+        self.candidates = {
+            candidate["candidate_id"]: {
+                "name": candidate.get("name"),
+                "party": candidate.get("party"),
+                "constituency": candidate.get("constituency"),
+            }
+            for candidate in candidates
+        }
+        # Rounds name their constituency, and a few names are shared across
+        # districts; those count statewide but can't be placed in a district
+        districts = {}
+        total = 0
+        for constituency in constituencies:
+            districts.setdefault(constituency["name"], set()).add(constituency["district"])
+            total += 1
+        self.districts = {name: tuple(sorted(names)) for name, names in districts.items()}
+        self.constituencies_total = total
+
+    def district(self, constituency: str) -> Optional[str]:
+        """The constituency's district, or None when unknown or ambiguous by name"""
+        districts = self.districts.get(constituency, ())
+        return districts[0] if len(districts) == 1 else None
+
+    def validate_round(self, constituency: str, deltas: Dict[str, int]):
+        for candidate_id in deltas:
+            candidate = self.candidates.get(candidate_id)
+            if candidate is None or candidate["constituency"] != constituency:
+                raise UnknownCandidate(f"Candidate {candidate_id} is not contesting {constituency}")
+
+    def has_round(self, constituency: str, round_number: int) -> bool:
+        return round_number in self.applied_rounds.get(constituency, ())
+
+    def apply_round(self, constituency: str, round_number: int, deltas: Dict[str, int],
+                    sequence: Optional[int] = None) -> bool:
+        """Apply one round of vote deltas; returns False if the round was already applied"""
+        if self.has_round(constituency, round_number):
+            if sequence is not None:
+                self.sequence = max(self.sequence, sequence)
+            return False
+        self.validate_round(constituency, deltas)
+        district = self.district(constituency)
+        votes = self.votes.setdefault(constituency, Counter())
+        for candidate_id, delta in deltas.items():
+            votes[candidate_id] += delta
+            party = self.candidates[candidate_id]["party"]
+            self.party_votes[party] += delta
+            if district:
+                self.district_party_votes.setdefault(district, Counter())[party] += delta
+
+        self._update_leader(constituency, district)
+        self.applied_rounds.setdefault(constituency, set()).add(round_number)
+        self.sequence = sequence if sequence is not None else self.sequence + 1
+        self.updated_at = datetime.now()
+        return True
+
+    def _update_leader(self, constituency: str, district: Optional[str]):
+        ranked = self.votes[constituency].most_common(2)
+        previous = self.leaders.get(constituency)
+        leader_id, leader_votes = ranked[0]
+        runner_up_id, runner_up_votes = ranked[1] if len(ranked) > 1 else (None, 0)
+        leader = {
+            "candidate_id": leader_id,
+            "name": self.candidates[leader_id]["name"],
+            "party": self.candidates[leader_id]["party"],
+            "votes": leader_votes,
+            "runner_up_id": runner_up_id,
+            "margin": leader_votes - runner_up_votes,
+        }
+        self.leaders[constituency] = leader
+
+        old_party = previous["party"] if previous else None
+        if old_party != leader["party"]:
+            if old_party is not None:
+                self.party_leads[old_party] -= 1
+            self.party_leads[leader["party"]] += 1
+            if district:
+                district_leads = self.district_party_leads.setdefault(district, Counter())
+                if old_party is not None:
+                    district_leads[old_party] -= 1
+                district_leads[leader["party"]] += 1
+
+    @staticmethod
+    def _party_table(votes: Counter, leads: Counter):
+        parties = set(votes) | {party for party, count in leads.items() if count}
+        return sorted(
+            ({"party": party, "votes": votes[party], "leading": leads[party]} for party in parties),
+            key=lambda row: (-row["leading"], -row["votes"], str(row["party"])),
+        )
+
+    def constituency_result(self, constituency: str):
+        votes = self.votes.get(constituency, Counter())
+        return {
+            "constituency": constituency,
+            "district": self.district(constituency),
+            "rounds_counted": len(self.applied_rounds.get(constituency, ())),
+            "leader": self.leaders.get(constituency),
+            "candidates": [
+                {"candidate_id": candidate_id, **self.candidates[candidate_id], "votes": count}
+                for candidate_id, count in votes.most_common()
+            ],
+        }
+
+    def district_result(self, district: str):
+        return {
+            "district": district,
+            "parties": self._party_table(
+                self.district_party_votes.get(district, Counter()),
+                self.district_party_leads.get(district, Counter()),
+            ),
+        }
+
+    def state_result(self):
+        return {
+            "constituencies_reporting": len(self.leaders),
+            "constituencies_total": self.constituencies_total,
+            "updated_at": self.updated_at,
+            "parties": self._party_table(self.party_votes, self.party_leads),
+        }
+
+    def snapshot(self):
+        """Everything needed to rebuild the tally; leads and party totals are derived on restore"""
+        return {
+            "sequence": self.sequence,
+            "taken_at": datetime.now(),
+            "constituencies": [
+                {
+                    "constituency": constituency,
+                    "rounds": sorted(self.applied_rounds.get(constituency, ())),
+                    "votes": dict(votes),
+                }
+                for constituency, votes in self.votes.items()
+            ],
+        }
+
+    def restore(self, snapshot: dict):
+        for entry in snapshot.get("constituencies", []):
+            rounds = entry["rounds"]
+            self.apply_round(entry["constituency"], rounds[0] if rounds else 0, entry["votes"])
+            self.applied_rounds[entry["constituency"]] = set(rounds)
+        self.sequence = snapshot.get("sequence", 0)
+
+
+def logged_rounds(db, after: int) -> List[dict]:
+    """Rounds logged with a sequence above `after`, in sequence order"""
+    return list(db.results_rounds.find({"sequence": {"$gt": after}}, {"_id": 0}).sort("sequence", 1))
+
+
+def apply_logged_rounds(tally: ResultsTally, rounds: Iterable[dict]):
+    for round_document in rounds:
+        tally.apply_round(
+            round_document["constituency"],
+            round_document["round"],
+            round_document["deltas"],
+            sequence=round_document["sequence"],
+        )
+
+
+def recover_tally(db, tally: ResultsTally):
+    """Load the latest snapshot, then replay the rounds logged after it"""
+    snapshot = db.results_snapshots.find_one({"_id": "latest"})
+    if snapshot:
+        tally.restore(snapshot)
+    apply_logged_rounds(tally, logged_rounds(db, tally.sequence))
+
+
+def sequence_collided(error: DuplicateKeyError) -> bool:
+    """Whether a round insert lost the race for its sequence rather than repeating a round"""
+    key_pattern = (error.details or {}).get("keyPattern")
+    if key_pattern is not None:
+        return "sequence" in key_pattern
+    return "sequence_1" in str(error)
+
+
+def save_snapshot(db, snapshot: dict, owner: str, lease_seconds: float) -> bool:
+    """Store the snapshot if this instance holds the snapshot lease; False otherwise.
+
+    Every instance follows the same round log, so whichever holds the lease
+    writes a valid snapshot; an older one never replaces a newer one.
+    """
+    if not acquire_lease(db.leases, SNAPSHOT_LEASE_ID, owner, lease_seconds):
+        return False
+    try:
+        db.results_snapshots.replace_one(
+            {"_id": "latest", "sequence": {"$lt": snapshot["sequence"]}}, snapshot, upsert=True
+        )
+    except DuplicateKeyError:  # a snapshot at least as new is already stored
+        pass
+    return True
+
+
+def ensure_results_indexes(db):
+    db.results_rounds.create_index([("sequence", 1)], unique=True)
+    db.results_rounds.create_index([("constituency", 1), ("round", 1)], unique=True)
@@ -0,0 +1,48 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from database import db, storage
+from datasets import constituency_names, seed_documents
+from models import Candidate, CandidateComparison, validated
+from profiling import TimedRoute
+from rankings import SORT_KEYS, refresh_rankings
+from records import CandidateRecord, RecordResponse
+from state import candidate_rankings
+from sync import stamp
+
+router = APIRouter(route_class=TimedRoute)
+
+# Candidates
+@router.get("/api/candidates", response_model=List[Candidate])
+async def get_candidates(constituency: Optional[str] = None):
+    """Get candidates, optionally filtered by constituency"""
+    query = {}
+    if constituency:
+        query["constituency"] = constituency
+    
+    projection = CandidateRecord.projection()
+    candidates = CandidateRecord.decode_many(storage.collection("candidates").find(query, projection))
+    if not candidates and db.candidates.estimated_document_count() == 0:
+        # Initialize with sample candidate data from various constituencies
+        db.candidates.insert_many(stamp(validated(Candidate, seed_documents("candidates"))))
+        storage.refresh("candidates")
+        refresh_rankings(db, candidate_rankings)
+        candidates = CandidateRecord.decode_many(db.candidates.find(query, projection))
+        
+    return RecordResponse(candidates)
+
+@router.get("/api/candidates/compare", response_model=CandidateComparison)
+async def compare_candidates(
+    constituency: str,
+    sort_by: str = Query("net_worth", pattern="^(" + "|".join(SORT_KEYS) + ")$"),
+):
+    """Compare a constituency's candidates, ranked with state-wide percentiles"""
+    if constituency not in constituency_names():
+        raise HTTPException(status_code=404, detail="Constituency not found")
+    return RecordResponse({
+        "constituency": constituency,
+        "sort_by": sort_by,
+        "refreshed_at": candidate_rankings.refreshed_at,
+        "candidates": candidate_rankings.compare(constituency, sort_by),
+    })
@@ -0,0 +1,191 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import List, Literal, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from auth import require_admin
+from database import db
+from datasets import constituency_names, seed_documents
+from event_log import post_event, vote_base, vote_event
+from leaderboards import ALL_TIME, WINDOWS
+from models import CommunityPost, CommunityPostCreate, CommunityPostSync, validated
+from profiling import TimedRoute
+from records import CommunityPostRecord, RecordResponse
+from state import event_log, leaderboards, post_queue, trending_terms
+from sync import (
+    deleted_since, delta_query, http_date, last_modified, not_modified_since, record_tombstone,
+    stamp, sync_response,
+)
+
+router = APIRouter(route_class=TimedRoute)
+
+# Community Posts
+@router.get("/api/community-posts", response_model=Union[List[CommunityPost], CommunityPostSync])
+async def get_community_posts(
+    request: Request,
+    constituency: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Sync token; return only changes after it"),
+):
+    """Get community posts, optionally filtered by constituency"""
+    query = {}
+    if constituency:
+        query["constituency"] = constituency
+
+    modified = last_modified(db, "community_posts", query)
+    if not_modified_since(request.headers.get("if-modified-since"), modified):
+        return Response(status_code=304)
+    headers = {"Last-Modified": http_date(modified)} if modified else None
+
+    projection = CommunityPostRecord.projection()
+    if since:
+        issued_at = datetime.now()
+        cursor = db.community_posts.find(delta_query(query, since), projection).sort("updated_at", -1)
+        return RecordResponse(
+            sync_response(CommunityPostRecord.decode_many(cursor), deleted_since(db, "community_posts", since), issued_at),
+            headers=headers,
+        )
+        
+    posts = CommunityPostRecord.decode_many(db.community_posts.find(query, projection).sort("created_at", -1))
+    if not posts and db.community_posts.estimated_document_count() == 0:
+        # Initialize with sample community posts from various constituencies
+        seeded = validated(CommunityPost, seed_documents("community_posts"))
+        db.community_posts.insert_many(stamp([{**post, "vote_base": vote_base(post)} for post in seeded]))
+        posts = CommunityPostRecord.decode_many(db.community_posts.find(query, projection).sort("created_at", -1))
+        
+    return RecordResponse(posts, headers=headers)
+
+@router.post("/api/community-posts", status_code=202)
+async def create_community_post(submission: CommunityPostCreate):
+    """Submit a community post; it is moderated and published asynchronously"""
+    if submission.constituency not in constituency_names():
+        raise HTTPException(status_code=400, detail="Unknown constituency")
+
+    now = datetime.now()
+    post = {
+        "post_id": str(uuid.uuid4()),
+        "constituency": submission.constituency,
+        "title": submission.title.strip(),
+        "content": submission.content.strip(),
+        "author_id": "anon_" + str(uuid.uuid4())[:8],
+        "upvotes": 0,
+        "downvotes": 0,
+        "created_at": now,
+        "updated_at": now,
+        "replies": []
+    }
+    post = validated(CommunityPost, [post])[0]
+    post["vote_base"] = vote_base(post)
+
+    try:
+        post_queue.submit(post)
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many posts are waiting for moderation, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    return {"message": "Post submitted for moderation", "post_id": post["post_id"], "status": "pending"}
+
+@router.get("/api/community-posts/{post_id}/status")
+async def get_community_post_status(post_id: str):
+    """Check whether a submitted post is still queued, published, rejected or failed to store"""
+    if post_id in post_queue.pending:
+        return {"post_id": post_id, "status": "pending"}
+    if db.community_posts.find_one({"post_id": post_id}, {"_id": 1}):
+        return {"post_id": post_id, "status": "published"}
+    rejected = db.rejected_community_posts.find_one({"post_id": post_id}, {"_id": 0, "rejection_reason": 1})
+    if rejected:
+        return {"post_id": post_id, "status": "rejected", "reason": rejected["rejection_reason"]}
+    failed = post_queue.failed.get(post_id)
+    if failed is None:
+        stored = db.failed_community_posts.find_one({"post_id": post_id}, {"_id": 0, "failure_reason": 1})
+        failed = stored and stored["failure_reason"]
+    if failed:
+        return {"post_id": post_id, "status": "failed", "reason": failed}
+    raise HTTPException(status_code=404, detail="Post not found")
+
+@router.get("/api/trending")
+async def get_trending_terms(
+    constituency: Optional[str] = None,
+    hours: int = Query(1, ge=1, le=168),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Most discussed terms in community posts, per constituency or statewide"""
+    if constituency and constituency not in constituency_names():
+        raise HTTPException(status_code=404, detail="Constituency not found")
+    return {
+        "constituency": constituency,
+        "hours": hours,
+        "terms": trending_terms.trending(constituency, hours, limit),
+    }
+
+# Statewide leaderboards, maintained incrementally by the post and vote paths
+LeaderboardWindow = Literal[(ALL_TIME, *WINDOWS)]
+
+@router.get("/api/leaderboards/constituencies")
+async def get_constituency_leaderboard(
+    window: LeaderboardWindow = ALL_TIME,
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Constituencies with the most posts and votes on their posts"""
+    return {
+        "window": window,
+        "constituencies": [
+            {"constituency": constituency, "score": score}
+            for constituency, score in leaderboards.top("constituencies", window, limit)
+        ],
+    }
+
+@router.get("/api/leaderboards/posts")
+async def get_post_leaderboard(
+    window: LeaderboardWindow = ALL_TIME,
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Posts with the highest net votes across Tamil Nadu"""
+    top = leaderboards.top("posts", window, limit)
+    cursor = db.community_posts.find({"post_id": {"$in": [post_id for post_id, _ in top]}}, CommunityPostRecord.projection())
+    records = {record.post_id: record for record in CommunityPostRecord.decode_many(cursor)}
+    return RecordResponse({
+        "window": window,
+        "posts": [{**records[post_id].to_dict(), "score": score} for post_id, score in top if post_id in records],
+    })
+
+# Vote on community posts
+@router.post("/api/community-posts/{post_id}/vote")
+async def vote_on_post(post_id: str, vote_type: str):
+    """Vote on a community post (upvote/downvote).
+
+    The vote is appended to the event log; the post's counts catch up when
+    the compactor next folds the log, a few seconds later.
+    """
+    if vote_type not in ["upvote", "downvote"]:
+        raise HTTPException(status_code=400, detail="Invalid vote type")
+
+    post = db.community_posts.find_one({"post_id": post_id}, {"_id": 0, "constituency": 1})
+    if post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    try:
+        await event_log.append(vote_event(post_id, "up" if vote_type == "upvote" else "down"))
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many votes are waiting to be recorded, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    leaderboards.record_vote(post_id, post["constituency"], 1 if vote_type == "upvote" else -1)
+
+    return {"message": f"Post {vote_type}d successfully"}
+
+@router.delete("/api/community-posts/{post_id}", dependencies=[Depends(require_admin)])
+async def delete_community_post(post_id: str):
+    """Remove a community post (moderation); synced clients receive a tombstone"""
+    post = db.community_posts.find_one_and_delete({"post_id": post_id}, {"_id": 0, "constituency": 1})
+    if post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    record_tombstone(db, "community_posts", post_id)
+    leaderboards.remove_post(post_id)
+    await event_log.append(post_event("post_deleted", post_id, post["constituency"]))
+    return {"message": "Post deleted successfully"}
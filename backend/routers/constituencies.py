@@ -0,0 +1,60 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query
+
+import state
+from database import db, storage
+from datasets import constituencies_by_id, seed_documents
+from i18n import localized_find, request_locale
+from models import Constituency, ConstituencyLocation, validated
+from profiling import TimedRoute
+from records import CandidateRecord, ConstituencyRecord, RecordResponse, encode_json
+from sync import stamp
+
+router = APIRouter(route_class=TimedRoute)
+
+# Constituencies
+@router.get("/api/constituencies", response_model=List[Constituency])
+async def get_constituencies(sort: bool = Query(False, description="Order by name in the response language")):
+    """Get all 234 constituencies in Tamil Nadu"""
+    locale = request_locale()
+    key = ("constituencies", sort, locale)
+    fingerprint = storage.fingerprint("constituencies")
+    body = state.localized_payloads.get(key, fingerprint)
+    if body is not None:
+        return RecordResponse(body)
+
+    projection = ConstituencyRecord.projection()
+    documents = localized_find(storage.collection("constituencies"), "constituencies", {}, projection, locale, sort)
+    if not documents and db.constituencies.estimated_document_count() == 0:
+        # Initialize with all 234 TN constituencies
+        db.constituencies.insert_many(stamp(validated(Constituency, seed_documents("constituencies"))))
+        storage.refresh("constituencies")
+        documents = localized_find(db.constituencies, "constituencies", {}, projection, locale, sort)
+    body = encode_json(ConstituencyRecord.decode_many(documents))
+    state.localized_payloads.put(key, fingerprint, body)
+    return RecordResponse(body)
+
+@router.get("/api/constituencies/locate", response_model=ConstituencyLocation)
+async def locate_constituency(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+):
+    """Find the constituency containing a location, together with its candidates"""
+    if not state.constituency_locator.loaded:
+        raise HTTPException(status_code=503, detail="Constituency boundaries are not loaded")
+    match = state.constituency_locator.locate(lat, lon)
+    if match is None:
+        raise HTTPException(status_code=404, detail="Location is not inside a known constituency")
+    constituency_id, match_type = match
+    constituency = constituencies_by_id().get(constituency_id)
+    if constituency is None:
+        raise HTTPException(status_code=404, detail="Constituency not found")
+    candidates = CandidateRecord.decode_many(
+        storage.collection("candidates").find({"constituency": constituency["name"]}, CandidateRecord.projection())
+    )
+    return RecordResponse({
+        "constituency": {key: constituency[key] for key in ("constituency_id", "name", "district")},
+        "match": match_type,
+        "candidates": candidates,
+    })
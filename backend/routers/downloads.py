@@ -0,0 +1,84 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from database import reads
+from dataset_snapshot import SNAPSHOT_MEDIA_TYPE, parse_range
+from exports import EXPORT_COLUMNS, parquet_available, stream_csv, stream_parquet
+from profiling import TimedRoute
+from state import snapshot_store
+
+router = APIRouter(route_class=TimedRoute)
+
+# Offline dataset snapshots
+def snapshot_response(request: Request, snapshot, cache_control: str):
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+        "X-Snapshot-Version": snapshot.version,
+    }
+    if request.headers.get("if-none-match") == snapshot.etag:
+        return Response(status_code=304, headers=headers)
+
+    blob = snapshot.blob
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range == snapshot.etag):
+        try:
+            byte_range = parse_range(range_header, len(blob))
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{len(blob)}"
+            return Response(status_code=416, headers=headers)
+        if byte_range:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(blob)}"
+            return Response(blob[start:end + 1], status_code=206, headers=headers, media_type=SNAPSHOT_MEDIA_TYPE)
+    return Response(blob, headers=headers, media_type=SNAPSHOT_MEDIA_TYPE)
+
+@router.get("/api/snapshot")
+async def get_snapshot_manifest():
+    """List available dataset snapshot versions with per-table hashes"""
+    return snapshot_store.manifest()
+
+@router.get("/api/snapshot/latest")
+async def get_latest_snapshot(request: Request):
+    """Download the newest gzip-compressed columnar dataset snapshot"""
+    snapshot = snapshot_store.latest()
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Snapshot has not been built yet")
+    return snapshot_response(request, snapshot, "no-cache")
+
+@router.get("/api/snapshot/{version}")
+async def get_snapshot_version(version: str, request: Request):
+    """Download a specific snapshot version; versions never change once built"""
+    snapshot = snapshot_store.get(version)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Snapshot version not found")
+    return snapshot_response(request, snapshot, "public, max-age=31536000, immutable")
+
+# Bulk exports for journalists and researchers
+def export_response(collection: str, filename: str, format: str):
+    columns = EXPORT_COLUMNS[collection]
+    if format == "parquet":
+        if not parquet_available():
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+        body = stream_parquet(reads.db("exports")[collection], columns)
+        media_type = "application/vnd.apache.parquet"
+    else:
+        body = stream_csv(reads.db("exports")[collection], columns)
+        media_type = "text/csv; charset=utf-8"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
+
+@router.get("/api/export/candidates")
+async def export_candidates(format: str = Query("csv", pattern="^(csv|parquet)$")):
+    """Stream every candidate as CSV or Parquet"""
+    return export_response("candidates", "candidates", format)
+
+@router.get("/api/export/fact-checks")
+async def export_fact_checks(format: str = Query("csv", pattern="^(csv|parquet)$")):
+    """Stream every fact-check as CSV or Parquet"""
+    return export_response("fact_checks", "fact_checks", format)
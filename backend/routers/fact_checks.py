@@ -0,0 +1,150 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from auth import require_admin
+from config import FACT_CHECK_RELATED_THRESHOLD
+from database import db, reads, storage
+from datasets import seed_documents
+from facets import fact_check_facets, fact_check_query
+from i18n import localized_find, request_locale
+from models import (
+    FactCheck, FactCheckCreate, FactCheckIngested, FactCheckSync, RelatedFactChecks, validated,
+)
+from near_duplicates import minhash_field
+from profiling import TimedRoute
+from records import FactCheckRecord, RecordResponse, encode_json
+from state import fact_check_index, localized_payloads
+from sync import (
+    deleted_since, delta_query, http_date, last_modified, not_modified_since, record_tombstone,
+    stamp, sync_response,
+)
+
+router = APIRouter(route_class=TimedRoute)
+
+# Fact Checks (Kisu Kisu)
+@router.get("/api/fact-checks", response_model=Union[List[FactCheck], FactCheckSync])
+async def get_fact_checks(
+    request: Request,
+    verdict: Optional[str] = None,
+    constituency: Optional[str] = None,
+    tags: Optional[List[str]] = Query(None, description="Only fact-checks carrying all of these tags"),
+    since: Optional[datetime] = Query(None, description="Sync token; return only changes after it"),
+):
+    """Get fact-checks, optionally filtered by verdict, constituency and tags"""
+    query = fact_check_query(verdict, constituency, tags)
+    # Delta sync reads the primary: a lagging secondary could hide changes older than the token
+    source = db if since else reads.db("fact_checks")
+    locale = request_locale()
+
+    modified = last_modified(source, "fact_checks", query)
+    if not_modified_since(request.headers.get("if-modified-since"), modified):
+        return Response(status_code=304)
+    headers = {"Last-Modified": http_date(modified)} if modified else None
+
+    projection = FactCheckRecord.projection()
+    if since:
+        issued_at = datetime.now()
+        items = FactCheckRecord.decode_many(
+            localized_find(db.fact_checks, "fact_checks", delta_query(query, since), projection, locale)
+        )
+        return RecordResponse(
+            sync_response(items, deleted_since(db, "fact_checks", since), issued_at), headers=headers
+        )
+
+    key = ("fact_checks", verdict, constituency, tuple(tags or ()), locale)
+    fingerprint = storage.fingerprint("fact_checks")
+    body = localized_payloads.get(key, fingerprint)
+    if body is not None:
+        return RecordResponse(body, headers=headers)
+
+    fact_checks = FactCheckRecord.decode_many(localized_find(source.fact_checks, "fact_checks", query, projection, locale))
+    # Only seed an empty collection; a filter that matches nothing is a valid result
+    if not fact_checks and db.fact_checks.estimated_document_count() == 0:
+        # Initialize with comprehensive fact-check data
+        db.fact_checks.insert_many(stamp(validated(FactCheck, seed_documents("fact_checks"))))
+        storage.refresh("fact_checks")
+        fact_checks = FactCheckRecord.decode_many(localized_find(db.fact_checks, "fact_checks", query, projection, locale))
+    body = encode_json(fact_checks)
+    localized_payloads.put(key, fingerprint, body)
+    return RecordResponse(body, headers=headers)
+
+@router.get("/api/fact-checks/facets")
+async def get_fact_check_facets(
+    verdict: Optional[str] = None,
+    constituency: Optional[str] = None,
+    tags: Optional[List[str]] = Query(None),
+    tag_limit: int = Query(50, ge=1, le=500),
+):
+    """Counts per tag and verdict for the fact-checks matching the filters"""
+    query = fact_check_query(verdict, constituency, tags)
+    return fact_check_facets(reads.db("fact_checks"), query, tag_limit)
+
+def related_fact_checks(matches):
+    """Fact-check records for (fact_id, similarity) pairs, in the same order"""
+    if not matches:
+        return []
+    similarities = dict(matches)
+    documents = localized_find(
+        reads.db("fact_checks").fact_checks, "fact_checks",
+        {"fact_id": {"$in": list(similarities)}}, FactCheckRecord.projection(), request_locale(),
+    )
+    records = {record.fact_id: record for record in FactCheckRecord.decode_many(documents)}
+    return [
+        {**records[fact_id].to_dict(), "similarity": similarity}
+        for fact_id, similarity in matches if fact_id in records
+    ]
+
+def require_fact_check_index():
+    if not fact_check_index.ready:
+        raise HTTPException(status_code=503, detail="Fact-check index is still loading", headers={"Retry-After": "5"})
+
+@router.post(
+    "/api/fact-checks",
+    status_code=201,
+    response_model=FactCheckIngested,
+    dependencies=[Depends(require_admin), Depends(require_fact_check_index)],
+)
+async def create_fact_check(submission: FactCheckCreate):
+    """Add a fact-check, linked to the existing claims it nearly duplicates"""
+    document = {**submission.model_dump(), "fact_id": str(uuid.uuid4()), "date_added": datetime.now()}
+    signature = fact_check_index.signature(document)
+    matches = fact_check_index.query(signature, FACT_CHECK_RELATED_THRESHOLD)
+    fact_check, = stamp(validated(FactCheck, [document]))
+    db.fact_checks.insert_one({
+        **fact_check,
+        "minhash": minhash_field(signature),
+        "related_fact_ids": [fact_id for fact_id, _ in matches],
+    })
+    fact_check_index.add(fact_check["fact_id"], signature)
+    storage.refresh("fact_checks")
+    return RecordResponse({"fact_check": fact_check, "related": related_fact_checks(matches)}, status_code=201)
+
+@router.get(
+    "/api/fact-checks/{fact_id}/related",
+    response_model=RelatedFactChecks,
+    dependencies=[Depends(require_fact_check_index)],
+)
+async def get_related_fact_checks(
+    fact_id: str,
+    min_similarity: float = Query(FACT_CHECK_RELATED_THRESHOLD, ge=0.1, le=1.0),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Near-duplicate claims of a fact-check, found through the MinHash LSH index"""
+    if fact_id not in fact_check_index:
+        raise HTTPException(status_code=404, detail="Fact-check not found")
+    matches = fact_check_index.related(fact_id, min_similarity, limit)
+    return RecordResponse({"fact_id": fact_id, "related": related_fact_checks(matches)})
+
+@router.delete("/api/fact-checks/{fact_id}", dependencies=[Depends(require_admin)])
+async def delete_fact_check(fact_id: str):
+    """Remove a fact-check; synced clients receive a tombstone"""
+    result = db.fact_checks.delete_one({"fact_id": fact_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Fact-check not found")
+    record_tombstone(db, "fact_checks", fact_id)
+    fact_check_index.remove(fact_id)
+    storage.refresh("fact_checks")
+    return {"message": "Fact-check deleted successfully"}
@@ -0,0 +1,90 @@
+import gzip
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from database import db, storage
+from datasets import seed_documents
+from i18n import localized_find, request_locale
+from models import ManifestoPromise, validated
+from profiling import TimedRoute
+from records import ManifestoRecord, RecordResponse, encode_json
+from scorecards import latest_scorecard, scorecard_history
+from state import explanation_bundles, localized_payloads
+from sync import stamp
+
+router = APIRouter(route_class=TimedRoute)
+
+# Manifestos
+@router.get("/api/manifestos", response_model=List[ManifestoPromise])
+async def get_manifestos(
+    party: Optional[str] = None,
+    category: Optional[str] = None,
+    sort: bool = Query(False, description="Order by title in the response language"),
+):
+    """Get manifesto promises, optionally filtered by party and category"""
+    query = {}
+    if party:
+        query["party"] = party
+    if category:
+        query["category"] = category
+
+    locale = request_locale()
+    key = ("manifestos", party, category, sort, locale)
+    fingerprint = storage.fingerprint("manifestos")
+    body = localized_payloads.get(key, fingerprint)
+    if body is not None:
+        return RecordResponse(body)
+
+    projection = ManifestoRecord.projection()
+    documents = localized_find(storage.collection("manifestos"), "manifestos", query, projection, locale, sort)
+    if not documents and db.manifestos.estimated_document_count() == 0:
+        # Initialize with comprehensive manifesto data
+        db.manifestos.insert_many(stamp(validated(ManifestoPromise, seed_documents("manifestos"))))
+        storage.refresh("manifestos")
+        documents = localized_find(db.manifestos, "manifestos", query, projection, locale, sort)
+    body = encode_json(ManifestoRecord.decode_many(documents))
+    localized_payloads.put(key, fingerprint, body)
+    return RecordResponse(body)
+
+# Manifesto scorecards (precomputed by the background worker)
+@router.get("/api/scorecards")
+async def get_scorecards():
+    """Get the latest per-party and per-category promise fulfilment scorecards"""
+    snapshot = latest_scorecard(db)
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Scorecards have not been computed yet")
+    return snapshot
+
+@router.get("/api/scorecards/history")
+async def get_scorecard_history(limit: int = Query(10, ge=1, le=100)):
+    """Get previous scorecard snapshots, newest first"""
+    return scorecard_history(db, limit)
+
+# One-minute explanation bundles
+@router.get("/api/bundles")
+async def get_bundle_index():
+    """Content-hashed explanation bundle URLs per party and per category"""
+    return Response(
+        encode_json(explanation_bundles.index()),
+        media_type="application/json",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+@router.get("/api/bundles/{content_hash}")
+async def get_bundle(content_hash: str, request: Request):
+    """Serve a bundle or audio blob; the URL changes whenever the content does"""
+    blob = explanation_bundles.get(content_hash)
+    if blob is None:
+        raise HTTPException(status_code=404, detail="Bundle not found")
+    headers = {"ETag": f'"{blob.hash}"', "Cache-Control": "public, max-age=31536000, immutable"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    body = blob.body
+    if blob.compressed:
+        headers["Vary"] = "Accept-Encoding"
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+        else:
+            body = gzip.decompress(body)
+    return Response(body, media_type=blob.media_type, headers=headers)
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from auth import require_admin
+from database import db, storage
+from event_log import CHECKPOINT_ID, LeaseHeld, audit_events, replay_votes
+from profiling import TimedRoute
+from state import (
+    event_log, localized_payloads, mongo_breaker, post_queue, profiler, single_flight_stats, stale_cache,
+    vote_compactor,
+)
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.get("/api/metrics/degraded-mode")
+async def get_degraded_mode_metrics():
+    """Circuit breaker state and how often stale responses were served"""
+    return {"breaker": mongo_breaker.snapshot(), "stale_cache": stale_cache.snapshot()}
+
+@router.get("/api/metrics/storage")
+async def get_storage_metrics():
+    """Which engine serves each read-mostly collection, and what is loaded in memory"""
+    return storage.stats()
+
+@router.get("/api/metrics/localized-payloads")
+async def get_localized_payload_metrics():
+    """Hit rate of the serialized per-locale listings"""
+    return localized_payloads.stats()
+
+@router.get("/api/metrics/single-flight")
+async def get_single_flight_metrics():
+    """How many read requests were served from another request's in-flight query"""
+    return single_flight_stats.snapshot()
+
+@router.get("/api/metrics/post-queue")
+async def get_post_queue_metrics():
+    """Queue depth and throughput counters for the community post pipeline"""
+    return post_queue.stats()
+
+@router.get("/api/metrics/event-log")
+async def get_event_log_metrics():
+    """Event writer throughput and how often the vote compactor has run"""
+    return {
+        "writer": event_log.stats(),
+        "compactor": {"runs": vote_compactor.runs, "failures": vote_compactor.failures},
+        "checkpoint": await asyncio.to_thread(
+            db.event_log_checkpoints.find_one, {"_id": CHECKPOINT_ID}, {"_id": 0, "last_id": 0, "pending.last_id": 0}
+        ),
+    }
+
+# Operations
+@router.post("/api/admin/profile", dependencies=[Depends(require_admin)], response_class=PlainTextResponse)
+async def run_profiler(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: float = Query(10.0, ge=1, le=1000),
+):
+    """Sample all thread stacks for a while and return them in folded flamegraph format"""
+    stacks = await asyncio.to_thread(profiler.profile, seconds, interval_ms / 1000)
+    if stacks is None:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    return stacks
+
+@router.get("/api/admin/events", dependencies=[Depends(require_admin)])
+async def get_events(
+    post_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Logged post and vote events in time order, for auditing a post's history"""
+    events = await asyncio.to_thread(audit_events, db, post_id, since, until, limit)
+    return {"events": events}
+
+@router.post("/api/admin/events/replay", dependencies=[Depends(require_admin)])
+async def replay_events(post_id: Optional[str] = None, apply: bool = False):
+    """Recount votes from the event log; reports drift, and fixes it when `apply` is set"""
+    try:
+        return await asyncio.to_thread(replay_votes, db, post_id, apply)
+    except LeaseHeld:
+        raise HTTPException(status_code=409, detail="Vote counts are being compacted, retry shortly",
+                            headers={"Retry-After": "5"})
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from pymongo.errors import DuplicateKeyError
+
+from auth import require_admin
+from database import db
+from datasets import constituency_districts, constituency_names
+from models import RoundUpdate
+from profiling import TimedRoute
+from records import RecordResponse
+from results import UnknownCandidate, sequence_collided
+from state import (
+    catch_up_results, load_results_reference, results_ingest_lock, results_ready, results_tally,
+)
+
+router = APIRouter(route_class=TimedRoute)
+
+# Counting-day results
+def require_results_ready():
+    # Rounds applied before recovery would be numbered from an empty tally
+    if not results_ready.is_set():
+        raise HTTPException(status_code=503, detail="Results are still being recovered", headers={"Retry-After": "5"})
+
+async def ingest_round(update: RoundUpdate):
+    """Log a round durably, then apply it to the in-memory tally"""
+    deltas = {}
+    for delta in update.deltas:
+        deltas[delta.candidate_id] = deltas.get(delta.candidate_id, 0) + delta.votes
+
+    async with results_ingest_lock:
+        while True:
+            if results_tally.has_round(update.constituency, update.round):
+                return "duplicate"
+            try:
+                results_tally.validate_round(update.constituency, deltas)
+            except UnknownCandidate:
+                # Candidates may have been loaded after startup
+                await asyncio.to_thread(load_results_reference)
+                results_tally.validate_round(update.constituency, deltas)
+            sequence = results_tally.sequence + 1
+            try:
+                await asyncio.to_thread(db.results_rounds.insert_one, {
+                    "sequence": sequence,
+                    "constituency": update.constituency,
+                    "round": update.round,
+                    "deltas": deltas,
+                    "received_at": datetime.now(),
+                })
+            except DuplicateKeyError as error:
+                if not sequence_collided(error):
+                    return "duplicate"
+                # Another instance logged a round under this sequence first: catch up and take the next one
+                await catch_up_results()
+                continue
+            results_tally.apply_round(update.constituency, update.round, deltas, sequence=sequence)
+            return "applied"
+
+@router.post("/api/results/rounds", dependencies=[Depends(require_admin), Depends(require_results_ready)])
+async def post_result_rounds(updates: List[RoundUpdate]):
+    """Ingest round-by-round vote deltas; re-sent rounds are ignored"""
+    statuses = []
+    for update in updates:
+        try:
+            status = await ingest_round(update)
+        except UnknownCandidate as error:
+            raise HTTPException(status_code=400, detail=str(error))
+        statuses.append({"constituency": update.constituency, "round": update.round, "status": status})
+    return {"sequence": results_tally.sequence, "rounds": statuses}
+
+@router.get("/api/results/state")
+async def get_state_results():
+    """Statewide party totals: seats leading and votes"""
+    return RecordResponse(results_tally.state_result())
+
+@router.get("/api/results/districts/{district}")
+async def get_district_results(district: str):
+    """Party totals for one district"""
+    if district not in constituency_districts():
+        raise HTTPException(status_code=404, detail="District not found")
+    return RecordResponse(results_tally.district_result(district))
+
+@router.get("/api/results/constituencies/{constituency}")
+async def get_constituency_results(constituency: str):
+    """Current votes, leader and margin for one constituency"""
+    if constituency not in constituency_names():
+        raise HTTPException(status_code=404, detail="Constituency not found")
+    return RecordResponse(results_tally.constituency_result(constituency))
@@ -0,0 +1,45 @@
+import re
+from typing import List
+
+from fastapi import APIRouter, Query
+
+from database import storage
+from i18n import localized_find, request_locale, search_fields
+from models import Candidate, ManifestoPromise
+from profiling import TimedRoute
+from records import CandidateRecord, ManifestoRecord, RecordResponse
+
+router = APIRouter(route_class=TimedRoute)
+
+# Search endpoints
+@router.get("/api/search/candidates", response_model=List[Candidate])
+async def search_candidates(q: str = Query(..., description="Search query")):
+    """Search candidates by name or party"""
+    # Matched literally: a user-supplied pattern could backtrack for seconds,
+    # blocking the event loop when the memory engine evaluates it
+    pattern = re.escape(q)
+    query = {
+        "$or": [
+            {"name": {"$regex": pattern, "$options": "i"}},
+            {"party": {"$regex": pattern, "$options": "i"}},
+            {"constituency": {"$regex": pattern, "$options": "i"}}
+        ]
+    }
+    candidates = CandidateRecord.decode_many(storage.collection("candidates", "search").find(query, CandidateRecord.projection()))
+    return RecordResponse(candidates)
+
+@router.get("/api/search/manifestos", response_model=List[ManifestoPromise])
+async def search_manifestos(q: str = Query(..., description="Search query")):
+    """Search manifesto promises by title or description, in the response language too"""
+    locale = request_locale()
+    pattern = re.escape(q)
+    query = {
+        "$or": [
+            {field: {"$regex": pattern, "$options": "i"}}
+            for field in search_fields("manifestos", ["title", "description", "category"], locale)
+        ]
+    }
+    documents = localized_find(
+        storage.collection("manifestos", "search"), "manifestos", query, ManifestoRecord.projection(), locale
+    )
+    return RecordResponse(ManifestoRecord.decode_many(documents))
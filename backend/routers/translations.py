@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from auth import require_admin
+from database import db, storage
+from datasets import SEED_ID_FIELDS
+from i18n import DEFAULT_LOCALE, SUPPORTED_LOCALES, TRANSLATABLE_FIELDS
+from models import TranslationUpdate
+from profiling import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+ID_FIELDS = {**SEED_ID_FIELDS, "constituencies": "constituency_id"}
+
+# Translations
+@router.put("/api/admin/translations/{collection}/{doc_id}", dependencies=[Depends(require_admin)])
+async def put_translation(collection: str, doc_id: str, update: TranslationUpdate):
+    """Store translated text fields for one document; listings in that locale pick them up on reload"""
+    if collection not in TRANSLATABLE_FIELDS:
+        raise HTTPException(status_code=404, detail="Collection has no translatable fields")
+    if update.locale == DEFAULT_LOCALE or update.locale not in SUPPORTED_LOCALES:
+        raise HTTPException(status_code=400, detail="Unsupported translation locale")
+    unknown = set(update.fields) - set(TRANSLATABLE_FIELDS[collection])
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Fields cannot be translated: {', '.join(sorted(unknown))}")
+
+    changes = {f"translations.{update.locale}.{field}": text.strip() for field, text in update.fields.items()}
+    # Restamping updated_at invalidates delta sync clients and the in-memory copy
+    result = db[collection].update_one(
+        {ID_FIELDS[collection]: doc_id}, {"$set": {**changes, "updated_at": datetime.now()}}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Document not found")
+    storage.refresh(collection)
+    return {"message": "Translation saved", "locale": update.locale, "fields": sorted(update.fields)}
@@ -0,0 +1,85 @@
+import uuid
+from datetime import datetime
+
+# Count fulfilled / broken / pending promises for whatever the pipeline grouped by.
+# `fulfilled` is tri-state, and a missing field counts as pending like an explicit null.
+_STATUS_COUNTS = {
+    "total": {"$sum": 1},
+    "fulfilled": {"$sum": {"$cond": [{"$eq": ["$fulfilled", True]}, 1, 0]}},
+    "broken": {"$sum": {"$cond": [{"$eq": ["$fulfilled", False]}, 1, 0]}},
+    "pending": {"$sum": {"$cond": [{"$eq": [{"$ifNull": ["$fulfilled", None]}, None]}, 1, 0]}},
+}
+
+
+def _group(key):
+    return [
+        {"$group": {"_id": key, **_STATUS_COUNTS}},
+        {"$sort": {"_id": 1}},
+    ]
+
+
+SCORECARD_PIPELINE = [
+    {"$facet": {
+        "by_party": _group("$party"),
+        "by_category": _group("$category"),
+        "by_party_category": _group({"party": "$party", "category": "$category"}),
+    }}
+]
+
+
+def _scorecard_row(group, key_names):
+    row = {}
+    if isinstance(group["_id"], dict):
+        row.update(group["_id"])
+    else:
+        row[key_names[0]] = group["_id"]
+    decided = group["fulfilled"] + group["broken"]
+    row.update({
+        "total": group["total"],
+        "fulfilled": group["fulfilled"],
+        "broken": group["broken"],
+        "pending": group["pending"],
+        # Share of all promises kept, and share of the promises with a verdict
+        "fulfilment_rate": round(group["fulfilled"] / group["total"], 4) if group["total"] else 0.0,
+        "decided_fulfilment_rate": round(group["fulfilled"] / decided, 4) if decided else None,
+    })
+    return row
+
+
+def compute_scorecards(db, keep: int = 288):
+    """Aggregate manifesto promises into a scorecard snapshot and store it.
+
+    Only the newest `keep` snapshots are retained as history.
+    """
+    result = next(db.manifestos.aggregate(SCORECARD_PIPELINE), None) or {}
+    snapshot = {
+        "snapshot_id": str(uuid.uuid4()),
+        "generated_at": datetime.now(),
+        "by_party": [_scorecard_row(g, ["party"]) for g in result.get("by_party", [])],
+        "by_category": [_scorecard_row(g, ["category"]) for g in result.get("by_category", [])],
+        "by_party_category": [
+            _scorecard_row(g, ["party", "category"]) for g in result.get("by_party_category", [])
+        ],
+    }
+    db.promise_scorecards.insert_one(snapshot)
+    snapshot.pop("_id", None)
+
+    expired = db.promise_scorecards.find({}, {"_id": 1}).sort("generated_at", -1).skip(keep)
+    expired_ids = [doc["_id"] for doc in expired]
+    if expired_ids:
+        db.promise_scorecards.delete_many({"_id": {"$in": expired_ids}})
+    return snapshot
+
+
+def latest_scorecard(db):
+    return db.promise_scorecards.find_one({}, {"_id": 0}, sort=[("generated_at", -1)])
+
+
+def scorecard_history(db, limit: int):
+    return list(
+        db.promise_scorecards.find({}, {"_id": 0}).sort("generated_at", -1).limit(limit)
+    )
+
+
+def ensure_scorecard_indexes(db):
+    db.promise_scorecards.create_index([("generated_at", -1)])
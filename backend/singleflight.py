@@ -0,0 +1,104 @@
+import asyncio
+from urllib.parse import parse_qsl, urlencode
+
+from i18n import negotiate
+
+# Request headers that change the response, and so must be part of the key;
+# Accept-Language and lang= count through the locale they negotiate
+VARY_HEADERS = (b"if-modified-since", b"if-none-match", b"range")
+
+
+class SingleFlightStats:
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self.fallbacks = 0
+        self.in_flight = 0
+
+    def snapshot(self):
+        total = self.leaders + self.coalesced
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "fallbacks": self.fallbacks,
+            "in_flight": self.in_flight,
+            "coalesced_ratio": round(self.coalesced / total, 4) if total else 0.0,
+        }
+
+
+def request_key(scope):
+    """Route plus normalized query string, response locale and the response-affecting headers"""
+    params = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+    headers = dict(scope.get("headers", []))
+    # Negotiated as LocaleMiddleware does, so every spelling of a locale shares one key
+    locale = negotiate(headers.get(b"accept-language", b"").decode("latin-1"), dict(params).get("lang"))
+    return (
+        scope["path"],
+        urlencode(sorted((name, value) for name, value in params if name != "lang")),
+        locale,
+        tuple(headers.get(name, b"") for name in VARY_HEADERS),
+    )
+
+
+class SingleFlightMiddleware:
+    """Collapses concurrent identical GET requests into one.
+
+    The first request for a key (the leader) runs the route and buffers the
+    complete response. Identical requests that arrive while it is in flight
+    wait for that buffer and replay it, so a stampede costs one Mongo query and
+    one serialization. If the leader fails, each waiting request runs the
+    route itself instead of sharing the failure.
+
+    Only use this on routes whose responses are small and not per-client.
+    """
+
+    def __init__(self, app, paths, stats: SingleFlightStats):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.stats = stats
+        self._in_flight = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = request_key(scope)
+        leader = self._in_flight.get(key)
+        if leader is not None:
+            self.stats.coalesced += 1
+            messages = await asyncio.shield(leader)
+            if messages is None:
+                self.stats.fallbacks += 1
+                await self.app(scope, receive, send)
+                return
+            await self._replay(messages, send, coalesced=True)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.stats.leaders += 1
+        self.stats.in_flight += 1
+        messages = []
+
+        async def record(message):
+            messages.append(message)
+
+        try:
+            await self.app(scope, receive, record)
+        except BaseException:
+            future.set_result(None)
+            raise
+        else:
+            future.set_result(messages)
+        finally:
+            self.stats.in_flight -= 1
+            del self._in_flight[key]
+        await self._replay(messages, send)
+
+    @staticmethod
+    async def _replay(messages, send, coalesced: bool = False):
+        for message in messages:
+            if coalesced and message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-coalesced", b"1")]}
+            await send(message)
@@ -0,0 +1,327 @@
+# Shared services behind the routers: background workers, in-memory indexes
+# and the start/stop lifecycle the app runs them under
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from background import PeriodicWorker
+from bundles import BundleStore, load_tts_engine, rebuild_if_changed
+from config import (
+    BUNDLE_CHECK_INTERVAL_SECONDS, BUNDLE_TTS_ENGINE, CONSTITUENCY_GEOMETRY_PATH, EVENT_BATCH_SIZE,
+    EVENT_BATCH_WAIT_MS, EVENT_LOG_MAXSIZE, FACT_CHECK_INDEX_INTERVAL_SECONDS, LEADERBOARD_PERSIST_INTERVAL_SECONDS,
+    LINK_CHECK_INTERVAL_SECONDS, LINK_CHECK_PER_HOST, LINK_CHECK_TIMEOUT_SECONDS, LINK_RECHECK_HOURS,
+    LOCALIZED_PAYLOAD_ENTRIES, MONGO_BREAKER_FAILURES, MONGO_BREAKER_RESET_SECONDS,
+    PAYLOAD_FINGERPRINT_INTERVAL_SECONDS, POST_BATCH_SIZE, POST_BATCH_WAIT_MS, POST_QUEUE_MAXSIZE, POST_QUEUE_WORKERS, POST_WRITE_RETRIES, RANKINGS_INTERVAL_SECONDS,
+    RESULTS_FOLLOW_INTERVAL_SECONDS, RESULTS_SNAPSHOT_INTERVAL_SECONDS, SCORECARD_HISTORY_LIMIT, SCORECARD_INTERVAL_SECONDS,
+    SNAPSHOT_INTERVAL_SECONDS, SNAPSHOT_KEEP_VERSIONS, STALE_CACHE_ENTRIES, STORAGE_REFRESH_INTERVAL_SECONDS,
+    TRENDING_BUCKETS, TRENDING_BUCKET_SECONDS, TRENDING_TOP_K, VOTE_COMPACTION_INTERVAL_SECONDS,
+    VOTE_COMPACTION_LAG_SECONDS,
+)
+from database import db, storage
+from dataset_snapshot import SnapshotStore, build_snapshot
+from datasets import constituencies
+from degraded import CircuitBreaker, StaleCache
+from event_log import EventLog, compact_votes, ensure_event_log_indexes, publish_posts, write_events
+from facets import ensure_facet_indexes
+from geo import ConstituencyLocator, load_locator
+from i18n import PayloadCache, ensure_collation_indexes
+from leaderboards import (
+    EngagementLeaderboards, claim_seed, ensure_leaderboard_indexes, load_counts, load_seed_data, save_counts,
+)
+from moderation import default_filters
+from near_duplicates import FactCheckIndex, sync_fact_check_index
+from post_pipeline import PostQueue, insert_missing
+from profiling import SamplingProfiler
+from rankings import CandidateRankings, refresh_rankings
+from results import (
+    ResultsTally, UnknownCandidate, apply_logged_rounds, ensure_results_indexes, logged_rounds, recover_tally,
+    save_snapshot,
+)
+from scorecards import compute_scorecards, ensure_scorecard_indexes
+from singleflight import SingleFlightStats
+from sync import ensure_sync_indexes
+from trending import TrendingTerms
+
+logger = logging.getLogger(__name__)
+
+# Read by the request middleware in server.py and reported under /api/metrics
+single_flight_stats = SingleFlightStats()
+mongo_breaker = CircuitBreaker(MONGO_BREAKER_FAILURES, MONGO_BREAKER_RESET_SECONDS)
+stale_cache = StaleCache(STALE_CACHE_ENTRIES)
+
+scorecard_worker = PeriodicWorker(
+    "promise-scorecards",
+    lambda: compute_scorecards(db, keep=SCORECARD_HISTORY_LIMIT),
+    SCORECARD_INTERVAL_SECONDS,
+)
+
+snapshot_store = SnapshotStore(keep=SNAPSHOT_KEEP_VERSIONS)
+snapshot_worker = PeriodicWorker(
+    "dataset-snapshot",
+    lambda: snapshot_store.add(build_snapshot(db)),
+    SNAPSHOT_INTERVAL_SECONDS,
+)
+
+trending_terms = TrendingTerms(
+    bucket_seconds=TRENDING_BUCKET_SECONDS,
+    buckets=TRENDING_BUCKETS,
+    k=TRENDING_TOP_K,
+)
+
+leaderboards = EngagementLeaderboards()
+
+post_queue = PostQueue(
+    publish=lambda posts: publish_posts(db, posts),
+    reject=lambda posts: insert_missing(db.rejected_community_posts, posts),
+    dead_letter=lambda posts: db.failed_community_posts.insert_many(posts, ordered=False),
+    retries=POST_WRITE_RETRIES,
+    filters=default_filters(),
+    maxsize=POST_QUEUE_MAXSIZE,
+    workers=POST_QUEUE_WORKERS,
+    batch_size=POST_BATCH_SIZE,
+    batch_wait_seconds=POST_BATCH_WAIT_MS / 1000,
+    listeners=[trending_terms.record, leaderboards.record_posts],
+)
+
+# Votes are appended here and folded into the posts' counts by the compactor,
+# so a burst of votes on one post never contends on its document
+event_log = EventLog(
+    write=lambda partition, events: write_events(db, partition, events),
+    maxsize=EVENT_LOG_MAXSIZE,
+    batch_size=EVENT_BATCH_SIZE,
+    batch_wait_seconds=EVENT_BATCH_WAIT_MS / 1000,
+    # Well under the compactor's lag, which assumes events are stored by then
+    write_budget_seconds=VOTE_COMPACTION_LAG_SECONDS / 2,
+)
+vote_compactor = PeriodicWorker(
+    "vote-compactor",
+    lambda: compact_votes(db, lag=timedelta(seconds=VOTE_COMPACTION_LAG_SECONDS)),
+    VOTE_COMPACTION_INTERVAL_SECONDS,
+)
+
+async def restore_leaderboards():
+    # The first instance to find no shared counts seeds them from stored data
+    if await asyncio.to_thread(claim_seed, db):
+        snapshot, posts = await asyncio.to_thread(load_seed_data, db)
+        if snapshot is not None:
+            leaderboards.restore(snapshot)
+        else:
+            leaderboards.rebuild(posts)
+    leaderboards.load(await asyncio.to_thread(load_counts, db))
+    await persist_leaderboards()
+
+async def persist_leaderboards():
+    """Add this instance's increments to the shared counts, then serve the merged totals"""
+    # Nothing to save until the persisted counts were loaded in
+    if not leaderboards.restored:
+        return
+    increments, removed = leaderboards.take_pending()
+    try:
+        rejected = await asyncio.to_thread(
+            save_counts, db, increments, removed, leaderboards.expired_buckets()
+        )
+    except Exception:
+        leaderboards.restore_pending(increments, removed)
+        raise
+    leaderboards.restore_pending(rejected, set())
+    leaderboards.load(await asyncio.to_thread(load_counts, db))
+
+leaderboard_worker = PeriodicWorker(
+    "leaderboards", persist_leaderboards, LEADERBOARD_PERSIST_INTERVAL_SECONDS, run_immediately=False
+)
+
+def recent_posts():
+    """Posts still inside the trending window, used to warm the counters on startup"""
+    window_start = datetime.now() - timedelta(seconds=TRENDING_BUCKET_SECONDS * TRENDING_BUCKETS)
+    projection = {"_id": 0, "constituency": 1, "title": 1, "content": 1, "created_at": 1}
+    return list(db.community_posts.find({"created_at": {"$gte": window_start}}, projection))
+
+candidate_rankings = CandidateRankings()
+# Candidates are ingested by the seed path below and by external data loads;
+# the periodic refresh picks up the latter
+rankings_worker = PeriodicWorker(
+    "candidate-rankings",
+    lambda: refresh_rankings(db, candidate_rankings),
+    RANKINGS_INTERVAL_SECONDS,
+)
+
+profiler = SamplingProfiler()
+# Replaced with the loaded boundary index on startup
+constituency_locator = ConstituencyLocator()
+
+explanation_bundles = BundleStore(tts_engine=load_tts_engine(BUNDLE_TTS_ENGINE))
+bundle_worker = PeriodicWorker(
+    "explanation-bundles",
+    lambda: rebuild_if_changed(db, explanation_bundles),
+    BUNDLE_CHECK_INTERVAL_SECONDS,
+)
+
+results_tally = ResultsTally()
+results_ingest_lock = asyncio.Lock()
+# Set once the tally has been recovered; ingest is refused with a 503 until then
+results_ready = asyncio.Event()
+results_snapshot_sequence = 0
+# Identifies this process to the lease that picks the one snapshot writer
+results_snapshot_owner = uuid.uuid4().hex
+
+def load_results_reference():
+    results_tally.set_reference_data(
+        db.candidates.find({}, {"_id": 0, "candidate_id": 1, "name": 1, "party": 1, "constituency": 1}),
+        constituencies(),
+    )
+
+def load_results():
+    load_results_reference()
+    recover_tally(db, results_tally)
+
+async def catch_up_results():
+    """Apply the rounds other instances logged since this tally's sequence; hold results_ingest_lock"""
+    rounds = await asyncio.to_thread(logged_rounds, db, results_tally.sequence)
+    try:
+        apply_logged_rounds(results_tally, rounds)
+    except UnknownCandidate:
+        # Candidates may have been loaded after startup; rounds applied so far are kept
+        await asyncio.to_thread(load_results_reference)
+        apply_logged_rounds(results_tally, [item for item in rounds if item["sequence"] > results_tally.sequence])
+
+async def follow_results():
+    if not results_ready.is_set():
+        return
+    async with results_ingest_lock:
+        await catch_up_results()
+
+# Every instance serves the same tally by following the shared round log
+results_follower = PeriodicWorker(
+    "results-follower", follow_results, RESULTS_FOLLOW_INTERVAL_SECONDS, run_immediately=False
+)
+
+async def snapshot_results():
+    global results_snapshot_sequence
+    if not results_ready.is_set() or results_tally.sequence == results_snapshot_sequence:
+        return
+    snapshot = results_tally.snapshot()
+    saved = await asyncio.to_thread(
+        save_snapshot, db, snapshot, results_snapshot_owner, 3 * RESULTS_SNAPSHOT_INTERVAL_SECONDS
+    )
+    if saved:
+        results_snapshot_sequence = snapshot["sequence"]
+
+results_snapshot_worker = PeriodicWorker(
+    "results-snapshot", snapshot_results, RESULTS_SNAPSHOT_INTERVAL_SECONDS, run_immediately=False
+)
+
+link_checker = None
+
+async def check_links():
+    from link_health import crawl_links
+    await crawl_links(db, link_checker, timedelta(hours=LINK_RECHECK_HOURS))
+
+link_worker = PeriodicWorker("link-health", check_links, LINK_CHECK_INTERVAL_SECONDS)
+# Picks up fact-checks ingested elsewhere and backfills missing signatures
+fact_check_index = FactCheckIndex()
+fact_check_index_worker = PeriodicWorker(
+    "fact-check-index",
+    lambda: sync_fact_check_index(db, fact_check_index),
+    FACT_CHECK_INDEX_INTERVAL_SECONDS,
+)
+
+# Reused until the collection behind them changes, as seen by its fingerprint
+localized_payloads = PayloadCache(LOCALIZED_PAYLOAD_ENTRIES)
+# Memory-engine copies carry their own fingerprint; this keeps the Mongo-served ones current
+fingerprint_worker = PeriodicWorker(
+    "payload-fingerprints", storage.refresh_fingerprints, PAYLOAD_FINGERPRINT_INTERVAL_SECONDS
+)
+
+# Reloads in-memory collections whose Mongo contents changed; a no-op when
+# every collection uses the Mongo engine
+storage_worker = PeriodicWorker(
+    "storage-refresh", storage.refresh, STORAGE_REFRESH_INTERVAL_SECONDS, run_immediately=False
+)
+
+def ensure_indexes():
+    ensure_scorecard_indexes(db)
+    ensure_sync_indexes(db)
+    ensure_facet_indexes(db)
+    ensure_results_indexes(db)
+    ensure_event_log_indexes(db)
+    ensure_leaderboard_indexes(db)
+    ensure_collation_indexes(db)
+    db.candidates.create_index("constituency")
+    # Exports stream candidates in candidate_id order; the index saves a blocking in-memory sort
+    db.candidates.create_index("candidate_id")
+    # Fact-check lookups, exports and the signature backfill go by fact_id
+    db.fact_checks.create_index("fact_id", unique=True)
+    db.community_posts.create_index("post_id")
+    db.community_posts.create_index([("created_at", -1)])
+    db.rejected_community_posts.create_index("post_id")
+    db.failed_community_posts.create_index("post_id")
+
+WARM_UP_RETRY_SECONDS = 5
+warm_up_task = None
+
+async def warm_up():
+    """Everything startup needs from Mongo or disk, retried until Mongo is reachable"""
+    global constituency_locator, link_checker, results_snapshot_sequence
+    constituency_locator = await asyncio.to_thread(load_locator, CONSTITUENCY_GEOMETRY_PATH)
+    while True:
+        try:
+            await asyncio.to_thread(ensure_indexes)
+            trending_terms.record(await asyncio.to_thread(recent_posts))
+            await asyncio.to_thread(load_results)
+            await asyncio.to_thread(storage.refresh)
+            await restore_leaderboards()
+            break
+        except Exception:
+            logger.exception("Startup warm-up failed, retrying in %ss", WARM_UP_RETRY_SECONDS)
+            await asyncio.sleep(WARM_UP_RETRY_SECONDS)
+    results_snapshot_sequence = results_tally.sequence
+    results_ready.set()
+
+    # httpx is only needed once the link crawler runs
+    from link_health import LinkChecker, create_client, ensure_link_indexes
+    await asyncio.to_thread(ensure_link_indexes, db)
+    link_checker = LinkChecker(create_client(timeout=LINK_CHECK_TIMEOUT_SECONDS), per_host=LINK_CHECK_PER_HOST)
+
+    scorecard_worker.start()
+    snapshot_worker.start()
+    link_worker.start()
+    bundle_worker.start()
+    results_snapshot_worker.start()
+    results_follower.start()
+    rankings_worker.start()
+    storage_worker.start()
+    fingerprint_worker.start()
+    fact_check_index_worker.start()
+    vote_compactor.start()
+    leaderboard_worker.start()
+
+async def start():
+    """Start accepting work at once; Mongo-dependent warm-up continues in the background"""
+    global warm_up_task
+    post_queue.start()
+    event_log.start()
+    warm_up_task = asyncio.get_running_loop().create_task(warm_up())
+
+async def stop():
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    await scorecard_worker.stop()
+    await snapshot_worker.stop()
+    await post_queue.stop()
+    await event_log.stop()
+    await vote_compactor.stop()
+    await rankings_worker.stop()
+    await link_worker.stop()
+    await bundle_worker.stop()
+    await results_snapshot_worker.stop()
+    await results_follower.stop()
+    await storage_worker.stop()
+    await fingerprint_worker.stop()
+    await fact_check_index_worker.stop()
+    await leaderboard_worker.stop()
+    await snapshot_results()
+    await persist_leaderboards()
+    if link_checker is not None:
+        await link_checker.client.aclose()
@@ -0,0 +1,301 @@
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+
+from pymongo import DESCENDING
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("mongo", "memory")
+
+# Read-mostly collections the in-memory engine can serve, with the fields
+# it keeps hash indexes on for equality and `$in` filters
+MEMORY_INDEX_FIELDS = {
+    "constituencies": ("constituency_id", "name", "district"),
+    "candidates": ("candidate_id", "constituency", "party"),
+    "manifestos": ("promise_id", "party", "category"),
+}
+# Collections whose fingerprint is tracked even while Mongo serves them, so
+# responses built from them can be cached until they change
+FINGERPRINTED = (*MEMORY_INDEX_FIELDS, "fact_checks")
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str, options: str):
+    flags = 0
+    if "i" in options:
+        flags |= re.IGNORECASE
+    if "m" in options:
+        flags |= re.MULTILINE
+    if "s" in options:
+        flags |= re.DOTALL
+    if "x" in options:
+        flags |= re.VERBOSE
+    return re.compile(pattern, flags)
+
+
+_MISSING = object()
+
+
+def _resolve(document, path: str):
+    value = document
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _equals(value, expected) -> bool:
+    # A scalar filter matches an array field when any element matches, as in Mongo
+    if isinstance(value, list) and not isinstance(expected, list):
+        return expected in value
+    return value == expected
+
+
+def _compare(value, op, operand) -> bool:
+    values = value if isinstance(value, list) else [value]
+    for item in values:
+        try:
+            if (op == "$gt" and item > operand) or (op == "$gte" and item >= operand) \
+                    or (op == "$lt" and item < operand) or (op == "$lte" and item <= operand):
+                return True
+        except TypeError:
+            continue
+    return False
+
+
+def _match_condition(value, condition) -> bool:
+    if not (isinstance(condition, dict) and condition and all(key.startswith("$") for key in condition)):
+        if value is _MISSING:
+            return condition is None  # {field: None} also matches a missing field
+        return _equals(value, condition)
+    for op, operand in condition.items():
+        if op == "$options":
+            continue
+        if op == "$eq":
+            ok = value is not _MISSING and _equals(value, operand)
+        elif op == "$ne":
+            ok = value is _MISSING or not _equals(value, operand)
+        elif op == "$in":
+            ok = value is not _MISSING and any(_equals(value, item) for item in operand)
+        elif op == "$nin":
+            ok = value is _MISSING or not any(_equals(value, item) for item in operand)
+        elif op == "$all":
+            ok = isinstance(value, list) and all(item in value for item in operand)
+        elif op == "$exists":
+            ok = (value is not _MISSING) == bool(operand)
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            ok = value is not _MISSING and value is not None and _compare(value, op, operand)
+        elif op == "$regex":
+            pattern = _compile(operand, condition.get("$options", ""))
+            values = value if isinstance(value, list) else [value]
+            ok = any(isinstance(item, str) and pattern.search(item) for item in values)
+        else:
+            raise ValueError(f"Unsupported query operator {op!r}")
+        if not ok:
+            return False
+    return True
+
+
+def matches(document: dict, query: dict) -> bool:
+    """Whether `document` satisfies a Mongo filter (the subset the API uses)"""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, clause) for clause in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(document, clause) for clause in condition):
+                return False
+        elif key.startswith("$"):
+            raise ValueError(f"Unsupported query operator {key!r}")
+        elif not _match_condition(_resolve(document, key), condition):
+            return False
+    return True
+
+
+def _project(document: dict, projection):
+    if not projection:
+        return dict(document)
+    included = [field for field, flag in projection.items() if flag and field != "_id"]
+    if included:
+        return {field: document[field] for field in included if field in document}
+    excluded = {field for field, flag in projection.items() if not flag}
+    return {field: value for field, value in document.items() if field not in excluded}
+
+
+class MemoryCollection:
+    """Read-only copy of a collection held in memory, answering `find` like pymongo.
+
+    Documents are kept in natural order with hash indexes on `index_fields`.
+    A top-level equality or `$in` filter on an indexed field narrows the scan
+    to the matching positions; everything else is a linear scan.
+    """
+
+    def __init__(self, name: str, index_fields=()):
+        self.name = name
+        self.index_fields = tuple(index_fields)
+        self.loaded = False
+        self.fingerprint = None
+        self._data = ([], {})
+
+    def load(self, documents, fingerprint=None):
+        documents = [{key: value for key, value in document.items() if key != "_id"} for document in documents]
+        indexes = {field: {} for field in self.index_fields}
+        for position, document in enumerate(documents):
+            for field, index in indexes.items():
+                value = document.get(field)
+                for key in (value if isinstance(value, list) else [value]):
+                    try:
+                        positions = index.setdefault(key, [])
+                    except TypeError:  # unhashable values are only found by scanning
+                        continue
+                    if not positions or positions[-1] != position:
+                        positions.append(position)
+        # Swapped in as one tuple so concurrent readers see the old or the new copy, never a mix
+        self._data = (documents, indexes)
+        self.fingerprint = fingerprint
+        self.loaded = True
+
+    def _candidates(self, query):
+        documents, indexes = self._data
+        positions = None
+        for field, condition in query.items():
+            index = indexes.get(field)
+            if index is None:
+                continue
+            if isinstance(condition, dict):
+                if set(condition) != {"$in"}:
+                    continue
+                values = [value for value in condition["$in"] if not isinstance(value, (list, dict))]
+                if len(values) != len(condition["$in"]):
+                    continue
+                found = sorted({position for value in values for position in index.get(value, ())})
+            elif isinstance(condition, list) or condition is None:
+                continue
+            else:
+                found = index.get(condition, ())
+            if positions is None or len(found) < len(positions):
+                positions = found
+        if positions is None:
+            return documents
+        return [documents[position] for position in positions]
+
+    def find(self, filter=None, projection=None):
+        query = filter or {}
+        return [_project(document, projection) for document in self._candidates(query) if matches(document, query)]
+
+    def find_one(self, filter=None, projection=None):
+        query = filter or {}
+        for document in self._candidates(query):
+            if matches(document, query):
+                return _project(document, projection)
+        return None
+
+    def count_documents(self, filter=None):
+        query = filter or {}
+        return sum(1 for document in self._candidates(query) if matches(document, query))
+
+    def estimated_document_count(self):
+        return len(self._data[0])
+
+
+def collection_fingerprint(collection):
+    """Changes whenever a document is added, removed or restamped"""
+    newest = collection.find_one({}, {"_id": 0, "updated_at": 1}, sort=[("updated_at", DESCENDING)])
+    return collection.estimated_document_count(), newest.get("updated_at") if newest else None
+
+
+class Storage:
+    """Chooses, per collection, whether reads go to Mongo or to an in-memory copy.
+
+    Memory-engine collections are loaded from the primary by `refresh()`,
+    which the app runs at warm-up and then periodically; a copy is reloaded
+    only when its fingerprint changed. Until a copy is loaded, reads fall
+    through to Mongo. Writes always go to Mongo through `db`.
+
+    Collections Mongo serves get a fingerprint too, refreshed by
+    `refresh_fingerprints()` from the same read route as their queries.
+    """
+
+    def __init__(self, reads, engines: dict):
+        self.reads = reads
+        self._engines = {}
+        self._memory = {}
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+        for name, engine in engines.items():
+            if engine not in ENGINES:
+                raise ValueError(f"Unknown storage engine {engine!r} for {name}")
+            if engine == "memory":
+                if name not in MEMORY_INDEX_FIELDS:
+                    raise ValueError(f"{name} cannot use the memory engine")
+                self._memory[name] = MemoryCollection(name, MEMORY_INDEX_FIELDS[name])
+            self._engines[name] = engine
+
+    def collection(self, name: str, route_class: str = None):
+        """Where to read `name` from; `route_class` picks the Mongo read preference"""
+        memory = self._memory.get(name)
+        if memory is not None and memory.loaded:
+            return memory
+        return self.reads.db(route_class or name)[name]
+
+    def fingerprint(self, name: str):
+        """Fingerprint of what `collection()` currently serves, or None when not known yet"""
+        memory = self._memory.get(name)
+        if memory is not None and memory.loaded:
+            return memory.fingerprint
+        return self._fingerprints.get(name)
+
+    def refresh_fingerprints(self, name: str = None):
+        """Re-read the fingerprints of collections served from Mongo"""
+        names = [name] if name is not None else FINGERPRINTED
+        for collection_name in names:
+            if collection_name in self._memory or collection_name not in FINGERPRINTED:
+                continue
+            self._fingerprints[collection_name] = collection_fingerprint(
+                self.reads.db(collection_name)[collection_name]
+            )
+
+    def engines(self):
+        return {name: self._engines.get(name, "mongo") for name in MEMORY_INDEX_FIELDS}
+
+    def refresh(self, name: str = None):
+        """Reload memory-engine collections whose Mongo contents changed"""
+        if name is not None and name not in self._memory:
+            self.refresh_fingerprints(name)
+            return
+        names = [name] if name is not None else list(self._memory)
+        with self._lock:
+            for collection_name in names:
+                memory = self._memory.get(collection_name)
+                if memory is None:
+                    continue
+                source = self.reads.primary[collection_name]
+                fingerprint = collection_fingerprint(source)
+                if memory.loaded and fingerprint == memory.fingerprint:
+                    continue
+                memory.load(source.find({}, {"_id": 0}), fingerprint)
+                logger.info("Loaded %d %s into memory", memory.estimated_document_count(), collection_name)
+
+    def stats(self):
+        return {
+            name: {
+                "engine": engine,
+                "loaded": name in self._memory and self._memory[name].loaded,
+                "documents": self._memory[name].estimated_document_count() if name in self._memory else None,
+            }
+            for name, engine in self.engines().items()
+        }
+
+    @classmethod
+    def from_env(cls, reads, environ=os.environ):
+        """Build from STORAGE_ENGINE and STORAGE_ENGINE_<COLLECTION> ("mongo" or "memory")"""
+        default_engine = environ.get('STORAGE_ENGINE', 'mongo')
+        engines = {
+            name: environ.get(f'STORAGE_ENGINE_{name.upper()}', default_engine)
+            for name in MEMORY_INDEX_FIELDS
+        }
+        return cls(reads, engines)
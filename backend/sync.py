@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+# Writes stamp `updated_at` before they reach Mongo, so a write that started just
+# before a sync token was issued can become visible just after it. Re-send that
+# window on the next sync; clients upsert by id so duplicates are harmless.
+SYNC_SKEW = timedelta(seconds=5)
+
+# Collections whose documents carry `updated_at` and which fields to backfill it from
+SYNCED_COLLECTIONS = {
+    "constituencies": None,
+    "candidates": None,
+    "manifestos": None,
+    "fact_checks": "date_added",
+    "community_posts": "created_at",
+}
+
+
+def stamp(documents, now: Optional[datetime] = None):
+    """Set `updated_at` on documents about to be inserted"""
+    now = now or datetime.now()
+    for document in documents:
+        document["updated_at"] = now
+    return documents
+
+
+def normalize_since(since: datetime) -> datetime:
+    """Convert a client supplied timestamp to the naive local time we store"""
+    if since.tzinfo is not None:
+        since = since.astimezone().replace(tzinfo=None)
+    return since
+
+
+def delta_query(query: dict, since: datetime) -> dict:
+    return {**query, "updated_at": {"$gt": normalize_since(since) - SYNC_SKEW}}
+
+
+def deleted_since(db, collection: str, since: datetime):
+    cursor = db.tombstones.find(
+        {"collection": collection, "deleted_at": {"$gt": normalize_since(since) - SYNC_SKEW}},
+        {"_id": 0, "doc_id": 1},
+    )
+    return [tombstone["doc_id"] for tombstone in cursor]
+
+
+def record_tombstone(db, collection: str, doc_id: str):
+    db.tombstones.insert_one({"collection": collection, "doc_id": doc_id, "deleted_at": datetime.now()})
+
+
+def sync_response(items, deleted, issued_at: datetime):
+    return {"items": items, "deleted": deleted, "sync_token": issued_at.isoformat()}
+
+
+def last_modified(db, collection: str, query: dict) -> Optional[datetime]:
+    """Newest change to the documents matched by `query`, including deletes"""
+    newest = db[collection].find_one(query, {"_id": 0, "updated_at": 1}, sort=[("updated_at", -1)])
+    tombstone = db.tombstones.find_one(
+        {"collection": collection}, {"_id": 0, "deleted_at": 1}, sort=[("deleted_at", -1)]
+    )
+    candidates = [
+        value for value in (
+            newest and newest.get("updated_at"),
+            tombstone and tombstone.get("deleted_at"),
+        ) if value is not None
+    ]
+    return max(candidates) if candidates else None
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified_since(header: Optional[str], modified: Optional[datetime]) -> bool:
+    """True when an If-Modified-Since header shows the client copy is current"""
+    if not header or modified is None:
+        return False
+    try:
+        client_time = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if client_time.tzinfo is None:
+        client_time = client_time.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second resolution
+    return modified.astimezone(timezone.utc).replace(microsecond=0) <= client_time
+
+
+def ensure_sync_indexes(db):
+    for collection, source_field in SYNCED_COLLECTIONS.items():
+        missing = {"updated_at": {"$exists": False}}
+        if source_field:
+            db[collection].update_many(missing, [{"$set": {"updated_at": f"${source_field}"}}])
+        else:
+            db[collection].update_many(missing, {"$set": {"updated_at": datetime.now()}})
+        db[collection].create_index([("updated_at", -1)])
+    db.fact_checks.create_index([("constituency", 1), ("updated_at", -1)])
+    db.community_posts.create_index([("constituency", 1), ("updated_at", -1)])
+    db.tombstones.create_index([("collection", 1), ("deleted_at", -1)])
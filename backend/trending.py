@@ -0,0 +1,135 @@
+import hashlib
+import re
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_TOKEN_PATTERN = re.compile(r"[\w\u0B80-\u0BFF]+")
+
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be been before but by can could did do does
+for from had has have he her here him his how i if in into is it its just me more most my no
+not now of on one only or our out over she so some than that the their them then there these
+they this those to too up us very was we were what when where which who why will with would
+you your yours get got please still need needs think really
+""".split())
+
+# Key for the statewide counters kept alongside the per-constituency ones
+STATEWIDE = ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens without stopwords, numbers or very short words"""
+    return [
+        token for token in (match.lower() for match in _TOKEN_PATTERN.findall(text))
+        if len(token) >= 3 and token not in STOPWORDS and not token.isdigit()
+    ]
+
+
+class CountMinSketch:
+    """Fixed-size frequency estimator; estimates never undercount"""
+
+    def __init__(self, width: int = 512, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self._rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+
+    def _columns(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[4 * row:4 * row + 4], "little") % self.width for row in range(self.depth)]
+
+    def add(self, item: str, count: int = 1) -> int:
+        estimate = None
+        for row, column in zip(self._rows, self._columns(item)):
+            row[column] += count
+            estimate = row[column] if estimate is None else min(estimate, row[column])
+        return estimate
+
+    def estimate(self, item: str) -> int:
+        return min(row[column] for row, column in zip(self._rows, self._columns(item)))
+
+
+class HeavyHitters:
+    """Count-Min Sketch plus the current top-k terms by estimated count"""
+
+    def __init__(self, k: int, width: int, depth: int):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.top: Dict[str, int] = {}
+
+    def add(self, term: str):
+        estimate = self.sketch.add(term)
+        if term in self.top or len(self.top) < self.k:
+            self.top[term] = estimate
+            return
+        weakest = min(self.top, key=self.top.get)
+        if estimate > self.top[weakest]:
+            del self.top[weakest]
+            self.top[term] = estimate
+
+
+class TrendingTerms:
+    """Per-constituency, per-time-bucket heavy hitters over community post text.
+
+    Memory is bounded by (constituencies + 1) x `buckets` sketches of
+    `width` x `depth` counters each; older buckets are dropped as time moves on.
+    Updated and read only from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, bucket_seconds: int = 3600, buckets: int = 24, k: int = 50,
+                 width: int = 512, depth: int = 4):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self._counters: Dict[Tuple[str, int], HeavyHitters] = {}
+        self.posts_seen = 0
+
+    def _bucket(self, moment: datetime) -> int:
+        return int(moment.timestamp()) // self.bucket_seconds
+
+    def _counter(self, constituency: str, bucket: int) -> HeavyHitters:
+        key = (constituency, bucket)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = HeavyHitters(self.k, self.width, self.depth)
+        return counter
+
+    def record(self, posts: Iterable[dict], now: Optional[datetime] = None):
+        oldest = self._bucket(now or datetime.now()) - self.buckets + 1
+        for post in posts:
+            bucket = self._bucket(post["created_at"])
+            if bucket < oldest:
+                continue
+            terms = set(tokenize(f"{post.get('title', '')} {post.get('content', '')}"))
+            for constituency in (post["constituency"], STATEWIDE):
+                counter = self._counter(constituency, bucket)
+                for term in terms:
+                    counter.add(term)
+            self.posts_seen += 1
+        self._expire(oldest)
+
+    def _expire(self, oldest_bucket: int):
+        for key in [key for key in self._counters if key[1] < oldest_bucket]:
+            del self._counters[key]
+
+    def trending(self, constituency: Optional[str], hours: int, limit: int, now: Optional[datetime] = None):
+        """Top terms over the last `hours` worth of buckets, counted in posts mentioning them"""
+        key = constituency or STATEWIDE
+        current = self._bucket(now or datetime.now())
+        window = max(1, min(self.buckets, -(-hours * 3600 // self.bucket_seconds)))
+        counters = [
+            self._counters[(key, bucket)]
+            for bucket in range(current - window + 1, current + 1)
+            if (key, bucket) in self._counters
+        ]
+        candidates = set()
+        for counter in counters:
+            candidates.update(counter.top)
+        scored = [
+            (sum(counter.sketch.estimate(term) for counter in counters), term)
+            for term in candidates
+        ]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [{"term": term, "count": count} for count, term in scored[:limit]]
@@ -7,6 +7,7 @@ Tests all backend endpoints for the Tamil Nadu election awareness app
 import requests
 import json
 import sys
+import time
 from datetime import datetime
 
 # Backend URL from frontend/.env
@@ -206,26 +207,43 @@ class BackendTester:
     def test_community_posts_create(self):
         """Test POST /api/community-posts"""
         try:
-            # Create a test post using query parameters
-            params = {
+            # Create a test post with a JSON body
+            payload = {
                 "constituency": "Chennai Central",
                 "title": "Test Community Post",
                 "content": "This is a test post to verify the API is working correctly."
             }
             
-            response = requests.post(f"{API_BASE}/community-posts", params=params, timeout=10)
-            if response.status_code == 200:
+            response = requests.post(f"{API_BASE}/community-posts", json=payload, timeout=10)
+            if response.status_code == 202:
                 data = response.json()
                 if "message" in data and "post_id" in data:
-                    self.log_test("POST /api/community-posts", True, f"Post created with ID: {data['post_id']}")
-                    return data["post_id"]  # Return post_id for voting test
+                    self.log_test("POST /api/community-posts", True, f"Post queued with ID: {data['post_id']}")
+                    if self.wait_for_post(data["post_id"]):
+                        return data["post_id"]  # Return post_id for voting test
                 else:
                     self.log_test("POST /api/community-posts", False, f"Invalid response format: {data}")
             else:
                 self.log_test("POST /api/community-posts", False, f"Status code: {response.status_code}")
+
+            invalid_response = requests.post(f"{API_BASE}/community-posts", json={**payload, "title": ""}, timeout=10)
+            self.log_test("POST /api/community-posts (validation)", invalid_response.status_code == 422,
+                          f"Status code: {invalid_response.status_code}")
         except Exception as e:
             self.log_test("POST /api/community-posts", False, f"Error: {str(e)}")
         return None
+
+    def wait_for_post(self, post_id, attempts=10):
+        """Poll GET /api/community-posts/{post_id}/status until the post leaves the queue"""
+        for _ in range(attempts):
+            response = requests.get(f"{API_BASE}/community-posts/{post_id}/status", timeout=10)
+            status = response.json().get("status") if response.status_code == 200 else None
+            if status != "pending":
+                self.log_test("GET /api/community-posts/{post_id}/status", status == "published", f"Status: {status}")
+                return status == "published"
+            time.sleep(0.5)
+        self.log_test("GET /api/community-posts/{post_id}/status", False, "Post still pending")
+        return False
     
     def test_community_posts_vote(self, post_id=None):
         """Test POST /api/community-posts/{post_id}/vote"""
@@ -310,6 +328,286 @@ class BackendTester:
         except Exception as e:
             self.log_test("GET /api/search/manifestos", False, f"Error: {str(e)}")
     
+    def test_scorecards(self):
+        """Test GET /api/scorecards and /api/scorecards/history"""
+        try:
+            response = requests.get(f"{API_BASE}/scorecards", timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                if all(key in data for key in ["generated_at", "by_party", "by_category"]):
+                    self.log_test("GET /api/scorecards", True, f"Scorecards for {len(data['by_party'])} parties")
+                else:
+                    self.log_test("GET /api/scorecards", False, f"Invalid response format: {list(data)}")
+            elif response.status_code == 503:
+                self.log_test("GET /api/scorecards", True, "Scorecards not computed yet (expected on a fresh database)")
+            else:
+                self.log_test("GET /api/scorecards", False, f"Status code: {response.status_code}")
+
+            history_response = requests.get(f"{API_BASE}/scorecards/history?limit=5", timeout=10)
+            if history_response.status_code == 200 and isinstance(history_response.json(), list):
+                self.log_test("GET /api/scorecards/history", True, f"Returned {len(history_response.json())} snapshots")
+            else:
+                self.log_test("GET /api/scorecards/history", False, f"Status code: {history_response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/scorecards", False, f"Error: {str(e)}")
+    
+    def test_delta_sync(self):
+        """Test since= delta sync and conditional GET on list routes"""
+        for route in ["fact-checks", "community-posts"]:
+            try:
+                response = requests.get(f"{API_BASE}/{route}", timeout=10)
+                if response.status_code != 200:
+                    self.log_test(f"GET /api/{route} (since)", False, f"Status code: {response.status_code}")
+                    continue
+
+                sync_response = requests.get(f"{API_BASE}/{route}", params={"since": datetime.now().isoformat()}, timeout=10)
+                data = sync_response.json()
+                if sync_response.status_code == 200 and all(key in data for key in ["items", "deleted", "sync_token"]):
+                    self.log_test(f"GET /api/{route} (since)", True, f"Delta returned {len(data['items'])} changes")
+                else:
+                    self.log_test(f"GET /api/{route} (since)", False, f"Invalid response format: {data}")
+
+                last_modified = response.headers.get("Last-Modified")
+                if last_modified:
+                    conditional = requests.get(f"{API_BASE}/{route}", headers={"If-Modified-Since": last_modified}, timeout=10)
+                    self.log_test(f"GET /api/{route} (If-Modified-Since)", conditional.status_code == 304,
+                                  f"Status code: {conditional.status_code}")
+            except Exception as e:
+                self.log_test(f"GET /api/{route} (since)", False, f"Error: {str(e)}")
+    
+    def test_dataset_snapshot(self):
+        """Test GET /api/snapshot manifest, blob download and range requests"""
+        try:
+            response = requests.get(f"{API_BASE}/snapshot", timeout=10)
+            if response.status_code != 200:
+                self.log_test("GET /api/snapshot", False, f"Status code: {response.status_code}")
+                return
+            manifest = response.json()
+            if not manifest.get("latest"):
+                self.log_test("GET /api/snapshot", True, "No snapshot built yet (expected on a fresh server)")
+                return
+            self.log_test("GET /api/snapshot", True, f"{len(manifest['versions'])} versions available")
+
+            version = manifest["latest"]
+            blob_response = requests.get(f"{API_BASE}/snapshot/{version}", timeout=30)
+            etag = blob_response.headers.get("ETag")
+            if blob_response.status_code == 200 and etag:
+                self.log_test("GET /api/snapshot/{version}", True, f"Downloaded {len(blob_response.content)} bytes")
+            else:
+                self.log_test("GET /api/snapshot/{version}", False, f"Status code: {blob_response.status_code}")
+
+            range_response = requests.get(f"{API_BASE}/snapshot/{version}", headers={"Range": "bytes=0-99"}, timeout=10)
+            self.log_test("GET /api/snapshot/{version} (range)", range_response.status_code == 206 and len(range_response.content) <= 100,
+                          f"Status code: {range_response.status_code}")
+
+            cached_response = requests.get(f"{API_BASE}/snapshot/{version}", headers={"If-None-Match": etag or ""}, timeout=10)
+            self.log_test("GET /api/snapshot/{version} (If-None-Match)", cached_response.status_code == 304,
+                          f"Status code: {cached_response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/snapshot", False, f"Error: {str(e)}")
+    
+    def test_exports(self):
+        """Test streaming CSV exports"""
+        for route, header in [("candidates", "candidate_id"), ("fact-checks", "fact_id")]:
+            try:
+                response = requests.get(f"{API_BASE}/export/{route}", stream=True, timeout=30)
+                if response.status_code == 200:
+                    first_line = next(response.iter_lines(decode_unicode=True), "")
+                    if first_line.startswith(header):
+                        self.log_test(f"GET /api/export/{route}", True, f"CSV header: {first_line}")
+                    else:
+                        self.log_test(f"GET /api/export/{route}", False, f"Unexpected header: {first_line}")
+                else:
+                    self.log_test(f"GET /api/export/{route}", False, f"Status code: {response.status_code}")
+                response.close()
+            except Exception as e:
+                self.log_test(f"GET /api/export/{route}", False, f"Error: {str(e)}")
+    
+    def test_post_queue_metrics(self):
+        """Test GET /api/metrics/post-queue"""
+        try:
+            response = requests.get(f"{API_BASE}/metrics/post-queue", timeout=10)
+            data = response.json() if response.status_code == 200 else {}
+            if all(key in data for key in ["depth", "capacity", "published", "rejected"]):
+                self.log_test("GET /api/metrics/post-queue", True, f"Depth {data['depth']}/{data['capacity']}")
+            else:
+                self.log_test("GET /api/metrics/post-queue", False, f"Status code: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/metrics/post-queue", False, f"Error: {str(e)}")
+    
+    def test_candidate_compare(self):
+        """Test GET /api/candidates/compare"""
+        try:
+            response = requests.get(f"{API_BASE}/candidates/compare",
+                                    params={"constituency": "Chennai Central", "sort_by": "net_worth"}, timeout=10)
+            if response.status_code == 200:
+                candidates = response.json().get("candidates", [])
+                net_worths = [candidate["net_worth"] for candidate in candidates]
+                if net_worths == sorted(net_worths, reverse=True) and all("state_percentiles" in c for c in candidates):
+                    self.log_test("GET /api/candidates/compare", True, f"Ranked {len(candidates)} candidates")
+                else:
+                    self.log_test("GET /api/candidates/compare", False, "Candidates not ranked by net worth")
+            else:
+                self.log_test("GET /api/candidates/compare", False, f"Status code: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/candidates/compare", False, f"Error: {str(e)}")
+    
+    def test_fact_check_facets(self):
+        """Test tag filtering and GET /api/fact-checks/facets"""
+        try:
+            response = requests.get(f"{API_BASE}/fact-checks/facets", timeout=10)
+            if response.status_code != 200:
+                self.log_test("GET /api/fact-checks/facets", False, f"Status code: {response.status_code}")
+                return
+            facets = response.json()
+            if not all(key in facets for key in ["total", "verdicts", "tags"]):
+                self.log_test("GET /api/fact-checks/facets", False, f"Invalid response format: {facets}")
+                return
+            self.log_test("GET /api/fact-checks/facets", True, f"{len(facets['tags'])} tags over {facets['total']} fact-checks")
+
+            if facets["tags"]:
+                top_tag = facets["tags"][0]
+                tagged = requests.get(f"{API_BASE}/fact-checks", params={"tags": top_tag["tag"]}, timeout=10).json()
+                if len(tagged) == top_tag["count"] and all(top_tag["tag"] in fc["tags"] for fc in tagged):
+                    self.log_test("GET /api/fact-checks (tags filter)", True, f"{len(tagged)} tagged '{top_tag['tag']}'")
+                else:
+                    self.log_test("GET /api/fact-checks (tags filter)", False, "Tag filter does not match facet count")
+        except Exception as e:
+            self.log_test("GET /api/fact-checks/facets", False, f"Error: {str(e)}")
+    
+    def test_server_timing(self):
+        """Test that API responses carry Server-Timing phase durations"""
+        try:
+            response = requests.get(f"{API_BASE}/constituencies", timeout=10)
+            timing = response.headers.get("Server-Timing", "")
+            if all(f"{phase};dur=" in timing for phase in ["db", "serialize", "total"]):
+                self.log_test("Server-Timing header", True, timing)
+            else:
+                self.log_test("Server-Timing header", False, f"Header: {timing!r}")
+        except Exception as e:
+            self.log_test("Server-Timing header", False, f"Error: {str(e)}")
+    
+    def test_single_flight(self):
+        """Test that concurrent identical reads are coalesced"""
+        from concurrent.futures import ThreadPoolExecutor
+        try:
+            before = requests.get(f"{API_BASE}/metrics/single-flight", timeout=10).json()
+            url = f"{API_BASE}/candidates?constituency=Chennai%20Central"
+            with ThreadPoolExecutor(max_workers=20) as pool:
+                responses = list(pool.map(lambda _: requests.get(url, timeout=10), range(40)))
+            bodies = {response.content for response in responses if response.status_code == 200}
+            after = requests.get(f"{API_BASE}/metrics/single-flight", timeout=10).json()
+            if len(bodies) == 1 and after["leaders"] + after["coalesced"] > before["leaders"] + before["coalesced"]:
+                self.log_test("GET /api/metrics/single-flight", True,
+                              f"{after['coalesced'] - before['coalesced']} of 40 requests coalesced")
+            else:
+                self.log_test("GET /api/metrics/single-flight", False, f"{len(bodies)} distinct bodies, metrics: {after}")
+        except Exception as e:
+            self.log_test("GET /api/metrics/single-flight", False, f"Error: {str(e)}")
+    
+    def test_trending(self):
+        """Test GET /api/trending"""
+        try:
+            for params in [{}, {"constituency": "Chennai Central", "hours": 24}]:
+                response = requests.get(f"{API_BASE}/trending", params=params, timeout=10)
+                if response.status_code == 200 and isinstance(response.json().get("terms"), list):
+                    self.log_test(f"GET /api/trending {params}", True, f"{len(response.json()['terms'])} trending terms")
+                else:
+                    self.log_test(f"GET /api/trending {params}", False, f"Status code: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/trending", False, f"Error: {str(e)}")
+    
+    def test_related_fact_checks(self):
+        """Test GET /api/fact-checks/{fact_id}/related"""
+        try:
+            fact_checks = requests.get(f"{API_BASE}/fact-checks", timeout=10).json()
+            if not fact_checks:
+                self.log_test("GET /api/fact-checks/{id}/related", False, "No fact-checks to look up")
+                return
+            fact_id = fact_checks[0]["fact_id"]
+            response = requests.get(f"{API_BASE}/fact-checks/{fact_id}/related", timeout=10)
+            if response.status_code == 200 and isinstance(response.json().get("related"), list):
+                self.log_test("GET /api/fact-checks/{id}/related", True,
+                              f"{len(response.json()['related'])} related fact-checks")
+            elif response.status_code == 503:
+                self.log_test("GET /api/fact-checks/{id}/related", True, "Index still loading")
+            else:
+                self.log_test("GET /api/fact-checks/{id}/related", False, f"Status code: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/fact-checks/{id}/related", False, f"Error: {str(e)}")
+    
+    def test_results(self):
+        """Test the counting-day results read routes"""
+        try:
+            checks = [
+                ("results/state", 200),
+                ("results/districts/Chennai", 200),
+                ("results/constituencies/Chennai Central", 200),
+                ("results/constituencies/Nowhere", 404),
+            ]
+            for path, expected in checks:
+                response = requests.get(f"{API_BASE}/{path}", timeout=10)
+                self.log_test(f"GET /api/{path}", response.status_code == expected,
+                              f"Status code: {response.status_code}")
+            response = requests.post(f"{API_BASE}/results/rounds", json=[], timeout=10)
+            self.log_test("POST /api/results/rounds without token", response.status_code in (401, 403),
+                          f"Status code: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/results", False, f"Error: {str(e)}")
+    
+    def test_leaderboards(self):
+        """Test the statewide constituency and post leaderboards"""
+        try:
+            for board, key in [("constituencies", "constituencies"), ("posts", "posts")]:
+                for window in ["all", "hour", "day", "week"]:
+                    response = requests.get(f"{API_BASE}/leaderboards/{board}", params={"window": window, "limit": 5}, timeout=10)
+                    ok = response.status_code == 200 and isinstance(response.json().get(key), list)
+                    self.log_test(f"GET /api/leaderboards/{board}?window={window}", ok,
+                                  f"Status code: {response.status_code}")
+            response = requests.get(f"{API_BASE}/leaderboards/posts", params={"window": "month"}, timeout=10)
+            self.log_test("GET /api/leaderboards/posts?window=month", response.status_code == 422,
+                          f"Status code: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/leaderboards", False, f"Error: {str(e)}")
+    
+    def test_locales(self):
+        """Test lang= / Accept-Language negotiation on the listings"""
+        try:
+            response = requests.get(f"{API_BASE}/constituencies", params={"sort": "true"},
+                                    headers={"Accept-Language": "ta-IN,ta;q=0.9,en;q=0.8"}, timeout=10)
+            self.log_test("GET /api/constituencies (Accept-Language: ta)",
+                          response.status_code == 200 and response.headers.get("Content-Language") == "ta",
+                          f"Status code: {response.status_code}, Content-Language: {response.headers.get('Content-Language')}")
+            response = requests.get(f"{API_BASE}/manifestos", params={"lang": "en"},
+                                    headers={"Accept-Language": "ta"}, timeout=10)
+            self.log_test("GET /api/manifestos?lang=en", response.headers.get("Content-Language") == "en",
+                          f"Content-Language: {response.headers.get('Content-Language')}")
+            response = requests.get(f"{API_BASE}/manifestos", params={"lang": "fr"}, timeout=10)
+            self.log_test("GET /api/manifestos?lang=fr", response.status_code == 422,
+                          f"Status code: {response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/constituencies (locales)", False, f"Error: {str(e)}")
+    
+    def test_explanation_bundles(self):
+        """Test GET /api/bundles and immutable bundle downloads"""
+        try:
+            response = requests.get(f"{API_BASE}/bundles", timeout=10)
+            if response.status_code != 200:
+                self.log_test("GET /api/bundles", False, f"Status code: {response.status_code}")
+                return
+            index = response.json()
+            self.log_test("GET /api/bundles", True, f"{len(index['parties'])} party bundles")
+            for party, entry in list(index["parties"].items())[:1]:
+                bundle_response = requests.get(f"{BACKEND_URL}{entry['url']}", timeout=10)
+                bundle = bundle_response.json() if bundle_response.status_code == 200 else {}
+                cache_control = bundle_response.headers.get("Cache-Control", "")
+                if len(bundle.get("promises", [])) == entry["promises"] and "immutable" in cache_control:
+                    self.log_test("GET /api/bundles/{hash}", True, f"{party}: {entry['promises']} explanations")
+                else:
+                    self.log_test("GET /api/bundles/{hash}", False, f"Status code: {bundle_response.status_code}")
+        except Exception as e:
+            self.log_test("GET /api/bundles", False, f"Error: {str(e)}")
+    
     def run_all_tests(self):
         """Run all backend tests"""
         print("=" * 60)
@@ -322,16 +620,31 @@ class BackendTester:
         self.test_root_endpoint()
         self.test_constituencies_endpoint()
         self.test_candidates_endpoint()
+        self.test_candidate_compare()
         self.test_manifestos_endpoint()
+        self.test_explanation_bundles()
         self.test_fact_checks_endpoint()
+        self.test_fact_check_facets()
+        self.test_related_fact_checks()
         self.test_community_posts_get()
         
         # Create a post and test voting
         post_id = self.test_community_posts_create()
         self.test_community_posts_vote(post_id)
+        self.test_post_queue_metrics()
+        self.test_trending()
         
         self.test_search_candidates()
         self.test_search_manifestos()
+        self.test_scorecards()
+        self.test_delta_sync()
+        self.test_dataset_snapshot()
+        self.test_exports()
+        self.test_server_timing()
+        self.test_single_flight()
+        self.test_results()
+        self.test_locales()
+        self.test_leaderboards()
         
         # Print summary
         print()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time from a fresh interpreter importing the app to its
+first response, called through ASGI directly (no server, no sockets).
+
+Each run is a new process, so module imports, data files and the Mongo
+client all start cold. Routes that need Mongo (e.g. /api/constituencies)
+require MONGO_URL to point at a running server.
+
+Usage: python benchmarks/bench_cold_start.py [path] [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+# Runs inside the child process; prints one JSON line of timings in ms
+CHILD = r"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+import server
+imported = time.perf_counter()
+
+async def main(path):
+    lifespan = asyncio.Queue()
+    await lifespan.put({"type": "lifespan.startup"})
+    ready = asyncio.Event()
+
+    async def lifespan_send(message):
+        if message["type"] == "lifespan.startup.complete":
+            ready.set()
+
+    lifespan_task = asyncio.create_task(
+        server.app({"type": "lifespan", "asgi": {"version": "3.0"}}, lifespan.get, lifespan_send)
+    )
+    await ready.wait()
+    started_up = time.perf_counter()
+
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    await server.app(scope, receive, send)
+    responded = time.perf_counter()
+    print(json.dumps({
+        "import": (imported - started) * 1000,
+        "startup": (started_up - imported) * 1000,
+        "first_response": (responded - started_up) * 1000,
+        "total": (responded - started) * 1000,
+        "status": status[0],
+    }))
+    await lifespan.put({"type": "lifespan.shutdown"})
+    await asyncio.wait_for(lifespan_task, timeout=10)
+
+asyncio.run(main(sys.argv[1]))
+"""
+
+
+def run_once(path):
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, path],
+        cwd=BACKEND, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "/"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    run_once(path)  # warm the OS file cache and bytecode
+    results = [run_once(path) for _ in range(runs)]
+    print(f"GET {path} (status {results[0]['status']}), {runs} cold processes")
+    print(f"{'phase':<16} {'median':>10} {'min':>10} {'max':>10}")
+    for phase in ("import", "startup", "first_response", "total"):
+        values = [result[phase] for result in results]
+        print(f"{phase:<16} {statistics.median(values):8.1f}ms {min(values):8.1f}ms {max(values):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: holding 100k candidates as raw Mongo dicts, pydantic models
+and the slotted records the API decodes into.
+
+Usage: python benchmarks/bench_record_memory.py [count]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from records import CandidateRecord, encode_json  # noqa: E402
+from models import Candidate  # noqa: E402
+
+PARTIES = ["DMK", "AIADMK", "BJP", "Congress", "PMK", "NTK"]
+
+
+def make_documents(count):
+    return [
+        {
+            "candidate_id": str(uuid.uuid4()),
+            "name": f"Candidate {index}",
+            "party": PARTIES[index % len(PARTIES)],
+            "constituency": f"Constituency {index % 234}",
+            "age": 30 + index % 40,
+            "education": "M.A. Political Science",
+            "criminal_cases": index % 4,
+            "assets": 1000000.0 + index,
+            "liabilities": 250000.0 + index,
+            "incumbent": index % 5 == 0,
+            "photo_url": None,
+        }
+        for index in range(count)
+    ]
+
+
+def measure(label, build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    items = build()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {current / 1024 / 1024:8.1f} MiB {elapsed * 1000:8.0f} ms to build")
+    return items
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    documents = make_documents(count)
+    print(f"Holding {count} candidates (strings shared with the source documents)")
+    print(f"{'representation':<22} {'memory':>12} {'build time':>15}")
+
+    measure("dict (copy)", lambda: [dict(document) for document in documents])
+    measure("pydantic Candidate", lambda: [Candidate(**document) for document in documents])
+    records = measure("CandidateRecord", lambda: CandidateRecord.decode_many(documents))
+
+    started = time.perf_counter()
+    body = encode_json(records)
+    print(f"Serialized records to {len(body) / 1024 / 1024:.1f} MiB of JSON in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
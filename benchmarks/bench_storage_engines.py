@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Storage engine benchmark: the queries behind the constituency, candidate,
+manifesto and search routes, answered by Mongo and by the in-memory engine,
+including record decoding and JSON encoding as the routes do them.
+
+The Mongo engine runs only when MONGO_URL points at a reachable server; the
+data is written to a throwaway database that is dropped afterwards.
+
+Usage: python benchmarks/bench_storage_engines.py [candidates_per_constituency] [iterations]
+"""
+
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from pymongo import MongoClient  # noqa: E402
+from pymongo.errors import PyMongoError  # noqa: E402
+
+from datasets import constituencies  # noqa: E402
+from records import CandidateRecord, ConstituencyRecord, ManifestoRecord, encode_json  # noqa: E402
+from storage import MEMORY_INDEX_FIELDS, MemoryCollection  # noqa: E402
+
+PARTIES = ["DMK", "AIADMK", "BJP", "Congress", "PMK", "NTK"]
+CATEGORIES = ["Transport", "Education", "Health", "Agriculture", "Employment", "Welfare"]
+
+
+def make_data(per_constituency):
+    candidates = [
+        {
+            "candidate_id": str(uuid.uuid4()),
+            "name": f"Candidate {index} of {constituency['name']}",
+            "party": PARTIES[index % len(PARTIES)],
+            "constituency": constituency["name"],
+            "age": 30 + index,
+            "education": "M.A. Political Science",
+            "criminal_cases": index % 3,
+            "assets": 1000000.0 * (index + 1),
+            "liabilities": 250000.0,
+            "incumbent": index == 0,
+        }
+        for constituency in constituencies()
+        for index in range(per_constituency)
+    ]
+    manifestos = [
+        {
+            "promise_id": str(uuid.uuid4()),
+            "party": PARTIES[index % len(PARTIES)],
+            "title": f"Promise {index}",
+            "description": f"Improve {CATEGORIES[index % len(CATEGORIES)].lower()} services in every district",
+            "category": CATEGORIES[(index // len(PARTIES)) % len(CATEGORIES)],
+            "fulfilled": index % 3 == 0,
+            "one_minute_explanation": "A short explanation of the promise. " * 4,
+        }
+        for index in range(600)
+    ]
+    return {"constituencies": [dict(c) for c in constituencies()], "candidates": candidates, "manifestos": manifestos}
+
+
+def search(fields, q):
+    return {"$or": [{field: {"$regex": q, "$options": "i"}} for field in fields]}
+
+
+# (label, collection, query, record type) mirroring the routes
+WORKLOADS = [
+    ("GET /api/constituencies", "constituencies", {}, ConstituencyRecord),
+    ("GET /api/candidates?constituency=", "candidates", {"constituency": "Madurai East"}, CandidateRecord),
+    ("GET /api/candidates", "candidates", {}, CandidateRecord),
+    ("GET /api/manifestos?party=&category=", "manifestos", {"party": "DMK", "category": "Health"}, ManifestoRecord),
+    ("GET /api/search/candidates?q=madurai", "candidates", search(["name", "party", "constituency"], "madurai"),
+     CandidateRecord),
+    ("GET /api/search/manifestos?q=health", "manifestos", search(["title", "description", "category"], "health"),
+     ManifestoRecord),
+]
+
+
+def time_workload(collection, query, record, iterations):
+    projection = record.projection()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        encode_json(record.decode_many(collection.find(query, projection)))
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def mongo_database():
+    url = os.environ.get("MONGO_URL")
+    if not url:
+        return None
+    try:
+        client = MongoClient(url, serverSelectionTimeoutMS=2000)
+        client.admin.command("ping")
+    except PyMongoError as error:
+        print(f"Skipping Mongo engine: {error}")
+        return None
+    return client[f"votewise_bench_{uuid.uuid4().hex[:8]}"]
+
+
+def main():
+    per_constituency = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    data = make_data(per_constituency)
+    print(f"{len(data['candidates'])} candidates, {len(data['manifestos'])} promises, {iterations} iterations")
+
+    engines = {}
+    memory = {}
+    for name, documents in data.items():
+        memory[name] = MemoryCollection(name, MEMORY_INDEX_FIELDS[name])
+        memory[name].load(documents)
+    engines["memory"] = memory
+
+    database = mongo_database()
+    if database is not None:
+        for name, documents in data.items():
+            database[name].insert_many([dict(document) for document in documents])
+            for field in MEMORY_INDEX_FIELDS[name]:
+                database[name].create_index(field)
+        engines["mongo"] = {name: database[name] for name in data}
+
+    try:
+        print(f"{'route':<40}" + "".join(f"{engine:>12}" for engine in engines))
+        for label, name, query, record in WORKLOADS:
+            timings = [time_workload(collections[name], query, record, iterations) for collections in engines.values()]
+            print(f"{label:<40}" + "".join(f"{timing:10.3f}ms" for timing in timings))
+    finally:
+        if database is not None:
+            database.client.drop_database(database.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The backend is run from its own directory (`uvicorn server:app`), so its
+# modules import each other as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
@@ -0,0 +1,21 @@
+"""Offline dataset snapshot store tests; no Mongo server needed."""
+
+from datetime import datetime
+
+from dataset_snapshot import Snapshot, SnapshotStore
+
+
+def snapshot(version):
+    return Snapshot(version, datetime.now(), b"", {})
+
+
+def test_data_returning_to_an_older_version_makes_it_latest_again():
+    store = SnapshotStore(keep=2)
+    store.add(snapshot("a"))
+    store.add(snapshot("b"))
+    store.add(snapshot("a"))
+    assert store.latest().version == "a"
+    assert [entry["version"] for entry in store.manifest()["versions"]] == ["a", "b"]
+
+    store.add(snapshot("c"))
+    assert store.get("b") is None and store.get("a") is not None
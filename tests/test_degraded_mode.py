@@ -0,0 +1,111 @@
+"""Degraded-mode middleware tests against a stub ASGI app."""
+
+import asyncio
+
+from pymongo.errors import AutoReconnect, DuplicateKeyError
+
+from degraded import CircuitBreaker, DegradedModeMiddleware, StaleCache
+from profiling import RequestTimings, current_timings
+
+
+class StubApp:
+    """Answers 200 with a call counter, or raises while `error` is set"""
+
+    def __init__(self):
+        self.error = None
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        timings = current_timings.get()
+        if timings is not None:
+            timings.db_calls += 1
+        if self.error is not None:
+            raise self.error
+        body = f"call {self.calls}".encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def request(middleware, method="GET", path="/api/candidates"):
+    scope = {"type": "http", "method": method, "path": path, "query_string": b"", "headers": []}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def run():
+        token = current_timings.set(RequestTimings())
+        try:
+            await middleware(scope, receive, send)
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+        finally:
+            current_timings.reset(token)
+
+    asyncio.run(run())
+    start = messages[0]
+    return start["status"], dict(start["headers"]), messages[1]["body"]
+
+
+def make(failures=2, reset_seconds=60.0):
+    app = StubApp()
+    breaker = CircuitBreaker(failures, reset_seconds)
+    middleware = DegradedModeMiddleware(app, ["/api/candidates"], breaker, StaleCache(8), budget_seconds=1.0)
+    return app, breaker, middleware
+
+
+def test_serves_last_good_response_when_mongo_fails():
+    app, breaker, middleware = make()
+    assert request(middleware)[0] == 200
+
+    app.error = AutoReconnect("connection refused")
+    status, headers, body = request(middleware)
+    assert status == 200
+    assert body == b"call 1"
+    assert headers[b"x-degraded-mode"] == b"stale"
+    assert b"age" in headers and b"warning" in headers
+
+
+def test_open_breaker_skips_mongo_and_fails_writes_fast():
+    app, breaker, middleware = make(failures=2)
+    request(middleware)
+    app.error = AutoReconnect("connection refused")
+    request(middleware)
+    request(middleware)
+    assert breaker.state == "open"
+
+    calls = app.calls
+    assert request(middleware)[2] == b"call 1"
+    status, headers, _ = request(middleware, method="POST", path="/api/community-posts")
+    assert status == 503
+    assert int(headers[b"retry-after"]) >= 1
+    assert app.calls == calls
+
+
+def test_probe_revalidates_in_background_and_closes_breaker():
+    app, breaker, middleware = make(failures=1, reset_seconds=0.0)
+    request(middleware)
+    app.error = AutoReconnect("connection refused")
+    request(middleware)
+    assert breaker.state == "open"
+
+    app.error = None
+    status, headers, body = request(middleware)
+    assert body == b"call 1" and headers[b"x-degraded-mode"] == b"stale"
+    assert breaker.state == "closed"
+    assert request(middleware)[2] == b"call 4"
+
+
+def test_request_errors_do_not_trip_the_breaker():
+    app, breaker, middleware = make(failures=1)
+    app.error = DuplicateKeyError("duplicate")
+    for _ in range(3):
+        try:
+            request(middleware, method="POST", path="/api/community-posts")
+        except DuplicateKeyError:
+            pass
+    assert breaker.state == "closed"
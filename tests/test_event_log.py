@@ -0,0 +1,92 @@
+"""Event log writer tests with an in-process sink; no Mongo server needed."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from pymongo import _csot  # the active pymongo.timeout() budget
+
+from event_log import EventLog, partition_name, publication_event, vote_base, vote_event
+
+
+def test_events_are_partitioned_by_day():
+    assert partition_name(datetime(2026, 4, 23, 23, 59)) == "post_events_20260423"
+    assert partition_name(datetime(2026, 4, 24, 0, 0)) == "post_events_20260424"
+
+
+def test_publication_events_have_stable_ids():
+    created_at = datetime(2026, 4, 23, 10, 30, 5)
+    post = {"post_id": "p1", "constituency": "Salem", "created_at": created_at}
+    event = publication_event(post)
+    assert publication_event(dict(post, updated_at=datetime.now())) == event
+    assert publication_event(dict(post, post_id="p2"))["_id"] != event["_id"]
+    assert event["_id"].generation_time.timestamp() == created_at.timestamp()
+    assert partition_name(event["at"]) == "post_events_20260423"
+
+
+def test_vote_base_defaults_missing_counts():
+    assert vote_base({"upvotes": 12}) == {"upvotes": 12, "downvotes": 0}
+
+
+def test_concurrent_appends_share_one_ordered_write():
+    writes = []
+    log = EventLog(write=lambda partition, events: writes.append((partition, list(events))),
+                   batch_size=50, batch_wait_seconds=0.05)
+
+    async def run():
+        log.start()
+        events = [vote_event("p1", "up" if i % 3 else "down") for i in range(20)]
+        await asyncio.gather(*(log.append(event) for event in events))
+        await log.stop()
+        return events
+
+    events = asyncio.run(run())
+    assert len(writes) == 1
+    partition, written = writes[0]
+    assert partition == partition_name(events[0]["at"])
+    assert [event["_id"] for event in written] == [event["_id"] for event in events]
+    assert log.stats()["appended"] == 20 and log.stats()["batches"] == 1
+
+
+def test_event_ids_are_minted_at_write_time_under_the_budget():
+    writes = []
+
+    def write(partition, events):
+        writes.append((_csot.get_timeout(), [event["_id"] for event in events]))
+
+    log = EventLog(write=write, batch_wait_seconds=0.01, write_budget_seconds=2.5)
+
+    async def run():
+        log.start()
+        event = vote_event("p1", "up")
+        event["_id"] = ObjectId.from_datetime(datetime(2020, 1, 1))  # queued long ago
+        await log.append(event)
+        await log.stop()
+
+    asyncio.run(run())
+    (budget, (event_id,)), = writes
+    assert budget == 2.5
+    assert event_id.generation_time.year > 2020
+
+
+def test_failed_write_is_reported_to_every_waiter():
+    def write(partition, events):
+        raise RuntimeError("disk full")
+
+    log = EventLog(write=write, batch_wait_seconds=0.01)
+
+    async def run():
+        log.start()
+        results = await asyncio.gather(*(log.append(vote_event("p1", "up")) for _ in range(3)),
+                                       return_exceptions=True)
+        await log.stop()
+        return results
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+    assert log.stats()["failed"] == 3
+
+
+def test_append_before_start_is_rejected():
+    with pytest.raises(asyncio.QueueFull):
+        asyncio.run(EventLog(write=lambda partition, events: None).append(vote_event("p1", "up")))
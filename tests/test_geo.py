@@ -0,0 +1,83 @@
+"""Constituency lookup by coordinates; no Mongo server needed."""
+
+import json
+
+from geo import ConstituencyLocator, haversine_km, load_locator
+
+
+def square(min_lon, min_lat, max_lon, max_lat):
+    return [[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]]
+
+
+def feature(key, geometry_type, coordinates):
+    return {
+        "type": "Feature",
+        "properties": {"constituency_id": key},
+        "geometry": {"type": geometry_type, "coordinates": coordinates},
+    }
+
+
+def locator(*features):
+    index = ConstituencyLocator()
+    index.load_geojson({"type": "FeatureCollection", "features": list(features)})
+    return index
+
+
+def test_holes_are_left_to_the_enclosed_constituency():
+    index = locator(
+        feature("outer", "Polygon", [square(79.0, 10.0, 79.2, 10.2), square(79.05, 10.05, 79.15, 10.15)]),
+        feature("inner", "Polygon", [square(79.06, 10.06, 79.14, 10.14)]),
+    )
+    assert index.locate(10.02, 79.02) == ("outer", "boundary")
+    assert index.locate(10.1, 79.1) == ("inner", "boundary")
+    # Inside the hole but outside the enclosed constituency
+    assert index.locate(10.055, 79.055) is None
+
+
+def test_multipolygon_parts_all_belong_to_one_constituency():
+    index = locator(feature("islands", "MultiPolygon", [
+        [square(79.8, 9.2, 79.9, 9.3)],
+        [square(80.2, 9.2, 80.3, 9.3)],
+    ]))
+    assert index.areas == 1
+    assert index.locate(9.25, 79.85) == ("islands", "boundary")
+    assert index.locate(9.25, 80.25) == ("islands", "boundary")
+    assert index.locate(9.25, 80.05) is None
+
+
+def test_points_on_grid_cell_edges_are_found():
+    index = locator(
+        feature("west", "Polygon", [square(80.0, 13.0, 80.1, 13.1)]),
+        feature("east", "Polygon", [square(80.1, 13.0, 80.2, 13.1)]),
+    )
+    # 80.05 and 13.05 are multiples of the 0.05 degree cell size
+    assert index.locate(13.05, 80.05) == ("west", "boundary")
+    assert index.locate(13.0500001, 80.15) == ("east", "boundary")
+    assert index.locate(13.1, 80.05) is None
+
+
+def test_nearest_centroid_fallback_stops_at_the_cutoff():
+    index = locator(
+        feature("boundary", "Polygon", [square(78.0, 11.0, 78.1, 11.1)]),
+        feature("near", "Point", [78.5, 11.5]),
+        feature("far", "Point", [79.5, 11.5]),
+    )
+    assert index.locate(11.05, 78.05) == ("boundary", "boundary")
+    assert index.locate(11.6, 78.5) == ("near", "nearest_centroid")  # about 11 km away
+    assert index.locate(11.8, 78.5) is None  # about 33 km from the nearest centroid
+    assert index.locate(11.8, 78.5, max_centroid_km=40) == ("near", "nearest_centroid")
+    assert 24 < haversine_km(11.5, 78.5, 11.725, 78.5) < 26
+
+
+def test_load_locator_reads_a_file_and_tolerates_a_missing_one(tmp_path):
+    missing = load_locator(str(tmp_path / "missing.geojson"))
+    assert not missing.loaded and missing.locate(13.08, 80.27) is None
+
+    path = tmp_path / "constituencies.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": [
+        feature("ac-001", "Polygon", [square(80.2, 13.0, 80.3, 13.1)]),
+        feature("", "Point", [80.0, 13.0]),  # no key, skipped
+    ]}), encoding="utf-8")
+    loaded = load_locator(str(path))
+    assert loaded.loaded and loaded.areas == 1
+    assert loaded.locate(13.08, 80.27) == ("ac-001", "boundary")
@@ -0,0 +1,118 @@
+"""Locale negotiation and localized reads against the in-memory engine; no Mongo server needed."""
+
+import asyncio
+
+from fastapi import Depends, FastAPI
+
+from i18n import LocaleMiddleware, PayloadCache, lang_parameter, localized_find, negotiate, request_locale, search_fields
+from records import ManifestoRecord
+from storage import MemoryCollection
+
+MANIFESTOS = [
+    {"promise_id": "m1", "party": "DMK", "title": "Free bus travel", "description": "For women",
+     "category": "Transport", "one_minute_explanation": "Buses are free.",
+     "translations": {"ta": {"title": "இலவச பேருந்து பயணம்", "description": "பெண்களுக்கு"}}},
+    {"promise_id": "m2", "party": "DMK", "title": "Anna canteens", "description": "Cheap meals",
+     "category": "Welfare", "one_minute_explanation": "Meals for Rs 5."},
+    {"promise_id": "m3", "party": "AIADMK", "title": "Amma clinics", "description": "Free checkups",
+     "category": "Health", "one_minute_explanation": "Clinics in every ward.",
+     "translations": {"ta": {"title": "அம்மா மருத்துவமனைகள்"}}},
+]
+
+
+def manifestos():
+    collection = MemoryCollection("manifestos", ("promise_id", "party", "category"))
+    collection.load(MANIFESTOS)
+    return collection
+
+
+def test_lang_parameter_beats_accept_language_preferences():
+    assert negotiate("ta-IN,ta;q=0.9,en;q=0.8") == "ta"
+    assert negotiate("en;q=0.4, ta;q=0.7") == "ta"
+    assert negotiate("fr, de;q=0.5") == "en"
+    assert negotiate("ta;q=0") == "en"
+    assert negotiate("ta", lang="en") == "en"
+    assert negotiate("", lang="ta-IN") == "ta"
+
+
+def test_translated_fields_replace_stored_text_with_fallback():
+    projection = ManifestoRecord.projection()
+    records = ManifestoRecord.decode_many(localized_find(manifestos(), "manifestos", {"party": "DMK"}, projection, "ta"))
+    assert records[0].title == "இலவச பேருந்து பயணம்" and records[0].description == "பெண்களுக்கு"
+    assert records[0].one_minute_explanation == "Buses are free."
+    assert records[1].title == "Anna canteens"
+    assert ManifestoRecord.decode_many(localized_find(manifestos(), "manifestos", {}, projection, "en"))[0].title == \
+        "Free bus travel"
+
+
+def test_sorted_listing_orders_by_the_locale_text():
+    projection = ManifestoRecord.projection()
+    english = localized_find(manifestos(), "manifestos", {}, projection, "en", sort=True)
+    assert [document["promise_id"] for document in english] == ["m3", "m2", "m1"]
+    # Untranslated first (as Mongo sorts a missing field), then by the Tamil title
+    tamil = localized_find(manifestos(), "manifestos", {}, projection, "ta", sort=True)
+    assert [document["promise_id"] for document in tamil] == ["m2", "m3", "m1"]
+
+
+def test_search_also_matches_translations():
+    collection = manifestos()
+    fields = search_fields("manifestos", ["title", "category"], "ta")
+    assert fields == ["title", "category", "translations.ta.title"]
+    query = {"$or": [{field: {"$regex": "அம்மா", "$options": "i"}} for field in fields]}
+    assert [document["promise_id"] for document in collection.find(query)] == ["m3"]
+
+
+def test_payload_cache_is_invalidated_by_the_fingerprint():
+    cache = PayloadCache(maxsize=2)
+    cache.put(("manifestos", "ta"), (3, None), b"[]")
+    assert cache.get(("manifestos", "ta"), (3, None)) == b"[]"
+    assert cache.get(("manifestos", "ta"), (4, None)) is None
+    assert cache.get(("manifestos", "ta"), None) is None
+    cache.put(("a", "en"), 1, b"a")
+    cache.put(("b", "en"), 1, b"b")
+    assert cache.stats()["entries"] == 2 and cache.get(("manifestos", "ta"), (3, None)) is None
+
+
+def call(middleware, query_string=b"", headers=()):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "query_string": query_string, "headers": list(headers)}
+    asyncio.run(middleware(scope, receive, send))
+    return dict(messages[0]["headers"]), messages[1]["body"]
+
+
+async def respond(send, body):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+def test_only_localizing_routes_are_labelled():
+    async def localized(scope, receive, send):
+        await respond(send, request_locale().encode())
+
+    async def unlocalized(scope, receive, send):
+        await respond(send, b"same in every language")
+
+    headers, body = call(LocaleMiddleware(localized), headers=[(b"accept-language", b"ta-IN")])
+    assert body == b"ta" and headers[b"content-language"] == b"ta" and headers[b"vary"] == b"Accept-Language"
+    headers, _ = call(LocaleMiddleware(unlocalized), query_string=b"lang=ta")
+    assert b"content-language" not in headers and b"vary" not in headers
+    assert request_locale() == "en"  # outside a request
+
+
+def test_unsupported_lang_values_fall_back_instead_of_failing():
+    app = FastAPI(dependencies=[Depends(lang_parameter)])
+
+    @app.get("/")
+    async def root():
+        return request_locale()
+
+    for query_string, expected in [(b"lang=ta-IN", b'"ta"'), (b"lang=TA", b'"ta"'), (b"lang=fr", b'"en"')]:
+        _, body = call(LocaleMiddleware(app), query_string=query_string)
+        assert body == expected
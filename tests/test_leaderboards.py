@@ -0,0 +1,112 @@
+"""Incremental leaderboard tests; no Mongo server needed."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from leaderboards import ALL_TIME, EngagementLeaderboards, Leaderboard, SkipList
+
+
+def test_skiplist_matches_sorted_under_random_inserts_and_removes():
+    rng = random.Random(7)
+    skiplist, expected = SkipList(seed=1), []
+    for _ in range(2000):
+        if expected and rng.random() < 0.4:
+            item = expected.pop(rng.randrange(len(expected)))
+            skiplist.remove(item)
+        else:
+            item = (rng.randint(-50, 50), f"m{rng.randint(0, 500)}")
+            if item in expected:
+                continue
+            skiplist.insert(item)
+            expected.append(item)
+    assert list(skiplist) == sorted(expected) and len(skiplist) == len(expected)
+    with pytest.raises(KeyError):
+        skiplist.remove((999, "missing"))
+
+
+def test_leaderboard_orders_by_score_then_member():
+    board = Leaderboard()
+    for member, delta in [("b", 2), ("a", 2), ("c", 5), ("b", -1), ("d", 1), ("d", -1)]:
+        board.increment(member, delta)
+    assert board.top(10) == [("c", 5), ("a", 2), ("b", 1)]
+    assert board.top(1) == [("c", 5)]
+
+
+def posts_board_votes(boards, window, now):
+    return dict(boards.top("posts", window, 10, now))
+
+
+def test_windows_expire_old_votes():
+    now = datetime.now()
+    boards = EngagementLeaderboards()
+    boards.record_posts([{"post_id": "p1", "constituency": "Chennai Central", "created_at": now - timedelta(days=2)}])
+    boards.record_vote("p1", "Chennai Central", 1, at=now - timedelta(hours=2))
+    boards.record_vote("p1", "Chennai Central", 1, at=now - timedelta(minutes=5))
+    boards.record_vote("p1", "Chennai Central", -1, at=now - timedelta(minutes=1))
+
+    assert posts_board_votes(boards, "hour", now) == {}  # +1 - 1 within the hour
+    assert posts_board_votes(boards, "day", now) == {"p1": 1}
+    assert posts_board_votes(boards, ALL_TIME, now) == {"p1": 1}
+    assert boards.top("constituencies", "week", 10, now) == [("Chennai Central", 4)]
+    assert boards.top("constituencies", "hour", 10, now) == [("Chennai Central", 2)]
+    assert boards.top("constituencies", "hour", 10, now + timedelta(hours=1)) == []
+
+
+def flush(boards, stored):
+    """What save_counts and load_counts do, against a dict standing in for Mongo"""
+    increments, removed = boards.take_pending()
+    for key, delta in increments.items():
+        stored[key] = stored.get(key, 0) + delta
+    for key in [key for key in stored if key[0] == "posts" and key[3] in removed]:
+        del stored[key]
+    boards.load(
+        {"board": name, "window": window, "bucket": bucket, "member": member, "count": count}
+        for (name, window, bucket, member), count in stored.items()
+    )
+
+
+def test_instances_merge_their_counts_through_the_store():
+    stored, first, second = {}, EngagementLeaderboards(), EngagementLeaderboards()
+    first.record_posts([{"post_id": "p1", "constituency": "Madurai East", "created_at": datetime.now()}])
+    first.record_vote("p1", "Madurai East", 1)
+    second.record_vote("p1", "Madurai East", 1)
+    second.record_vote("p2", "Salem", -1)
+
+    flush(first, stored)
+    first.record_vote("p1", "Madurai East", 1)  # not persisted yet, still served
+    flush(second, stored)
+    first.load(
+        {"board": name, "window": window, "bucket": bucket, "member": member, "count": count}
+        for (name, window, bucket, member), count in stored.items()
+    )
+    assert first.top("posts", "hour", 10) == [("p1", 3), ("p2", -1)]
+    assert second.top("posts", "hour", 10) == [("p1", 2), ("p2", -1)]
+    assert first.top("constituencies", ALL_TIME, 10) == [("Madurai East", 4), ("Salem", 1)]
+    assert first.restored
+
+    flush(first, stored)
+    first.remove_post("p1")
+    flush(first, stored)
+    flush(second, stored)
+    assert second.top("posts", ALL_TIME, 10) == [("p2", -1)]
+
+
+def test_failed_flush_is_put_back():
+    boards = EngagementLeaderboards()
+    boards.record_vote("p1", "Salem", 1)
+    increments, removed = boards.take_pending()
+    assert boards.take_pending() == ({}, set())
+    boards.restore_pending(increments, removed)
+    stored = {}
+    flush(boards, stored)
+    assert stored[("posts", ALL_TIME, 0, "p1")] == 1
+    assert boards.top("posts", "day", 10) == [("p1", 1)]
+
+
+def test_removed_posts_leave_every_window():
+    boards = EngagementLeaderboards()
+    boards.record_vote("p1", "Salem", 1)
+    boards.remove_post("p1")
+    assert all(boards.top("posts", window, 10) == [] for window in (ALL_TIME, "hour", "day", "week"))
@@ -0,0 +1,130 @@
+"""Link checker tests against a local stub HTTP server."""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from link_health import LinkChecker, create_client  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    active = 0
+    max_active = 0
+    requests = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, send_body):
+        cls = type(self)
+        with cls.lock:
+            cls.requests += 1
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.2)
+            if self.path == "/no-head" and self.command == "HEAD":
+                status = 405
+            elif self.path == "/missing":
+                status = 404
+            elif self.path == "/moved":
+                self.send_response(301)
+                self.send_header("Location", "/ok")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            elif self.path == "/hang":
+                time.sleep(1.0)
+                status = 200
+            else:
+                status = 200
+            body = b"ok"
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+
+@pytest.fixture
+def stub_server():
+    StubHandler.active = StubHandler.max_active = StubHandler.requests = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def run_checks(urls, **options):
+    async def check():
+        client = create_client(timeout=options.pop("timeout", 5.0))
+        try:
+            checker = LinkChecker(client, **options)
+            first = await checker.check_many(urls)
+            second = await checker.check_many(urls)
+            return checker, first, second
+        finally:
+            await client.aclose()
+
+    return asyncio.run(check())
+
+
+def test_reports_status_codes(stub_server):
+    urls = [f"{stub_server}/ok", f"{stub_server}/missing", f"{stub_server}/moved"]
+    _, results, _ = run_checks(urls)
+
+    assert results[f"{stub_server}/ok"]["ok"] is True
+    assert results[f"{stub_server}/missing"]["ok"] is False
+    assert results[f"{stub_server}/missing"]["status_code"] == 404
+    assert results[f"{stub_server}/moved"]["status_code"] == 200
+
+
+def test_falls_back_to_get_when_head_is_not_allowed(stub_server):
+    _, results, _ = run_checks([f"{stub_server}/no-head"])
+
+    assert results[f"{stub_server}/no-head"]["status_code"] == 200
+
+
+def test_timeouts_and_connection_errors(stub_server):
+    unreachable = "http://127.0.0.1:9/"
+    _, results, _ = run_checks([f"{stub_server}/hang", unreachable], timeout=0.2)
+
+    assert results[f"{stub_server}/hang"]["error"] == "timeout"
+    assert results[unreachable]["ok"] is False
+    assert results[unreachable]["error"]
+
+
+def test_results_are_cached(stub_server):
+    urls = [f"{stub_server}/ok", f"{stub_server}/ok", f"{stub_server}/missing"]
+    checker, first, second = run_checks(urls)
+
+    assert first == second
+    assert checker.requests == 2
+    assert checker.cache_hits == 2
+    assert StubHandler.requests == 2
+
+
+def test_per_host_concurrency_limit(stub_server):
+    urls = [f"{stub_server}/slow/{index}" for index in range(8)]
+    run_checks(urls, per_host=2)
+
+    assert StubHandler.requests == 8
+    assert StubHandler.max_active <= 2
@@ -0,0 +1,47 @@
+"""MinHash/LSH near-duplicate detection tests."""
+
+from near_duplicates import FactCheckIndex, MinHasher, shingles, similarity
+
+CLAIM = {
+    "title": "Did DMK provide 1 crore jobs in TN?",
+    "description": "Viral claim that DMK government provided 1 crore jobs in Tamil Nadu since coming to power",
+}
+REWORDED = {
+    "title": "DMK gave one crore jobs in Tamil Nadu?",
+    "description": "Viral WhatsApp claim says the DMK government provided 1 crore jobs in Tamil Nadu after coming to power",
+}
+UNRELATED = {
+    "title": "Free bus travel for women",
+    "description": "Women travel free on government buses across the state",
+}
+
+
+def test_signatures_are_stable_across_instances():
+    text = CLAIM["title"] + " " + CLAIM["description"]
+    assert MinHasher().signature(text) == MinHasher().signature(text)
+    assert MinHasher().signature("a an the") is None
+
+
+def test_shingles_cover_tamil_text():
+    assert shingles("தமிழ்நாடு அரசு வேலைவாய்ப்பு")
+
+
+def test_reworded_claim_is_found_and_unrelated_is_not():
+    index = FactCheckIndex()
+    index.add("claim", index.signature(CLAIM))
+    index.add("bus", index.signature(UNRELATED))
+
+    matches = index.query(index.signature(REWORDED), threshold=0.5)
+    assert [fact_id for fact_id, _ in matches] == ["claim"]
+    assert similarity(index.signature(CLAIM), index.signature(UNRELATED)) < 0.3
+
+
+def test_related_excludes_itself_and_forgets_removed_claims():
+    index = FactCheckIndex()
+    for fact_id, document in (("claim", CLAIM), ("reworded", REWORDED), ("bus", UNRELATED)):
+        index.add(fact_id, index.signature(document))
+
+    assert [fact_id for fact_id, _ in index.related("claim")] == ["reworded"]
+    index.remove("reworded")
+    assert index.related("claim") == []
+    assert "reworded" not in index and len(index) == 2
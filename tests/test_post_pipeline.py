@@ -0,0 +1,50 @@
+"""Post queue write retries and dead-lettering; no Mongo server needed."""
+
+import asyncio
+
+from post_pipeline import PostQueue
+
+
+def post(post_id):
+    return {"post_id": post_id, "constituency": "Salem", "title": "Roads", "content": "Potholes on the main road"}
+
+
+def run(queue, posts):
+    async def go():
+        queue.start()
+        for item in posts:
+            queue.submit(item)
+        await queue.stop()
+
+    asyncio.run(go())
+
+
+def test_transient_failures_are_retried():
+    attempts, published = [], []
+
+    def publish(posts):
+        attempts.append(len(posts))
+        if len(attempts) < 3:
+            raise ConnectionError("primary stepped down")
+        published.extend(posts)
+
+    queue = PostQueue(publish, reject=lambda posts: None, filters=[], workers=1, retries=3,
+                      retry_backoff_seconds=0.001, listeners=[lambda posts: None])
+    run(queue, [post("p1"), post("p2")])
+    assert [item["post_id"] for item in published] == ["p1", "p2"]
+    assert queue.stats()["retries"] == 2 and queue.stats()["failed"] == 0
+
+
+def test_exhausted_retries_dead_letter_and_report_failed():
+    dead = []
+
+    def publish(posts):
+        raise ConnectionError("no primary")
+
+    queue = PostQueue(publish, reject=lambda posts: None, filters=[], workers=1, retries=1,
+                      retry_backoff_seconds=0.001, dead_letter=dead.extend)
+    run(queue, [post("p1")])
+    assert [item["post_id"] for item in dead] == ["p1"]
+    assert dead[0]["failure_reason"] == "ConnectionError: no primary"
+    assert queue.failed["p1"] == "ConnectionError: no primary"
+    assert "p1" not in queue.pending and queue.stats()["failed"] == 1
@@ -0,0 +1,91 @@
+"""
+Integration tests for read-preference routing against a local replica set.
+
+Start a replica set with at least one secondary and point the tests at it, e.g.
+    mongod --replSet rs0 --port 27017 ... && mongod --replSet rs0 --port 27018 ...
+    MONGO_REPLICA_SET_URL="mongodb://localhost:27017,localhost:27018/?replicaSet=rs0" pytest tests
+"""
+
+import os
+import uuid
+
+import pytest
+from pymongo import MongoClient, WriteConcern, monitoring
+
+from read_routing import ROUTE_CLASSES, ReadRouter, read_preference
+
+REPLICA_SET_URL = os.environ.get("MONGO_REPLICA_SET_URL")
+
+requires_replica_set = pytest.mark.skipif(not REPLICA_SET_URL, reason="MONGO_REPLICA_SET_URL is not set")
+
+
+class FindRecorder(monitoring.CommandListener):
+    """Remembers which server each `find` was sent to"""
+
+    def __init__(self):
+        self.addresses = []
+
+    def started(self, event):
+        if event.command_name == "find":
+            self.addresses.append(event.connection_id)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+@pytest.fixture
+def replica_set():
+    recorder = FindRecorder()
+    client = MongoClient(REPLICA_SET_URL, event_listeners=[recorder])
+    client.admin.command("ping")
+    database = client[f"votewise_read_routing_{uuid.uuid4().hex[:8]}"]
+    # Wait for every member to acknowledge, so secondaries can serve the document
+    members = WriteConcern(w=1 + len(client.secondaries))
+    database.get_collection("candidates", write_concern=members).insert_one({"candidate_id": "c1"})
+    yield client, database, recorder
+    client.drop_database(database.name)
+    client.close()
+
+
+def test_from_env_defaults_to_secondary_preferred():
+    router = ReadRouter.from_env(MongoClient(connect=False).votewise_tn, environ={})
+    assert set(router.modes()) == set(ROUTE_CLASSES)
+    assert all(mode["mode"] == "secondaryPreferred" for mode in router.modes().values())
+    assert router.db("community_posts") is router.primary
+
+
+def test_from_env_per_class_override():
+    environ = {"MONGO_READ_PREFERENCE_SEARCH": "nearest", "MONGO_MAX_STALENESS_SECONDS": "120"}
+    router = ReadRouter.from_env(MongoClient(connect=False).votewise_tn, environ=environ)
+    assert router.modes()["search"] == {"mode": "nearest", "maxStalenessSeconds": 120}
+    assert router.modes()["candidates"]["mode"] == "secondaryPreferred"
+
+
+def test_max_staleness_below_minimum_is_rejected():
+    with pytest.raises(ValueError):
+        read_preference("secondary", 30)
+
+
+@requires_replica_set
+def test_secondary_reads_avoid_primary(replica_set):
+    client, database, recorder = replica_set
+    router = ReadRouter(database, {"candidates": "secondary"}, max_staleness=90)
+
+    documents = list(router.db("candidates").candidates.find({}, {"_id": 0}))
+
+    assert documents == [{"candidate_id": "c1"}]
+    assert recorder.addresses[-1] != client.primary
+    assert recorder.addresses[-1] in client.secondaries
+
+
+@requires_replica_set
+def test_write_paths_stay_on_primary(replica_set):
+    client, database, recorder = replica_set
+    router = ReadRouter(database, {"candidates": "secondary"}, max_staleness=90)
+
+    router.db("community_posts").community_posts.find_one({})
+
+    assert recorder.addresses[-1] == client.primary
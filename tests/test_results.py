@@ -0,0 +1,57 @@
+"""Counting-day tally tests; no Mongo server needed."""
+
+from pymongo.errors import DuplicateKeyError
+
+from results import ResultsTally, apply_logged_rounds, sequence_collided
+
+CANDIDATES = [
+    {"candidate_id": "c1", "name": "Arjun Kumar", "party": "DMK", "constituency": "Chennai Central"},
+    {"candidate_id": "c2", "name": "Priya Raman", "party": "AIADMK", "constituency": "Chennai Central"},
+]
+CONSTITUENCIES = [{"name": "Chennai Central", "district": "Chennai", "constituency_id": "001"}]
+
+
+def tally():
+    results = ResultsTally()
+    results.set_reference_data(CANDIDATES, CONSTITUENCIES)
+    return results
+
+
+def logged(sequence, round_number, deltas):
+    return {"sequence": sequence, "constituency": "Chennai Central", "round": round_number, "deltas": deltas}
+
+
+def test_followers_apply_logged_rounds_once_in_sequence():
+    ingesting, following = tally(), tally()
+    ingesting.apply_round("Chennai Central", 1, {"c1": 100, "c2": 80}, sequence=1)
+    rounds = [logged(1, 1, {"c1": 100, "c2": 80}), logged(2, 2, {"c2": 50})]
+
+    apply_logged_rounds(following, rounds)
+    apply_logged_rounds(ingesting, rounds[1:])
+    apply_logged_rounds(following, rounds)  # re-read after a collision
+    for results in (ingesting, following):
+        assert results.sequence == 2
+        assert results.leaders["Chennai Central"]["candidate_id"] == "c2"
+        assert results.state_result()["parties"][0] == {"party": "AIADMK", "votes": 130, "leading": 1}
+
+
+def test_only_sequence_collisions_are_retried():
+    assert sequence_collided(DuplicateKeyError("dup", 11000, {"keyPattern": {"sequence": 1}}))
+    assert not sequence_collided(DuplicateKeyError("dup", 11000, {"keyPattern": {"constituency": 1, "round": 1}}))
+    assert sequence_collided(DuplicateKeyError("E11000 duplicate key error index: sequence_1 dup key", 11000))
+
+
+def test_shared_constituency_names_count_statewide_but_not_per_district():
+    results = ResultsTally()
+    results.set_reference_data(
+        [{"candidate_id": "p1", "name": "Selvi", "party": "DMK", "constituency": "Palladam"}],
+        [{"name": "Palladam", "district": "Coimbatore", "constituency_id": "022"},
+         {"name": "Palladam", "district": "Tiruppur", "constituency_id": "085"},
+         *CONSTITUENCIES],
+    )
+    results.apply_round("Palladam", 1, {"p1": 10})
+    assert results.state_result()["constituencies_total"] == 3
+    assert results.state_result()["parties"] == [{"party": "DMK", "votes": 10, "leading": 1}]
+    assert results.constituency_result("Palladam")["district"] is None
+    assert results.district_result("Tiruppur")["parties"] == []
+    assert results.district("Chennai Central") == "Chennai"
@@ -0,0 +1,20 @@
+"""Single-flight request keys; no Mongo server needed."""
+
+from singleflight import request_key
+
+
+def scope(query_string=b"", headers=()):
+    return {"type": "http", "method": "GET", "path": "/api/manifestos", "query_string": query_string,
+            "headers": list(headers)}
+
+
+def test_requests_for_the_same_locale_share_a_key():
+    tamil = request_key(scope(b"party=DMK", [(b"accept-language", b"ta")]))
+    assert request_key(scope(b"party=DMK", [(b"accept-language", b"ta-IN,ta;q=0.9,en;q=0.8")])) == tamil
+    assert request_key(scope(b"lang=TA&party=DMK")) == tamil
+    assert request_key(scope(b"party=DMK&lang=ta-IN", [(b"accept-language", b"en")])) == tamil
+
+    english = request_key(scope(b"party=DMK"))
+    assert english != tamil
+    assert request_key(scope(b"party=DMK", [(b"accept-language", b"fr-FR,fr;q=0.9")])) == english
+    assert request_key(scope(b"party=DMK", [(b"if-none-match", b'"v1"')])) != english
@@ -0,0 +1,124 @@
+"""In-memory storage engine tests; no Mongo server needed."""
+
+import pytest
+from pymongo import MongoClient
+
+from read_routing import ReadRouter
+from records import CandidateRecord
+from storage import MemoryCollection, Storage, matches
+
+CANDIDATES = [
+    {"_id": 1, "candidate_id": "c1", "name": "Arjun Kumar", "party": "DMK", "constituency": "Chennai Central",
+     "age": 45, "tags": ["incumbent", "urban"]},
+    {"_id": 2, "candidate_id": "c2", "name": "Priya Raman", "party": "AIADMK", "constituency": "Chennai Central",
+     "age": 38, "tags": ["urban"]},
+    {"_id": 3, "candidate_id": "c3", "name": "Karthik Raja", "party": "BJP", "constituency": "Madurai East",
+     "age": 52, "tags": []},
+]
+
+
+@pytest.fixture
+def candidates():
+    collection = MemoryCollection("candidates", ("candidate_id", "constituency", "party", "tags"))
+    collection.load(CANDIDATES)
+    return collection
+
+
+def names(documents):
+    return [document["name"] for document in documents]
+
+
+def test_equality_and_in_filters_use_indexes(candidates):
+    assert names(candidates.find({"constituency": "Chennai Central"})) == ["Arjun Kumar", "Priya Raman"]
+    assert names(candidates.find({"party": {"$in": ["BJP", "DMK"]}})) == ["Arjun Kumar", "Karthik Raja"]
+    assert names(candidates.find({"constituency": "Chennai Central", "party": "BJP"})) == []
+    assert candidates.find({"constituency": "Nowhere"}) == []
+
+
+def test_array_fields_match_like_mongo(candidates):
+    assert names(candidates.find({"tags": "urban"})) == ["Arjun Kumar", "Priya Raman"]
+    assert names(candidates.find({"tags": {"$all": ["urban", "incumbent"]}})) == ["Arjun Kumar"]
+
+
+def test_regex_or_search_as_the_search_routes_send_it(candidates):
+    query = {"$or": [
+        {"name": {"$regex": "raja", "$options": "i"}},
+        {"party": {"$regex": "raja", "$options": "i"}},
+    ]}
+    assert names(candidates.find(query)) == ["Karthik Raja"]
+
+
+def test_comparisons_and_missing_fields():
+    assert matches({"age": 40}, {"age": {"$gte": 40, "$lt": 50}})
+    assert not matches({"age": 40}, {"age": {"$gt": 40}})
+    assert matches({}, {"photo_url": None})
+    assert matches({"a": 1}, {"b": {"$exists": False}})
+    with pytest.raises(ValueError):
+        matches({"a": 1}, {"a": {"$where": "true"}})
+
+
+def test_projection_drops_id_and_decodes_into_records(candidates):
+    documents = candidates.find({"candidate_id": "c2"}, CandidateRecord.projection())
+    assert "_id" not in documents[0] and "tags" not in documents[0]
+    record, = CandidateRecord.decode_many(documents)
+    assert record.name == "Priya Raman"
+
+
+def test_reload_swaps_contents(candidates):
+    candidates.load(CANDIDATES[:1], fingerprint=(1, None))
+    assert candidates.estimated_document_count() == 1
+    assert candidates.find({"constituency": "Madurai East"}) == []
+
+
+def test_storage_reads_mongo_until_memory_is_loaded():
+    reads = ReadRouter(MongoClient(connect=False).votewise_tn, {})
+    storage = Storage(reads, {"candidates": "memory", "manifestos": "mongo"})
+    assert storage.engines()["candidates"] == "memory"
+    assert storage.collection("candidates").name == "candidates"
+    assert not isinstance(storage.collection("candidates"), MemoryCollection)
+
+    storage._memory["candidates"].load(CANDIDATES)
+    assert isinstance(storage.collection("candidates", "search"), MemoryCollection)
+    assert not isinstance(storage.collection("manifestos"), MemoryCollection)
+
+
+def test_from_env_rejects_unknown_engines():
+    reads = ReadRouter(MongoClient(connect=False).votewise_tn, {})
+    assert set(Storage.from_env(reads, environ={}).engines().values()) == {"mongo"}
+    assert Storage.from_env(reads, environ={"STORAGE_ENGINE_CANDIDATES": "memory"}).engines()["candidates"] == "memory"
+    with pytest.raises(ValueError):
+        Storage.from_env(reads, environ={"STORAGE_ENGINE": "redis"})
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find_one(self, filter, projection, sort):
+        field, _ = sort[0]
+        newest = max(self.documents, key=lambda document: document[field], default=None)
+        return {field: newest[field]} if newest else None
+
+    def estimated_document_count(self):
+        return len(self.documents)
+
+
+class FakeReads:
+    def __init__(self, collections):
+        self.collections = collections
+
+    def db(self, route_class):
+        return self.collections
+
+
+def test_mongo_served_collections_are_fingerprinted():
+    fact_checks = FakeCollection([{"fact_id": "f1", "updated_at": 1}])
+    storage = Storage(FakeReads({"fact_checks": fact_checks}), {})
+    assert storage.fingerprint("fact_checks") is None
+
+    storage.refresh_fingerprints("fact_checks")
+    assert storage.fingerprint("fact_checks") == (1, 1)
+    fact_checks.documents.append({"fact_id": "f2", "updated_at": 2})
+    assert storage.fingerprint("fact_checks") == (1, 1)  # until the next check
+    storage.refresh("fact_checks")
+    assert storage.fingerprint("fact_checks") == (2, 2)